@@ -5,22 +5,110 @@ Chemical Safety Analyzer API - Version 2 (Gemini Only)
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
-import os
-from chemical_analyzer import crawl_cameo_sequential
-from simple_analyzer import analyze_simple
-from safety_links import get_all_links_for_analysis
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, PrivateAttr
+from typing import Dict, List, Optional
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
+import asyncio
+import logging
+import os
+import time
+
+# .env 파일 로드 (각 모듈이 import 시점에 설정값을 읽으므로 먼저 로드)
+load_dotenv()
+
+from request_logging import RequestIdMiddleware, setup_logging
+
+# 요청 id가 붙은 비동기 로깅 (stdout 기록은 백그라운드 스레드에서)
+setup_logging()
+logger = logging.getLogger("backend")
+
+from chemical_analyzer import crawl_cameo_sequential, cameo_http_client
+from browser_pool import BrowserPool
+from cameo_cache import CameoCache, unique_cas
+from crawl_planner import crawl_incremental
+from reactivity_kb import REACTIVITY_KB_DB, REACTIVITY_KB_SNAPSHOT, ReactivityKB, KBVerifier
+from cache_warmer import CacheWarmer
+from page_readiness import readiness_stats
+from resource_blocking import resource_blocker
+from job_queue import JobManager, QueueFullError
+from crawl_events import crawl_listener
+from simple_analyzer import analyze_records
+from safety_links import collect_safety_links, dumps
+from chemical_db import chemical_db
+from gemini_client import GEMINI_MODEL, analyze_with_gemini_compact, stream_gemini_compact, build_gemini_prompt
+from gemini_cache import GeminiSummaryCache, prompt_fingerprint
+from circuit_breaker import CircuitBreaker
+from single_flight import SingleFlight
+import metrics
+from metrics import span
 import google.generativeai as genai
 import sys
-from io import StringIO
 import json
 
-# .env 파일 로드
-load_dotenv()
+# 공유 브라우저 풀 (요청마다 Chromium 콜드 스타트 방지)
+browser_pool = BrowserPool()
+
+# CAS 쌍 단위 CAMEO 결과 캐시
+cameo_cache = CameoCache()
+
+# CAS 쌍 단위 반응성 지식 베이스 (REACTIVITY_KB_DB가 비어 있으면 사용 안 함)
+reactivity_kb = ReactivityKB() if REACTIVITY_KB_DB else None
+
+# 프롬프트 지문 단위 Gemini 요약 캐시
+gemini_cache = GeminiSummaryCache()
+
+# 같은 CAS 집합 + useAi 동시 요청은 파이프라인 한 번만 실행
+analysis_flight = SingleFlight("hybrid-analyze")
+
+# Gemini 장애 시 규칙 기반 메시지로 바로 응답
+gemini_breaker = CircuitBreaker("gemini")
+
+# 요청당 지연 예산 (초): 크롤링이 예산을 거의 다 쓰면 AI 요약 생략
+ANALYSIS_LATENCY_BUDGET = float(os.getenv("ANALYSIS_LATENCY_BUDGET", "90"))
+AI_MIN_BUDGET = float(os.getenv("AI_MIN_BUDGET", "3"))  # AI 요약에 최소한 필요한 남은 시간 (초)
+
+# 비동기 분석 작업 큐 (runner는 아래 run_hybrid_analysis)
+job_manager = JobManager(
+    runner=lambda request, progress: run_hybrid_analysis(request, progress),
+    stages=["crawl", "classify", "ai", "links"]
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작 시 브라우저 풀 실행, 종료 시 정리"""
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        # 풀 시작 실패 시 요청마다 브라우저를 직접 실행 (기존 방식)
+        logger.error(f"[ERROR] Browser pool failed to start: {e}")
+
+    await job_manager.start()
+
+    if reactivity_kb is not None:
+        if REACTIVITY_KB_SNAPSHOT:
+            try:
+                await asyncio.to_thread(reactivity_kb.import_snapshot_file, REACTIVITY_KB_SNAPSHOT)
+            except Exception as e:
+                logger.error(f"[ERROR] Reactivity KB snapshot import failed: {e}")
+        await kb_verifier.start()
+    await cache_warmer.start()
 
-app = FastAPI(title="Chemical Reactivity Analysis API - Gemini Version")
+    yield
+
+    await cache_warmer.stop()
+    if reactivity_kb is not None:
+        await kb_verifier.stop()
+        reactivity_kb.close()
+    await job_manager.stop()
+    await browser_pool.stop()
+    await cameo_http_client.close()
+    chemical_db.close()
+
+
+app = FastAPI(title="Chemical Reactivity Analysis API - Gemini Version", lifespan=lifespan)
 
 # CORS 설정
 app.add_middleware(
@@ -31,30 +119,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청마다 로그용 요청 id 부여 (X-Request-ID)
+app.add_middleware(RequestIdMiddleware)
+
 # Gemini API Key 설정
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 if GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
-    print("[OK] Gemini API configured")
+    logger.info("[OK] Gemini API configured")
 else:
-    print("[ERROR] Gemini API key not set. Please set GEMINI_API_KEY in .env file")
+    logger.error("[ERROR] Gemini API key not set. Please set GEMINI_API_KEY in .env file")
     sys.exit(1)
 
 
-# Helper function to suppress Playwright output
-async def crawl_with_suppressed_output(substances: List[str]) -> list:
-    """Wrapper to suppress stdout/stderr during Playwright crawling"""
-    old_stdout = sys.stdout
-    old_stderr = sys.stderr
+async def crawl_session(substances: List[str], cas_names: dict = None) -> list:
+    """공유 브라우저 풀로 CAMEO 크롤링 (크롤러 로그 레벨은 CAMEO_LOG_LEVEL로 조정)"""
+    return await crawl_cameo_sequential(substances, pool=browser_pool, cas_names=cas_names)
 
-    try:
-        sys.stdout = StringIO()
-        sys.stderr = StringIO()
-        results = await crawl_cameo_sequential(substances)
-        return results
-    finally:
-        sys.stdout = old_stdout
-        sys.stderr = old_stderr
+
+async def crawl_with_cache(cas_numbers: List[str], cas_names: dict = None) -> list:
+    """
+    캐시 우선 CAMEO 조회
+    캐시에 없는 쌍만 크롤링 (모든 쌍이 캐시에 있으면 브라우저를 띄우지 않음)
+    cas_names: 넘기면 {CAS: CAMEO 물질명} 매핑을 채워줌 (안전 링크용)
+    """
+    return await crawl_incremental(cas_numbers, cameo_cache, crawl_session, cas_names, kb=reactivity_kb)
+
+
+# 오래된 지식 베이스 항목 백그라운드 재확인 (내용이 바뀐 쌍은 캐시도 갱신)
+kb_verifier = KBVerifier(reactivity_kb, crawl_session, on_change=cameo_cache.put) if reactivity_kb is not None else None
+
+# 인기 CAS 조합을 한가할 때 미리 크롤링
+cache_warmer = CacheWarmer(cameo_cache, crawl_session, kb=reactivity_kb)
 
 
 # Request/Response 모델
@@ -65,6 +161,7 @@ class Product(BaseModel):
 
 class AnalysisRequest(BaseModel):
     useAi: bool = True
+    includeTimings: bool = False  # true이면 응답에 단계별 소요 시간(timings) 포함
     products: List[Product]
 
 
@@ -78,6 +175,28 @@ class HybridAnalysisResponse(BaseModel):
     simple_response: SimpleResponse
     safety_links: Optional[dict] = None
     error: Optional[str] = None
+    timings: Optional[Dict[str, float]] = None  # 단계별 소요 시간 (초, includeTimings=true일 때만)
+
+    # safety_links를 미리 직렬화한 JSON (json_response에서 그대로 이어 붙임)
+    _safety_links_json: Optional[str] = PrivateAttr(default=None)
+
+
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    status: str
+    deduplicated: bool = False
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: str
+    stages: dict
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[HybridAnalysisResponse] = None
+    error: Optional[str] = None
+    error_code: Optional[int] = None
 
 
 # API 엔드포인트
@@ -88,10 +207,27 @@ async def health_check():
     return {
         "status": "healthy",
         "version": "2.0-gemini-compact",
-        "ai_provider": "Google Gemini"
+        "ai_provider": "Google Gemini",
+        "browser_pool": browser_pool.stats(),
+        "cameo_cache": cameo_cache.stats(),
+        "gemini_cache": gemini_cache.stats(),
+        "gemini_breaker": gemini_breaker.stats(),
+        "crawler_waits": readiness_stats.snapshot(),
+        "resource_blocking": resource_blocker.stats(),
+        "jobs": job_manager.stats(),
+        "coalescing": analysis_flight.stats(),
+        "chemical_db": chemical_db.stats(),
+        "reactivity_kb": {**reactivity_kb.stats(), "verifier": kb_verifier.stats()} if reactivity_kb is not None else None,
+        "cache_warmer": cache_warmer.stats()
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus 메트릭 (단계별 소요 시간 히스토그램, 캐시/재시도/브라우저 실행/오류 카운터)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/")
 async def root():
     """루트 엔드포인트"""
@@ -102,191 +238,343 @@ async def root():
     }
 
 
-@app.post("/hybrid-analyze", response_model=HybridAnalysisResponse)
-async def hybrid_analyze_endpoint(request: AnalysisRequest):
+def extract_cas_numbers(request: AnalysisRequest) -> List[str]:
+    """products 배열에서 모든 CAS 번호 추출 (v1과 동일)"""
+    all_cas_numbers = []
+    for product in request.products:
+        all_cas_numbers.extend(product.casNumbers)
+    return all_cas_numbers
+
+
+def request_key(request: AnalysisRequest) -> str:
+    """같은 분석인지 판단하는 키 (정규화된 CAS 집합 + useAi)"""
+    cas_set = sorted(set(unique_cas(extract_cas_numbers(request))))
+    return f"{','.join(cas_set)}|ai={int(request.useAi)}"
+
+
+def _no_progress(stage: str, status: str, **detail):
+    pass
+
+
+async def summarize_with_ai(analysis_result: dict, on_ai_token=None, deadline: float = None) -> dict:
     """
-    하이브리드 분석 (규칙 기반 + Gemini AI 요약)
+    Gemini 요약
+    - 같은 프롬프트의 요약은 캐시에서 반환
+    - 브레이커가 열려 있거나 남은 지연 예산이 부족하면 호출하지 않음
 
-    Nemo v1 호환 포맷 (products + casNumbers)
+    Returns:
+        analyze_with_gemini_compact 결과 + "cached" 여부 (호출을 생략했으면 "skipped": 사유)
     """
-    try:
-        # products 배열에서 모든 CAS 번호 추출 (v1과 동일)
-        all_cas_numbers = []
-        for product in request.products:
-            all_cas_numbers.extend(product.casNumbers)
-
-        if len(all_cas_numbers) < 2:
-            raise HTTPException(
-                status_code=400,
-                detail="At least 2 CAS numbers are required"
-            )
+    fingerprint = prompt_fingerprint(build_gemini_prompt(analysis_result), GEMINI_MODEL)
 
-        print(f"[V2] Analyzing {len(all_cas_numbers)} CAS numbers from {len(request.products)} products...")
-        print(f"[V2] CAS Numbers: {all_cas_numbers}")
+    message = await gemini_cache.get_async(fingerprint)
+    metrics.cache_lookups.inc(cache="gemini", result="hit" if message is not None else "miss")
+    if message is not None:
+        logger.info("[V2] Gemini summary cache hit")
+        if on_ai_token is not None:
+            on_ai_token(message)
+        return {"success": True, "message": message, "cached": True}
 
-        # 1. CAMEO 크롤링 (CAS Number로 검색)
-        print("[V2] Step 1: CAMEO crawling...")
-        cameo_results = await crawl_with_suppressed_output(all_cas_numbers)
+    if deadline is not None and deadline - time.monotonic() < AI_MIN_BUDGET:
+        return {"success": False, "error": "Latency budget exhausted", "skipped": "latency_budget"}
 
-        if not cameo_results:
-            raise HTTPException(
-                status_code=404,
-                detail="No reactivity data found from CAMEO"
-            )
+    if not gemini_breaker.allow():
+        return {"success": False, "error": "Gemini circuit open", "skipped": "circuit_open"}
 
-        print(f"[V2] CAMEO found {len(cameo_results)} pairs")
+    try:
+        with span("gemini"):
+            if on_ai_token is not None:
+                gemini_response = await stream_gemini_compact(analysis_result, on_ai_token, deadline=deadline)
+            else:
+                gemini_response = await analyze_with_gemini_compact(analysis_result, deadline=deadline)
+    except BaseException:
+        gemini_breaker.release()
+        raise
+    if gemini_response.get("skipped"):
+        # API 키 없음 / 호출 전 예산 소진은 Gemini 장애가 아니므로 집계하지 않음
+        gemini_breaker.release()
+    else:
+        # 지연 시간은 Gemini 호출 한 번의 시간 (동시 호출 슬롯 대기 / 재시도 대기는 우리 쪽 사정이므로 제외)
+        gemini_breaker.record(gemini_response.get("success", False), gemini_response.get("latency", 0.0))
 
-        # 2. 규칙 기반 분석
-        print("[V2] Step 2: Rule-based classification...")
-        analysis_result = analyze_simple(cameo_results)
-        print(f"[V2] Classification: {analysis_result['summary']['overall_status']}")
+    if gemini_response.get("success"):
+        await gemini_cache.put_async(fingerprint, gemini_response["message"], gemini_response.get("tokens", 0))
+    gemini_response["cached"] = False
+    return gemini_response
 
-        # 3. Gemini AI 요약 (간결한 프롬프트)
-        ai_message = None
 
-        if request.useAi:
-            print("[V2] Step 3: Gemini AI analysis...")
-            gemini_response = analyze_with_gemini_compact(analysis_result)
+async def run_hybrid_analysis(request: AnalysisRequest, progress=None, on_ai_token=None) -> HybridAnalysisResponse:
+    """
+    하이브리드 분석 파이프라인 (크롤링 → 규칙 기반 분류 → Gemini 요약 → 안전 링크)
 
-            if gemini_response.get("success"):
-                ai_message = gemini_response.get("message", "")
-                print("[V2] Gemini analysis complete")
-            else:
-                print(f"[V2] Gemini failed: {gemini_response.get('error')}")
-                ai_message = analysis_result['summary']['message']
-        else:
-            ai_message = analysis_result['summary']['message']
+    Args:
+        progress: progress(stage, status, **detail) 진행 상황 콜백 (작업 API / 스트리밍용)
+        on_ai_token: 있으면 Gemini 응답을 스트리밍으로 받아 조각마다 호출
 
-        # 4. 안전 링크 생성
-        safety_links = get_all_links_for_analysis(
-            analysis_result['dangerous_pairs'],
-            analysis_result['caution_pairs']
-        )
+    Raises:
+        HTTPException: 입력 오류(400) / CAMEO 결과 없음(404)
+    """
+    progress = progress or _no_progress
+    started = time.monotonic()
+    deadline = started + ANALYSIS_LATENCY_BUDGET
+    timings = metrics.start_request_timings()
+
+    all_cas_numbers = extract_cas_numbers(request)
 
-        # Nemo-jisanhak 포맷으로 응답
-        return HybridAnalysisResponse(
-            success=True,
-            simple_response=SimpleResponse(
-                risk_level=analysis_result['summary']['overall_status'],
-                message=ai_message
-            ),
-            safety_links=safety_links
+    if len(all_cas_numbers) < 2:
+        raise HTTPException(
+            status_code=400,
+            detail="At least 2 CAS numbers are required"
         )
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"[V2] Error: {e}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
+    logger.info(f"[V2] Analyzing {len(all_cas_numbers)} CAS numbers from {len(request.products)} products...")
+    logger.info(f"[V2] CAS Numbers: {all_cas_numbers}")
+
+    # 1. CAMEO 크롤링 (CAS Number로 검색)
+    logger.info("[V2] Step 1: CAMEO crawling...")
+    progress("crawl", "running")
+    cas_names = {}
+    with span("crawl"), cache_warmer.track(all_cas_numbers):
+        cameo_results = await crawl_with_cache(all_cas_numbers, cas_names)
+
+    if not cameo_results:
+        progress("crawl", "failed")
+        raise HTTPException(
+            status_code=404,
+            detail="No reactivity data found from CAMEO"
+        )
 
+    logger.info(f"[V2] CAMEO found {len(cameo_results)} pairs")
+    progress("crawl", "done", pairs=len(cameo_results))
+
+    # 2. 규칙 기반 분석
+    logger.info("[V2] Step 2: Rule-based classification...")
+    progress("classify", "running")
+    with span("classify"):
+        analysis_result = analyze_records(cameo_results)
+    logger.info(f"[V2] Classification: {analysis_result['summary']['overall_status']}")
+    progress(
+        "classify", "done",
+        risk_level=analysis_result['summary']['overall_status'],
+        message=analysis_result['summary']['message']
+    )
+
+    # 3. Gemini AI 요약 (간결한 프롬프트)
+    ai_message = None
+
+    if request.useAi:
+        logger.info("[V2] Step 3: Gemini AI analysis...")
+        progress("ai", "running")
+        gemini_response = await summarize_with_ai(analysis_result, on_ai_token, deadline)
+
+        if gemini_response.get("success"):
+            ai_message = gemini_response.get("message", "")
+            logger.info("[V2] Gemini analysis complete")
+            progress("ai", "done", cached=gemini_response["cached"])
+        elif gemini_response.get("skipped"):
+            logger.warning(f"[V2] Gemini skipped: {gemini_response['error']}")
+            ai_message = analysis_result['summary']['message']
+            progress("ai", "skipped", reason=gemini_response["skipped"])
+        else:
+            logger.warning(f"[V2] Gemini failed: {gemini_response.get('error')}")
+            ai_message = analysis_result['summary']['message']
+            progress("ai", "failed", error=gemini_response.get('error'))
+    else:
+        ai_message = analysis_result['summary']['message']
+        progress("ai", "skipped")
 
-def analyze_with_gemini_compact(analysis_result: dict, retries: int = 2) -> dict:
+    # 4. 안전 링크 생성
+    progress("links", "running")
+    with span("safety_links"):
+        safety_links = collect_safety_links(
+            analysis_result['dangerous_pairs'],
+            analysis_result['caution_pairs'],
+            cas_names
+        )
+    progress("links", "done")
+
+    total = time.monotonic() - started
+    metrics.stage_duration.observe(total, stage="total")
+    timings["total"] = total
+
+    # Nemo-jisanhak 포맷으로 응답
+    response = HybridAnalysisResponse(
+        success=True,
+        simple_response=SimpleResponse(
+            risk_level=analysis_result['summary']['overall_status'],
+            message=ai_message
+        ),
+        safety_links=safety_links.data,
+        timings=metrics.format_timings(timings)
+    )
+    response._safety_links_json = safety_links.json
+    return response
+
+
+def response_for(request: AnalysisRequest, result: HybridAnalysisResponse) -> HybridAnalysisResponse:
+    """includeTimings=false이면 timings 제외 (병합된 요청끼리 결과 객체를 공유하므로 복사)"""
+    if request.includeTimings:
+        return result
+    return result.model_copy(update={"timings": None})
+
+
+def json_response(result: HybridAnalysisResponse):
     """
-    Gemini API로 화학 안전성 분석 결과를 간결하게 요약
-    토큰 절약을 위한 최소 프롬프트
+    응답 JSON을 직접 조립: safety_links는 미리 직렬화한 문자열을 이어 붙이고 나머지 작은 필드만 직렬화
+    (FastAPI가 response_model로 직렬화한 것과 같은 바이트)
     """
-    if not GEMINI_API_KEY:
-        return {
-            "success": False,
-            "error": "Gemini API key not configured"
-        }
-
-    summary = analysis_result.get("summary", {})
-    overall_status = summary.get("overall_status", "알 수 없음")
-    dangerous_count = summary.get("dangerous_count", 0)
-    caution_count = summary.get("caution_count", 0)
-    dangerous_pairs = analysis_result.get("dangerous_pairs", [])
-    caution_pairs = analysis_result.get("caution_pairs", [])
-
-    for attempt in range(1, retries + 1):
-        try:
-            print(f"[Gemini] Attempt {attempt}/{retries}")
+    if result._safety_links_json is None:
+        return result
 
-            model = genai.GenerativeModel("gemini-2.0-flash-exp")
+    data = result.model_dump(mode="json", exclude={"safety_links"})
+    fields = []
+    for name in HybridAnalysisResponse.model_fields:
+        value = result._safety_links_json if name == "safety_links" else dumps(data[name])
+        fields.append(f"{dumps(name)}:{value}")
+    return Response(content="{" + ",".join(fields) + "}", media_type="application/json")
 
-            # 위험 정보만 간단히
-            danger_info = []
-            for pair in dangerous_pairs[:3]:
-                danger_info.append({
-                    "물질1": pair.get("chemical_1", ""),
-                    "물질2": pair.get("chemical_2", ""),
-                    "위험": pair.get("hazards", [])[:2]  # 상위 2개만
-                })
 
-            caution_info = []
-            for pair in caution_pairs[:2]:
-                caution_info.append({
-                    "물질1": pair.get("chemical_1", ""),
-                    "물질2": pair.get("chemical_2", ""),
-                    "위험": pair.get("hazards", [])[:1]  # 상위 1개만
-                })
+@app.post("/hybrid-analyze", response_model=HybridAnalysisResponse)
+async def hybrid_analyze_endpoint(request: AnalysisRequest):
+    """
+    하이브리드 분석 (규칙 기반 + Gemini AI 요약)
 
-            # 친근한 프롬프트 (사용자 UI용 - 이모지 절대 금지)
-            prompt = f"""상태: {overall_status}
-위험: {dangerous_count}개, 주의: {caution_count}개
+    Nemo v1 호환 포맷 (products + casNumbers)
+    같은 CAS 집합 + useAi 요청이 이미 실행 중이면 그 결과를 함께 받음
+    """
+    try:
+        result = await analysis_flight.do(request_key(request), lambda: run_hybrid_analysis(request))
+        return json_response(response_for(request, result))
 
-위험 조합: {json.dumps(danger_info, ensure_ascii=False)}
-주의 조합: {json.dumps(caution_info, ensure_ascii=False)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"[V2] Error: {e}")
+        metrics.errors.inc(kind="request")
+        raise HTTPException(status_code=500, detail=str(e))
 
-IMPORTANT: 절대 이모지를 사용하지 마세요. 순수 텍스트만 사용하세요.
 
-자연스럽고 친근한 한국어로 3-5줄 요약:
+def sse_event(event: str, data) -> str:
+    """Server-Sent Events 메시지 포맷"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
-위험: "{dangerous_count}가지 위험한 조합이 발견되었어요.\\n\\n[각 조합의 위험성을 쉽게 설명]\\n\\n이 제품들을 함께 사용하면 위험할 수 있으니 주의해주세요."
 
-주의: "{caution_count}가지 주의가 필요한 조합이 있어요.\\n\\n[주의사항 설명]\\n\\n사용 시 주의가 필요해요."
+@app.post("/hybrid-analyze/stream")
+async def hybrid_analyze_stream_endpoint(request: AnalysisRequest):
+    """
+    하이브리드 분석 스트리밍 (Server-Sent Events)
+
+    Events:
+        substance: 물질 추가 진행 ({"substance", "name", "status"})
+        pair: 파싱된 CAMEO 쌍 (result_entry, 캐시 결과는 "cached": true)
+        stage: 단계 진행 ({"stage", "status", ...})
+        verdict: 규칙 기반 판정 ({"risk_level", "message"}) - AI 요약보다 먼저 도착
+        ai_token: Gemini 응답 조각 ({"text"})
+        ai_error: 조각을 보낸 뒤 AI 요약이 실패함 ({"error"}) - 받은 조각은 버리고 result의 규칙 기반 메시지 사용
+        result: 최종 응답 (/hybrid-analyze와 동일)
+        error: 오류 ({"status_code", "detail"})
+    """
+    if len(extract_cas_numbers(request)) < 2:
+        raise HTTPException(
+            status_code=400,
+            detail="At least 2 CAS numbers are required"
+        )
 
-안전: "분석 결과 이 제품들은 함께 사용해도 안전해요!"
+    events = asyncio.Queue()
+    ai_streamed = []
 
-답변 (텍스트만):"""
+    def push(event: str, data):
+        events.put_nowait((event, data))
 
-            # Gemini 호출
-            response = model.generate_content(prompt)
+    def on_ai_token(text: str):
+        ai_streamed.append(text)
+        push("ai_token", {"text": text})
 
-            # 응답 파싱
-            message = None
+    def on_progress(stage: str, status: str, **detail):
+        if stage == "ai" and status in ("failed", "skipped") and ai_streamed:
+            # 이미 보낸 AI 조각과 최종 메시지(규칙 기반 폴백)가 어긋나지 않도록 먼저 알림
+            push("ai_error", {"error": detail.get("error") or detail.get("reason")})
+        push("stage", {"stage": stage, "status": status, **detail})
+        if stage == "classify" and status == "done":
+            push("verdict", {"risk_level": detail["risk_level"], "message": detail["message"]})
 
-            if hasattr(response, "text") and response.text:
-                message = response.text.strip()
-            elif hasattr(response, "candidates") and response.candidates:
-                first_candidate = response.candidates[0]
-                if hasattr(first_candidate, "content") and first_candidate.content.parts:
-                    parts = first_candidate.content.parts
-                    message = "\n".join(
-                        p.text.strip() for p in parts if hasattr(p, "text")
-                    ).strip()
+    async def produce():
+        # 이 태스크(와 하위 태스크)의 크롤링 이벤트만 이 스트림으로 전달
+        crawl_listener.set(push)
+        try:
+            result = await run_hybrid_analysis(
+                request,
+                progress=on_progress,
+                on_ai_token=on_ai_token
+            )
+            push("result", response_for(request, result).model_dump())
+        except HTTPException as e:
+            push("error", {"status_code": e.status_code, "detail": e.detail})
+        except Exception as e:
+            logger.warning(f"[V2] Stream error: {e}")
+            push("error", {"status_code": 500, "detail": str(e)})
+        finally:
+            push(None, None)
 
-            if not message and str(response):
-                message = str(response).strip()
+    async def stream():
+        task = asyncio.create_task(produce())
+        try:
+            while True:
+                event, data = await events.get()
+                if event is None:
+                    break
+                yield sse_event(event, data)
+        finally:
+            # 클라이언트가 연결을 끊으면 분석도 중단
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/jobs", response_model=JobSubmitResponse, status_code=202)
+async def submit_job_endpoint(request: AnalysisRequest):
+    """
+    비동기 분석 작업 접수 (즉시 job_id 반환)
 
-            # 검증
-            if message and len(message) > 10:
-                print(f"[Gemini] OK ({len(message)} chars)")
-                return {
-                    "success": True,
-                    "message": message
-                }
-            else:
-                print(f"[Gemini] Empty response")
-                if attempt < retries:
-                    continue
-                else:
-                    return {
-                        "success": False,
-                        "error": "Empty response"
-                    }
+    같은 CAS 집합 + useAi 작업이 대기/실행 중이면 그 작업의 id를 반환
+    """
+    if len(extract_cas_numbers(request)) < 2:
+        raise HTTPException(
+            status_code=400,
+            detail="At least 2 CAS numbers are required"
+        )
 
-        except Exception as e:
-            print(f"[Gemini] Error: {e}")
-            if attempt < retries:
-                continue
-            else:
-                return {
-                    "success": False,
-                    "error": str(e)
-                }
+    try:
+        job, deduplicated = job_manager.submit(request_key(request), request)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return JobSubmitResponse(job_id=job.job_id, status=job.status, deduplicated=deduplicated)
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job_endpoint(job_id: str):
+    """작업 상태 / 단계별 진행률 / 결과 조회"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+
+    return JobStatusResponse(
+        job_id=job.job_id,
+        status=job.status,
+        stages=job.stages,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        result=response_for(job.payload, job.result) if job.result else None,
+        error=job.error,
+        error_code=job.error_code
+    )
 
 
 # 개발 서버 실행
@@ -0,0 +1,172 @@
+"""
+규칙 기반 분석 벤치마크: analyze() 반복 vs analyze_batch()
+
+Usage:
+    python bench_analyzer.py                         # 분석 2000개 (각 45쌍)
+    python bench_analyzer.py --analyses 10000 --chemicals 20
+    python bench_analyzer.py --memory                # 요청당 메모리: dict vs PairRecord (20종 혼합물)
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import time
+import tracemalloc
+from itertools import combinations
+
+from cameo_cache import assemble_results
+from pair_record import AnalyzedPair, PairRecord
+from simple_analyzer import SimpleChemicalAnalyzer
+
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "cameo_fixture.json")
+
+# fixture에 없는 형태도 섞어서 결과 비교 (대소문자, 알 수 없는 status, 키워드 조합)
+EXTRA_OUTCOMES = [
+    {"status": "INCOMPATIBLE - MAY EXPLODE", "descriptions": ["Explosive decomposition", "Violent polymerization; fire"]},
+    {"status": "Caution - Reactive", "descriptions": ["Pressure build-up from heat", "Flammable gas generation"]},
+    {"status": "No Reaction", "descriptions": []},
+    {"status": "Unknown", "descriptions": ["Corrosive to metals", "Poisonous fumes (toxic)"]},
+    {"status": "Probably safe", "descriptions": ["May ignite combustibles"]},
+]
+
+
+def load_outcomes() -> tuple:
+    with open(FIXTURE_PATH, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    names = [c["name"] for c in data["chemicals"]]
+    outcomes = data["pairs"] + data["default_statuses"] + EXTRA_OUTCOMES
+    return names, outcomes
+
+
+def build_analyses(count: int, chemicals: int, seed: int) -> list:
+    """크롤러 결과 형식의 분석 입력 count개"""
+    rng = random.Random(seed)
+    names, outcomes = load_outcomes()
+
+    analyses = []
+    for _ in range(count):
+        selected = rng.sample(names, min(chemicals, len(names)))
+        results = []
+        for i, (chem_1, chem_2) in enumerate(combinations(selected, 2), start=1):
+            outcome = rng.choice(outcomes)
+            results.append({
+                "pair_id": f"Pair_{i}",
+                "chemical_1": chem_1,
+                "chemical_2": chem_2,
+                "status": outcome["status"],
+                "descriptions": list(outcome["descriptions"]),
+                "documentation_link": None,
+            })
+        analyses.append(results)
+    return analyses
+
+
+def legacy_request(analyzer: SimpleChemicalAnalyzer, cached: list) -> tuple:
+    """이전 방식: 캐시 entry dict 복사 + 조합마다 pair_info dict"""
+    entries = []
+    for i, entry in enumerate(cached, start=1):
+        entry = dict(entry, descriptions=list(entry["descriptions"]), pair_id=f"Pair_{i}")
+        entries.append(entry)
+
+    pair_infos = []
+    for entry in entries:
+        chem1, chem2 = entry["chemical_1"], entry["chemical_2"]
+        status = entry["status"].lower()
+        descriptions = entry["descriptions"]
+        risk_level, severity_score, main_hazard = analyzer._score_pair(status, tuple(descriptions))
+        pair_infos.append({
+            "chemical_1": chem1,
+            "chemical_2": chem2,
+            "status": status,
+            "risk_level": risk_level,
+            "severity_score": severity_score,
+            "hazards": descriptions,
+            "hazard_count": len(descriptions),
+            "summary": AnalyzedPair(chem1, chem2, status, risk_level, severity_score, (), main_hazard).summary,
+        })
+    return entries, pair_infos
+
+
+def record_request(analyzer: SimpleChemicalAnalyzer, cached: list) -> tuple:
+    """현재 방식: 캐시 레코드 공유 + AnalyzedPair"""
+    records = assemble_results(cached)
+    return records, analyzer.analyze_records(records)
+
+
+def retained_bytes(build) -> int:
+    """build()가 만든 객체를 유지한 채 늘어난 메모리 (bytes)"""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current
+
+
+def run_memory(args, analyzer: SimpleChemicalAnalyzer):
+    """혼합물 요청 args.requests개를 동시에 들고 있을 때 요청당 메모리"""
+    analyses = build_analyses(args.requests, args.chemicals, args.seed)
+    # 캐시 내용 (JSON 왕복으로 크롤링 직후처럼 문자열이 모두 별개 객체)
+    cached_dicts = [json.loads(json.dumps(a)) for a in analyses]
+    cached_records = [[PairRecord.from_entry(e) for e in a] for a in json.loads(json.dumps(analyses))]
+
+    # 위험 설명 스캔 캐시를 미리 채워서 측정에서 제외
+    analyzer.analyze_records(cached_records[0])
+
+    legacy = retained_bytes(lambda: [legacy_request(analyzer, c) for c in cached_dicts])
+    records = retained_bytes(lambda: [record_request(analyzer, c) for c in cached_records])
+    cache_legacy = retained_bytes(lambda: json.loads(json.dumps(analyses)))
+    cache_records = retained_bytes(
+        lambda: [[PairRecord.from_entry(e) for e in a] for a in json.loads(json.dumps(analyses))]
+    )
+
+    pairs = sum(len(a) for a in analyses) // len(analyses)
+    print(f"Requests: {len(analyses)} × {args.chemicals} chemicals ({pairs} pairs each)")
+    print(f"  per request   dict {legacy / len(analyses) / 1024:8.1f} KB   record {records / len(analyses) / 1024:8.1f} KB"
+          f"   ({records / legacy:.0%})")
+    print(f"  cached pairs  dict {cache_legacy / 1024:8.1f} KB   record {cache_records / 1024:8.1f} KB"
+          f"   ({cache_records / cache_legacy:.0%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SimpleChemicalAnalyzer batch benchmark")
+    parser.add_argument("--analyses", type=int, default=2000)
+    parser.add_argument("--chemicals", type=int, help="chemicals per analysis (default 10, --memory 20)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--memory", action="store_true", help="per-request memory: dicts vs PairRecord")
+    parser.add_argument("--requests", type=int, default=50, help="concurrent requests for --memory")
+    args = parser.parse_args()
+
+    analyzer = SimpleChemicalAnalyzer()
+    if args.memory:
+        args.chemicals = args.chemicals or 20
+        run_memory(args, analyzer)
+        return
+
+    args.chemicals = args.chemicals or 10
+    # 파이프라인 입력과 같은 형태 (캐시 / 크롤링 결과 → PairRecord)
+    analyses = [[PairRecord.from_entry(e) for e in a] for a in build_analyses(args.analyses, args.chemicals, args.seed)]
+    pairs = sum(len(a) for a in analyses)
+
+    start = time.perf_counter()
+    single = [analyzer.analyze(a) for a in analyses]
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = analyzer.analyze_batch(analyses)
+    batch_time = time.perf_counter() - start
+
+    print(f"Analyses: {len(analyses)} ({pairs} pairs)")
+    print(f"  analyze() loop  {single_time * 1000:9.1f} ms   {pairs / single_time:12.0f} pairs/s")
+    print(f"  analyze_batch() {batch_time * 1000:9.1f} ms   {pairs / batch_time:12.0f} pairs/s")
+    print(f"Speedup: {single_time / batch_time:.1f}x")
+    print(f"batch == analyze: {batch == single}")
+
+
+if __name__ == "__main__":
+    main()
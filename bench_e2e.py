@@ -0,0 +1,289 @@
+"""
+/hybrid-analyze 종단 간 벤치마크 (오프라인: fake_cameo + Gemini 대역)
+혼합물 크기 × 동시 요청 수별로 p50/p95/p99 지연, 처리량, 서버 최대 RSS 측정
+
+Usage:
+    python bench_e2e.py                                    # fake_cameo + 백엔드를 직접 띄워서 측정
+    python bench_e2e.py --sizes 2,5,10,20 --concurrency 1,4,8 --requests 16
+    python bench_e2e.py --backend playwright --cameo-latency 0.3
+    python bench_e2e.py --json bench.json                  # 결과 저장
+    python bench_e2e.py --baseline bench.json              # 저장한 결과 대비 p95가 느려지면 exit 1
+    python bench_e2e.py --url http://localhost:8000        # 이미 실행 중인 서버 측정 (RSS 제외)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import httpx
+
+from loadtest_event_loop import percentile
+
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_PATH = os.path.join(ROOT, "fixtures", "cameo_fixture.json")
+
+
+def fixture_cas_numbers() -> list:
+    with open(FIXTURE_PATH, "r", encoding="utf-8") as f:
+        return [c["cas"] for c in json.load(f)["chemicals"]]
+
+
+def build_payload(cas_numbers: list, use_ai: bool) -> dict:
+    """CAS 하나당 제품 하나"""
+    return {
+        "useAi": use_ai,
+        "products": [
+            {"productName": f"Product {i}", "casNumbers": [cas]}
+            for i, cas in enumerate(cas_numbers, start=1)
+        ]
+    }
+
+
+def process_tree_rss(pid: int) -> int:
+    """pid와 모든 하위 프로세스(Chromium 포함)의 RSS 합계 (bytes, /proc 기반 - Linux 전용)"""
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+            for tid in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{tid}/children") as f:
+                    pending.extend(int(child) for child in f.read().split())
+        except (FileNotFoundError, ProcessLookupError, PermissionError):
+            continue
+    return total
+
+
+class RssSampler:
+    """서버 프로세스 트리 RSS를 주기적으로 읽어 최댓값 기록"""
+
+    def __init__(self, pid: int, interval: float = 0.2):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._task = None
+
+    def reset(self):
+        self.peak = process_tree_rss(self.pid)
+
+    async def _run(self):
+        while True:
+            self.peak = max(self.peak, process_tree_rss(self.pid))
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+def start_servers(args) -> tuple:
+    """fake_cameo + 백엔드 실행 → (프로세스 리스트, 백엔드 URL, 백엔드 pid)"""
+    cameo_env = dict(
+        os.environ,
+        FAKE_CAMEO_LATENCY=str(args.cameo_latency),
+        FAKE_CAMEO_JITTER=str(args.cameo_jitter),
+    )
+    cameo = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "fake_cameo:app", "--port", str(args.cameo_port), "--log-level", "warning"],
+        cwd=ROOT, env=cameo_env,
+    )
+
+    backend_env = dict(
+        os.environ,
+        CAMEO_BASE_URL=f"http://127.0.0.1:{args.cameo_port}",
+        CAMEO_BACKEND=args.backend,
+        GEMINI_STUB="1",
+        GEMINI_STUB_LATENCY=str(args.gemini_latency),
+        GEMINI_API_KEY=os.getenv("GEMINI_API_KEY") or "stub",
+        LOG_LEVEL=os.getenv("LOG_LEVEL", "WARNING"),
+    )
+    if not args.warm_cache:
+        # 만료 시간 0 → 매 요청 캐시 miss (크롤링/AI 비용을 그대로 측정)
+        backend_env.update(CAMEO_CACHE_TTL="0", CAMEO_CACHE_DB="", GEMINI_CACHE_TTL="0", GEMINI_CACHE_DB="")
+    backend = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend_gemini_only:app", "--port", str(args.port), "--log-level", "warning"],
+        cwd=ROOT, env=backend_env,
+    )
+
+    return [backend, cameo], f"http://127.0.0.1:{args.port}", backend.pid
+
+
+def stop_servers(processes: list):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def wait_until_healthy(client: httpx.AsyncClient, base_url: str, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get(f"{base_url}/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.5)
+    raise RuntimeError(f"Server at {base_url} did not become healthy in {timeout:.0f}s")
+
+
+async def run_cell(client: httpx.AsyncClient, base_url: str, cas_pool: list, size: int,
+                   concurrency: int, requests: int, use_ai: bool, rng: random.Random) -> dict:
+    """혼합물 크기 size, 동시 요청 concurrency로 requests개 요청"""
+    payloads = [build_payload(rng.sample(cas_pool, size), use_ai) for _ in range(requests)]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(payload):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.post(f"{base_url}/hybrid-analyze", json=payload)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(payload) for payload in payloads))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "size": size,
+        "concurrency": concurrency,
+        "requests": requests,
+        "ok": len(latencies),
+        "errors": errors,
+        "p50": round(percentile(latencies, 50), 3) if latencies else None,
+        "p95": round(percentile(latencies, 95), 3) if latencies else None,
+        "p99": round(percentile(latencies, 99), 3) if latencies else None,
+        "throughput": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+    }
+
+
+def print_table(results: list):
+    print(f"{'size':>5} {'conc':>5} {'ok/req':>8} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'req/s':>7} {'peak RSS MB':>12}")
+    for r in results:
+        rss = f"{r['peak_rss_mb']:.0f}" if r.get("peak_rss_mb") is not None else "n/a"
+        fmt = lambda v: f"{v:.3f}" if v is not None else "-"
+        print(
+            f"{r['size']:>5} {r['concurrency']:>5} {r['ok']:>3}/{r['requests']:<4} "
+            f"{fmt(r['p50']):>8} {fmt(r['p95']):>8} {fmt(r['p99']):>8} {r['throughput']:>7.2f} {rss:>12}"
+        )
+
+
+def compare_baseline(results: list, baseline_path: str, tolerance: float) -> bool:
+    """baseline 대비 p95가 tolerance 이상 느려졌거나 오류가 늘어난 칸 출력 → 회귀가 없으면 True"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["size"], r["concurrency"]): r for r in json.load(f)["results"]}
+
+    passed = True
+    for r in results:
+        base = baseline.get((r["size"], r["concurrency"]))
+        if base is None or base["p95"] is None:
+            continue
+        if r["p95"] is None or r["p95"] > base["p95"] * (1 + tolerance) or r["errors"] > base["errors"]:
+            passed = False
+            print(
+                f"[REGRESSION] size={r['size']} concurrency={r['concurrency']}: "
+                f"p95 {base['p95']} → {r['p95']}, errors {base['errors']} → {r['errors']}"
+            )
+    return passed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="/hybrid-analyze end-to-end benchmark")
+    parser.add_argument("--url", help="use an already running server instead of starting one")
+    parser.add_argument("--sizes", default="2,5,10,20", help="CAS numbers per request (2-20)")
+    parser.add_argument("--concurrency", default="1,4,8")
+    parser.add_argument("--requests", type=int, default=8, help="requests per size/concurrency cell")
+    parser.add_argument("--no-ai", action="store_true", help="useAi=false")
+    parser.add_argument("--backend", default="http", choices=["http", "playwright"])
+    parser.add_argument("--cameo-latency", type=float, default=0.05)
+    parser.add_argument("--cameo-jitter", type=float, default=0.02)
+    parser.add_argument("--gemini-latency", type=float, default=0.5)
+    parser.add_argument("--warm-cache", action="store_true", help="keep CAMEO/Gemini caches enabled")
+    parser.add_argument("--port", type=int, default=18000)
+    parser.add_argument("--cameo-port", type=int, default=18100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against a saved --json result")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 slowdown vs baseline")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    levels = [int(c) for c in args.concurrency.split(",")]
+    cas_pool = fixture_cas_numbers()
+    if max(sizes) > len(cas_pool) or min(sizes) < 2:
+        parser.error(f"sizes must be between 2 and {len(cas_pool)}")
+
+    processes, pid = [], None
+    base_url = args.url
+    if base_url is None:
+        processes, base_url, pid = start_servers(args)
+
+    rng = random.Random(args.seed)
+    results = []
+    try:
+        async with httpx.AsyncClient(timeout=600) as client:
+            await wait_until_healthy(client, base_url)
+
+            for size in sizes:
+                for concurrency in levels:
+                    sampler = None
+                    if pid is not None and os.path.isdir(f"/proc/{pid}"):
+                        sampler = RssSampler(pid)
+                        sampler.reset()
+                        sampler.start()
+
+                    result = await run_cell(
+                        client, base_url, cas_pool, size, concurrency, args.requests, not args.no_ai, rng
+                    )
+
+                    if sampler is not None:
+                        await sampler.stop()
+                        result["peak_rss_mb"] = round(sampler.peak / (1024 * 1024), 1)
+                    else:
+                        result["peak_rss_mb"] = None
+
+                    results.append(result)
+                    print(f"size={size:<3} concurrency={concurrency:<3} p95={result['p95']}s  {result['throughput']} req/s")
+    finally:
+        stop_servers(processes)
+
+    print()
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\nResults saved to {args.json}")
+
+    if args.baseline and not compare_baseline(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
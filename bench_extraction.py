@@ -0,0 +1,88 @@
+"""
+반응성 결과 추출 벤치마크: locator 루프 vs evaluate 한 번 (+ lxml)
+
+Usage:
+    python bench_extraction.py                    # fake_cameo로 10개 물질(45쌍) 페이지 생성
+    python bench_extraction.py debug_page.html    # 저장된 반응성 페이지 사용
+    python bench_extraction.py --chemicals 20 --repeat 10
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import time
+
+from playwright.async_api import async_playwright
+
+from chemical_analyzer import CAMEO_BASE_URL, extract_pairs, extract_pairs_bulk
+from cameo_parser import parse_reactivity_page
+
+
+def build_reactivity_page(chemical_count: int) -> str:
+    """fake_cameo로 chemical_count개 물질의 반응성 페이지 HTML 생성"""
+    from fastapi.testclient import TestClient
+    import fake_cameo
+
+    client = TestClient(fake_cameo.app)
+    for chemical in list(fake_cameo.fixture["by_id"].values())[:chemical_count]:
+        client.get(f"/mychemicals/add/{chemical['id']}")
+    return client.get("/reactivity").text
+
+
+async def time_extraction(page, extract, repeat: int):
+    timings = []
+    results = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = await extract(page)
+        timings.append((time.perf_counter() - start) * 1000)
+    return results, timings
+
+
+def report(name: str, timings: list):
+    print(f"  {name:<10} median {statistics.median(timings):8.1f} ms   min {min(timings):8.1f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="CAMEO pair extraction benchmark")
+    parser.add_argument("html", nargs="?", help="saved reactivity page (default: generated)")
+    parser.add_argument("--chemicals", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.html:
+        with open(args.html, "r", encoding="utf-8") as f:
+            html = f.read()
+    else:
+        html = build_reactivity_page(args.chemicals)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(html)
+
+        locator_results, locator_timings = await time_extraction(page, extract_pairs, args.repeat)
+        bulk_results, bulk_timings = await time_extraction(page, extract_pairs_bulk, args.repeat)
+        await browser.close()
+
+    lxml_timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            lxml_results = parse_reactivity_page(html, CAMEO_BASE_URL)
+        lxml_timings.append((time.perf_counter() - start) * 1000)
+
+    print(f"Pairs: {len(locator_results)} (repeat={args.repeat})")
+    report("locator", locator_timings)
+    report("bulk", bulk_timings)
+    report("lxml", lxml_timings)
+    print(f"Speedup (locator/bulk): {statistics.median(locator_timings) / statistics.median(bulk_timings):.1f}x")
+    print(f"bulk == locator: {bulk_results == locator_results}")
+    print(f"lxml == locator: {lxml_results == locator_results}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,228 @@
+"""
+Playwright Chromium 브라우저 풀
+요청마다 브라우저를 새로 띄우지 않고, 장기 실행 브라우저에서 격리된 BrowserContext를 발급
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from playwright.async_api import async_playwright
+
+from metrics import browser_launches
+
+
+logger = logging.getLogger(__name__)
+
+
+# 풀 설정 (환경 변수로 조정)
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+BROWSER_MAX_USES = int(os.getenv("BROWSER_MAX_USES", "50"))
+BROWSER_HEALTH_INTERVAL = float(os.getenv("BROWSER_HEALTH_INTERVAL", "30"))
+
+
+class _PooledBrowser:
+    """풀에 들어 있는 브라우저 하나와 사용 횟수 (browser가 None이면 재실행에 실패한 빈 슬롯)"""
+
+    def __init__(self, browser, slot: int):
+        self.browser = browser
+        self.slot = slot
+        self.uses = 0
+
+    def is_healthy(self) -> bool:
+        return self.browser is not None and self.browser.is_connected()
+
+
+class BrowserPool:
+    """
+    장기 실행 Chromium 브라우저 풀
+    - 브라우저 수(size)만큼만 동시에 크롤링 → 메모리 상한 고정
+    - 요청마다 새 BrowserContext 발급 (쿠키/MyChemicals 세션 격리)
+    - max_uses회 사용 후 또는 크래시 시 브라우저 재시작
+    - 재시작에 실패하면 죽은 브라우저 대신 빈 슬롯을 돌려놓고, 다음 대여 또는 헬스 체크 때 다시 실행
+    """
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        max_uses: int = BROWSER_MAX_USES,
+        health_interval: float = BROWSER_HEALTH_INTERVAL,
+        headless: bool = True,
+    ):
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.health_interval = health_interval
+        self.headless = headless
+
+        self._playwright = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._browsers = {}
+        self._health_task = None
+        self._started = False
+
+        # 통계
+        self.launches = 0
+        self.recycles = 0
+        self.leases = 0
+        self.launch_failures = 0
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    async def start(self):
+        """Playwright 시작 + 브라우저 size개 실행"""
+        if self._started:
+            return
+
+        self._playwright = await async_playwright().start()
+        self._idle = asyncio.Queue()
+
+        try:
+            for slot in range(self.size):
+                pooled = await self._launch(slot)
+                self._idle.put_nowait(pooled)
+        except BaseException:
+            # 일부만 실행된 상태에서는 stop()이 아무것도 하지 않으므로 여기서 정리
+            while not self._idle.empty():
+                await self._close_browser(self._idle.get_nowait())
+            self._browsers.clear()
+            await self._playwright.stop()
+            self._playwright = None
+            raise
+
+        self._started = True
+        if self.health_interval > 0:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+        logger.info(f"[Pool] Started {self.size} browser(s) (max_uses={self.max_uses})")
+
+    async def stop(self):
+        """헬스 체크 중단 + 모든 브라우저 종료"""
+        if not self._started:
+            return
+
+        self._started = False
+
+        if self._health_task:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+        for pooled in list(self._browsers.values()):
+            await self._close_browser(pooled)
+        self._browsers.clear()
+
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+        logger.info("[Pool] Stopped")
+
+    @asynccontextmanager
+    async def context(self, **context_options):
+        """
+        격리된 BrowserContext 대여
+
+        Usage:
+            async with pool.context() as context:
+                page = await context.new_page()
+        """
+        if not self._started:
+            raise RuntimeError("BrowserPool is not started")
+
+        pooled = await self._idle.get()
+        context = None
+
+        try:
+            if not pooled.is_healthy():
+                pooled = await self._relaunch(pooled, reason="crashed" if pooled.browser else "empty slot")
+                if not pooled.is_healthy():
+                    raise RuntimeError(f"Browser {pooled.slot} could not be launched")
+
+            pooled.uses += 1
+            self.leases += 1
+            context = await pooled.browser.new_context(**context_options)
+            yield context
+
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.warning(f"[Pool] Error closing context: {e}")
+
+            if pooled.browser is not None:
+                if not pooled.is_healthy():
+                    pooled = await self._relaunch(pooled, reason="crashed")
+                elif pooled.uses >= self.max_uses:
+                    pooled = await self._relaunch(pooled, reason="max uses")
+
+            self._idle.put_nowait(pooled)
+
+    def stats(self) -> dict:
+        """풀 상태 (헬스 체크용)"""
+        return {
+            "started": self._started,
+            "size": self.size,
+            "idle": self._idle.qsize() if self._idle else 0,
+            "launches": self.launches,
+            "recycles": self.recycles,
+            "leases": self.leases,
+            "launch_failures": self.launch_failures,
+        }
+
+    async def _launch(self, slot: int) -> _PooledBrowser:
+        browser = await self._playwright.chromium.launch(headless=self.headless)
+        pooled = _PooledBrowser(browser, slot)
+        self._browsers[slot] = pooled
+        self.launches += 1
+        browser_launches.inc(source="pool")
+        return pooled
+
+    async def _close_browser(self, pooled: _PooledBrowser):
+        if pooled.browser is None:
+            return
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.warning(f"[Pool] Error closing browser {pooled.slot}: {e}")
+
+    async def _recycle(self, pooled: _PooledBrowser, reason: str) -> _PooledBrowser:
+        """브라우저 종료 후 같은 슬롯에 새 브라우저 실행"""
+        logger.info(f"[Pool] Recycling browser {pooled.slot} ({reason}, uses={pooled.uses})")
+        await self._close_browser(pooled)
+        self.recycles += 1
+        return await self._launch(pooled.slot)
+
+    async def _relaunch(self, pooled: _PooledBrowser, reason: str) -> _PooledBrowser:
+        """재시작, 실패하면 빈 슬롯 반환 (죽은 브라우저를 다시 대여하지 않도록)"""
+        try:
+            return await self._recycle(pooled, reason)
+        except Exception as e:
+            self.launch_failures += 1
+            self._browsers.pop(pooled.slot, None)
+            logger.warning(f"[Pool] Could not relaunch browser {pooled.slot}: {e}")
+            return _PooledBrowser(None, pooled.slot)
+
+    async def _health_loop(self):
+        """유휴 브라우저 주기적 점검 (죽은 브라우저는 미리 교체, 빈 슬롯은 다시 실행)"""
+        while self._started:
+            await asyncio.sleep(self.health_interval)
+
+            for _ in range(self._idle.qsize()):
+                try:
+                    pooled = self._idle.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+
+                try:
+                    if not pooled.is_healthy():
+                        pooled = await self._relaunch(pooled, reason="health check")
+                finally:
+                    self._idle.put_nowait(pooled)
@@ -0,0 +1,92 @@
+"""
+화학물질명 DB 생성 (chemical_db.py가 읽는 SQLite 파일)
+
+CSV 형식 (헤더 포함): cas,name_en,name_kr,synonyms
+- synonyms: "|"로 구분한 영어/한국어 동의어 (선택)
+
+새 파일을 다 만든 뒤 원자적으로 교체하므로 서버 실행 중에 다시 만들어도 됨
+(서버는 CHEMICAL_DB_RELOAD_INTERVAL 안에 새 파일을 다시 엶)
+
+Usage:
+    python build_chemical_db.py data/chemical_names.csv cache/chemical_names.db
+    python build_chemical_db.py names.csv cache/chemical_names.db --version 2026-10
+"""
+
+import argparse
+import csv
+import os
+import sqlite3
+import time
+
+from chemical_db import SCHEMA, normalize_name
+
+
+def read_rows(csv_path: str) -> list:
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def build(rows: list, db_path: str, version: str) -> dict:
+    """rows → db_path (임시 파일에 만든 뒤 교체) → 통계"""
+    dirpath = os.path.dirname(db_path)
+    if dirpath:
+        os.makedirs(dirpath, exist_ok=True)
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    chemicals = {}
+    synonyms = {}
+    conflicts = 0
+    for row in rows:
+        cas = (row.get("cas") or "").strip()
+        name_en = (row.get("name_en") or "").strip()
+        if not cas or not name_en:
+            continue
+        name_kr = (row.get("name_kr") or "").strip() or None
+        chemicals.setdefault(cas, (name_en, name_kr))
+
+        names = [name_en, name_kr] + (row.get("synonyms") or "").split("|")
+        for name in names:
+            if not name or not name.strip():
+                continue
+            key = normalize_name(name)
+            if synonyms.setdefault(key, cas) != cas:
+                conflicts += 1  # 같은 이름이 여러 CAS에 있으면 먼저 나온 CAS 유지
+
+    db = sqlite3.connect(tmp_path)
+    try:
+        for statement in SCHEMA:
+            db.execute(statement)
+        db.executemany(
+            "INSERT INTO chemicals (cas, name_en, name_kr) VALUES (?, ?, ?)",
+            ((cas, en, kr) for cas, (en, kr) in sorted(chemicals.items()))
+        )
+        db.executemany("INSERT INTO synonyms (name, cas) VALUES (?, ?)", sorted(synonyms.items()))
+        db.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?)",
+            [("version", version), ("built_at", str(int(time.time())))]
+        )
+        db.commit()
+        db.execute("VACUUM")
+    finally:
+        db.close()
+
+    os.replace(tmp_path, db_path)
+    return {"chemicals": len(chemicals), "synonyms": len(synonyms), "conflicts": conflicts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the chemical name database")
+    parser.add_argument("csv_path")
+    parser.add_argument("db_path")
+    parser.add_argument("--version", default=time.strftime("%Y%m%d%H%M%S"))
+    args = parser.parse_args()
+
+    stats = build(read_rows(args.csv_path), args.db_path, args.version)
+    print(f"{args.db_path}: {stats['chemicals']} chemicals, {stats['synonyms']} names "
+          f"({stats['conflicts']} conflicting synonyms skipped), version {args.version}")
+
+
+if __name__ == "__main__":
+    main()
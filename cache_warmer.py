@@ -0,0 +1,270 @@
+"""
+백그라운드 캐시 워머
+- 들어온 분석 요청의 CAS 인기도를 추적 (반감기로 감쇠하는 점수)
+- 한가할 때(진행 중인 요청이 없고 마지막 요청 후 CACHE_WARMER_IDLE_AFTER초 경과)
+  인기 CAS 조합 상위 K쌍 중 캐시에 없거나 곧 만료되는 쌍을 미리 크롤링
+- 동시 크롤링 세션 수, 가동률(세션 시간 / 전체 시간)을 제한해 실제 요청과 경쟁하지 않음
+  (CPU의 대부분은 Chromium 하위 프로세스가 쓰므로 프로세스 CPU 시간 대신 벽시계 시간 기준)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from cameo_cache import CameoCache, PairKey, cas_pairs, unique_cas
+from metrics import cache_warming
+from reactivity_kb import ReactivityKB
+
+
+logger = logging.getLogger(__name__)
+
+# 워머 설정 (환경 변수로 조정)
+CACHE_WARMER_INTERVAL = float(os.getenv("CACHE_WARMER_INTERVAL", "60"))  # 확인 주기 (초, 0이면 끔)
+CACHE_WARMER_IDLE_AFTER = float(os.getenv("CACHE_WARMER_IDLE_AFTER", "15"))  # 마지막 요청 후 이만큼 지나야 워밍 (초)
+CACHE_WARMER_TOP_CAS = int(os.getenv("CACHE_WARMER_TOP_CAS", "20"))  # 후보로 볼 인기 CAS 수
+CACHE_WARMER_TOP_K = int(os.getenv("CACHE_WARMER_TOP_K", "50"))  # 1회에 워밍할 최대 쌍 수
+CACHE_WARMER_SESSION_CAS = int(os.getenv("CACHE_WARMER_SESSION_CAS", "8"))  # 크롤링 세션 1개당 최대 CAS 수
+CACHE_WARMER_CONCURRENCY = int(os.getenv("CACHE_WARMER_CONCURRENCY", "1"))  # 동시 크롤링 세션 수
+CACHE_WARMER_DUTY_CYCLE = float(os.getenv("CACHE_WARMER_DUTY_CYCLE", "0.25"))  # 워밍 중 크롤링하는 시간 비율 상한 (1 이상이면 제한 없음)
+CACHE_WARMER_REFRESH_WITHIN = float(os.getenv("CACHE_WARMER_REFRESH_WITHIN", str(24 * 3600)))  # 이 안에 만료되면 갱신 (초)
+CACHE_WARMER_HALF_LIFE = float(os.getenv("CACHE_WARMER_HALF_LIFE", str(24 * 3600)))  # 인기도 반감기 (초)
+CACHE_WARMER_MAX_TRACKED = int(os.getenv("CACHE_WARMER_MAX_TRACKED", "10000"))  # 추적할 최대 CAS 수
+
+
+class PopularityTracker:
+    """CAS별 요청 횟수 (half_life마다 절반으로 감쇠)"""
+
+    def __init__(self, half_life: float = CACHE_WARMER_HALF_LIFE, max_tracked: int = CACHE_WARMER_MAX_TRACKED):
+        self.half_life = half_life
+        self.max_tracked = max(1, max_tracked)
+        self._scores: Dict[str, Tuple[float, float]] = {}  # CAS → (점수, 마지막 갱신 시각)
+        self._lock = threading.Lock()
+
+    def record(self, cas_numbers: List[str]):
+        """요청 하나의 CAS 번호 기록 (같은 요청 안의 중복은 한 번만)"""
+        now = time.time()
+        with self._lock:
+            for cas in unique_cas(cas_numbers):
+                score, updated_at = self._scores.get(cas, (0.0, now))
+                self._scores[cas] = (self._decay(score, updated_at, now) + 1, now)
+            if len(self._scores) > self.max_tracked:
+                # 점수가 낮은 CAS부터 버림
+                for cas, _ in self._ranked(now)[self.max_tracked:]:
+                    del self._scores[cas]
+
+    def top(self, n: int) -> List[Tuple[str, float]]:
+        """점수 상위 n개 CAS → [(CAS, 점수)]"""
+        with self._lock:
+            return self._ranked(time.time())[:n]
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def _ranked(self, now: float) -> List[Tuple[str, float]]:
+        scores = [(cas, self._decay(score, updated_at, now)) for cas, (score, updated_at) in self._scores.items()]
+        return sorted(scores, key=lambda item: item[1], reverse=True)
+
+    def _decay(self, score: float, updated_at: float, now: float) -> float:
+        return score * 0.5 ** ((now - updated_at) / self.half_life)
+
+
+def pack_sessions(pairs: List[PairKey], max_cas: int) -> List[List[str]]:
+    """
+    쌍 리스트를 크롤링 세션(CAS 리스트)으로 묶기
+    앞쪽(우선순위가 높은) 쌍부터 CAS가 max_cas개를 넘지 않는 세션에 채움
+    """
+    sessions: List[List[str]] = []
+    for cas_1, cas_2 in pairs:
+        for session in sessions:
+            added = [cas for cas in (cas_1, cas_2) if cas not in session]
+            if len(session) + len(added) <= max_cas:
+                session.extend(added)
+                break
+        else:
+            sessions.append([cas_1, cas_2])
+    return sessions
+
+
+class CacheWarmer:
+    """
+    인기 CAS 조합 미리 크롤링
+
+    Args:
+        cache: CameoCache (워밍 결과 저장, 만료 임박 확인)
+        crawl: (substances, cas_names) → result_entry 리스트 (crawl_cameo_sequential 래퍼)
+        kb: ReactivityKB (있으면 결과도 저장하고, 지식 베이스에 최근 확인된 쌍은 건너뜀)
+    """
+
+    def __init__(
+        self,
+        cache: CameoCache,
+        crawl: Callable[[List[str], dict], Awaitable[list]],
+        kb: Optional[ReactivityKB] = None,
+        tracker: Optional[PopularityTracker] = None,
+        interval: float = CACHE_WARMER_INTERVAL,
+        idle_after: float = CACHE_WARMER_IDLE_AFTER,
+        top_cas: int = CACHE_WARMER_TOP_CAS,
+        top_k: int = CACHE_WARMER_TOP_K,
+        session_cas: int = CACHE_WARMER_SESSION_CAS,
+        concurrency: int = CACHE_WARMER_CONCURRENCY,
+        duty_cycle: float = CACHE_WARMER_DUTY_CYCLE,
+        refresh_within: float = CACHE_WARMER_REFRESH_WITHIN,
+    ):
+        self.cache = cache
+        self.crawl = crawl
+        self.kb = kb
+        self.tracker = tracker or PopularityTracker()
+        self.interval = interval
+        self.idle_after = idle_after
+        self.top_cas = top_cas
+        self.top_k = top_k
+        self.session_cas = max(2, session_cas)
+        self.concurrency = max(1, concurrency)
+        self.duty_cycle = max(0.01, duty_cycle)
+        self.refresh_within = refresh_within
+
+        self._active = 0
+        self._last_request = time.monotonic()  # 서버 시작 직후에도 idle_after만큼 기다림
+        self._task = None
+
+        # 통계
+        self.cycles = 0
+        self.warmed = 0
+        self.skipped_busy = 0
+        self.failures = 0
+        self.busy_seconds = 0.0
+        self.throttled_seconds = 0.0
+
+    @contextmanager
+    def track(self, cas_numbers: List[str]):
+        """실제 분석 요청 구간 (인기도 기록 + 진행 중에는 워밍 중단)"""
+        self.tracker.record(cas_numbers)
+        self._active += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._last_request = time.monotonic()
+
+    @property
+    def idle(self) -> bool:
+        return self._active == 0 and time.monotonic() - self._last_request >= self.idle_after
+
+    async def start(self):
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def candidates(self) -> List[PairKey]:
+        """
+        워밍할 쌍 (우선순위순): 인기 CAS 조합 중 캐시에 없거나 refresh_within 안에 만료되는 쌍
+        최근 크롤링에서 결과가 없었던 쌍, 지식 베이스에 최근 확인된 쌍(크롤링 없이 응답)은 제외
+        """
+        scores = dict(self.tracker.top(self.top_cas))
+        pairs = sorted(cas_pairs(list(scores)), key=lambda key: scores[key[0]] * scores[key[1]], reverse=True)
+        due = self.cache.expiring(pairs, self.refresh_within)
+        not_found = self.cache.not_found(due)
+        due = [key for key in due if key not in not_found]
+        if self.kb is not None:
+            fresh = self.kb.fresh(due)
+            due = [key for key in due if key not in fresh]
+        return due[:self.top_k]
+
+    async def warm_once(self) -> int:
+        """한가하면 후보 쌍 워밍 → 저장한 쌍 개수"""
+        if not self.idle:
+            self.skipped_busy += 1
+            cache_warming.inc(outcome="skipped_busy")
+            return 0
+
+        due = await asyncio.to_thread(self.candidates)
+        if not due:
+            return 0
+        self.cycles += 1
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(session: List[str]) -> int:
+            async with semaphore:
+                if not self.idle:
+                    # 워밍 도중 실제 요청이 들어오면 남은 세션은 다음 주기로
+                    return 0
+                return await self._warm_session(session)
+
+        sessions = pack_sessions(due, self.session_cas)
+        warmed = sum(await asyncio.gather(*(run(session) for session in sessions)))
+        logger.info(f"[Warmer] Warmed {warmed} pairs for {len(due)} due pairs ({len(sessions)} sessions)")
+        return warmed
+
+    def stats(self) -> dict:
+        """워머 통계 (헬스 체크용)"""
+        return {
+            "running": self._task is not None,
+            "idle": self.idle,
+            "tracked_cas": len(self.tracker),
+            "top_cas": [{"cas": cas, "score": round(score, 2)} for cas, score in self.tracker.top(5)],
+            "cycles": self.cycles,
+            "warmed": self.warmed,
+            "skipped_busy": self.skipped_busy,
+            "failures": self.failures,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "throttled_seconds": round(self.throttled_seconds, 3),
+        }
+
+    async def _warm_session(self, session: List[str]) -> int:
+        started = time.monotonic()
+
+        cas_names = {}
+        try:
+            results = await self.crawl(session, cas_names)
+            stored = await asyncio.to_thread(self._store, session, results, cas_names)
+        except Exception as e:
+            self.failures += 1
+            cache_warming.inc(outcome="failed")
+            logger.warning(f"[Warmer] Crawl failed for {session}: {e}")
+            return 0
+        else:
+            self.warmed += stored
+            cache_warming.inc(stored, outcome="warmed")
+            return stored
+        finally:
+            # 실패한 세션(타임아웃 등)도 브라우저를 쓴 시간만큼 쉼
+            await self._throttle(time.monotonic() - started)
+
+    def _store(self, session: List[str], results: list, cas_names: dict) -> int:
+        """세션 결과를 캐시 / 지식 베이스에 저장 (스레드에서 실행) → 캐시에 저장한 쌍 개수"""
+        stored = self.cache.store_results(results, cas_names, crawled=session)
+        if self.kb is not None:
+            self.kb.store_results(results, cas_names)
+        return stored
+
+    async def _throttle(self, busy: float):
+        """
+        가동률 유지: 세션 시간 / (세션 시간 + 휴식) ≤ duty_cycle이 되도록 쉼
+        (세션 시간에는 브라우저가 쓰는 시간이 모두 들어가고, 실제 요청 처리 시간은 들어가지 않음)
+        """
+        self.busy_seconds += busy
+        if self.duty_cycle >= 1:
+            return
+        pause = busy * (1 / self.duty_cycle - 1)
+        if pause > 0:
+            self.throttled_seconds += pause
+            await asyncio.sleep(pause)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.warm_once()
+            except Exception as e:
+                self.failures += 1
+                logger.warning(f"[Warmer] Warming failed: {e}")
@@ -0,0 +1,369 @@
+"""
+CAMEO 반응성 결과 캐시
+CAS 번호 쌍(순서 무관) → 크롤러 result_entry (메모리에는 PairRecord로 보관)
+- 메모리 LRU + (선택) SQLite 디스크 캐시
+- TTL 만료, hit/miss 통계
+- 크롤링했지만 결과가 없는 쌍(CAMEO에 없는 CAS 등)은 짧은 TTL로 "없음"을 기억 (같은 CAS로 매번 다시 크롤링하지 않도록)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple, Union
+
+from pair_record import PairRecord, as_record
+
+
+# 캐시 설정 (환경 변수로 조정)
+CAMEO_CACHE_SIZE = int(os.getenv("CAMEO_CACHE_SIZE", "5000"))
+CAMEO_CACHE_TTL = float(os.getenv("CAMEO_CACHE_TTL", str(7 * 24 * 3600)))  # 7일
+CAMEO_CACHE_DB = os.getenv("CAMEO_CACHE_DB", "")  # 비어 있으면 메모리만 사용
+CAMEO_NOT_FOUND_TTL = float(os.getenv("CAMEO_NOT_FOUND_TTL", "600"))  # 결과 없는 쌍을 기억하는 시간 (초, 0이면 안 함)
+
+PairKey = Tuple[str, str]
+
+
+def normalize_cas(cas: str) -> str:
+    """CAS 번호 정규화 (공백 제거)"""
+    return cas.strip() if cas else ""
+
+
+def pair_key(cas_1: str, cas_2: str) -> PairKey:
+    """순서 무관 CAS 쌍 키"""
+    a, b = normalize_cas(cas_1), normalize_cas(cas_2)
+    return (a, b) if a <= b else (b, a)
+
+
+def unique_cas(cas_numbers: List[str]) -> List[str]:
+    """입력 순서를 유지하며 중복 CAS 제거"""
+    seen = set()
+    result = []
+    for cas in cas_numbers:
+        cas = normalize_cas(cas)
+        if cas and cas not in seen:
+            seen.add(cas)
+            result.append(cas)
+    return result
+
+
+def cas_pairs(cas_numbers: List[str]) -> List[PairKey]:
+    """CAS 리스트의 모든 쌍 (중복 CAS 제외)"""
+    return [pair_key(a, b) for a, b in combinations(unique_cas(cas_numbers), 2)]
+
+
+def assemble_results(entries: List[Union[PairRecord, Dict]]) -> List[PairRecord]:
+    """캐시된 레코드 / 새 크롤링 entry들을 요청 결과로 합치기 (pair_id 재부여)"""
+    return [as_record(entry).with_pair_id(f"Pair_{i}") for i, entry in enumerate(entries, start=1)]
+
+
+class CameoCache:
+    """
+    CAS 쌍 단위 CAMEO 결과 캐시
+    - 메모리 LRU (max_size개)
+    - db_path가 있으면 SQLite에도 저장 (재시작 후에도 유지)
+    """
+
+    def __init__(
+        self,
+        max_size: int = CAMEO_CACHE_SIZE,
+        ttl: float = CAMEO_CACHE_TTL,
+        db_path: str = CAMEO_CACHE_DB,
+        not_found_ttl: float = CAMEO_NOT_FOUND_TTL,
+    ):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self.db_path = db_path
+        self.not_found_ttl = not_found_ttl
+
+        self._memory: "OrderedDict[PairKey, Tuple[float, PairRecord]]" = OrderedDict()
+        self._not_found: "OrderedDict[PairKey, float]" = OrderedDict()  # 결과 없는 쌍 → 만료 시각 (메모리만)
+        self._names: Dict[str, str] = {}  # CAS → CAMEO 물질명 (만료 없음)
+        self._lock = threading.Lock()
+        self._db = self._open_db(db_path) if db_path else None
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.expired = 0
+        self.evictions = 0
+        self.not_found_hits = 0
+
+    def get(self, cas_1: str, cas_2: str) -> Optional[PairRecord]:
+        """CAS 쌍 조회 (없거나 만료되면 None, 레코드는 변경 불가이므로 복사 없이 공유)"""
+        key = pair_key(cas_1, cas_2)
+        now = time.time()
+
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None:
+                expires_at, entry = item
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return entry
+                del self._memory[key]
+                self.expired += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT entry, expires_at FROM cameo_pairs WHERE cas_1 = ? AND cas_2 = ?",
+                    key
+                ).fetchone()
+                if row is not None:
+                    entry, expires_at = PairRecord.from_entry(json.loads(row[0])), row[1]
+                    if expires_at > now:
+                        self._remember(key, entry, expires_at)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return entry
+                    self._db.execute(
+                        "DELETE FROM cameo_pairs WHERE cas_1 = ? AND cas_2 = ?", key
+                    )
+                    self._db.commit()
+                    self.expired += 1
+
+            self.misses += 1
+            return None
+
+    def get_many(self, pairs: List[PairKey]) -> Dict[PairKey, PairRecord]:
+        """여러 쌍 조회 → {pair_key: entry} (캐시된 것만)"""
+        found = {}
+        for cas_1, cas_2 in pairs:
+            entry = self.get(cas_1, cas_2)
+            if entry is not None:
+                found[pair_key(cas_1, cas_2)] = entry
+        return found
+
+    def expiring(self, pairs: List[PairKey], within: float = 0) -> List[PairKey]:
+        """캐시에 없거나 within초 안에 만료되는 쌍 (조회 통계 / LRU 순서는 바꾸지 않음, 캐시 워머용)"""
+        deadline = time.time() + within
+        due = []
+        with self._lock:
+            for cas_1, cas_2 in pairs:
+                key = pair_key(cas_1, cas_2)
+                item = self._memory.get(key)
+                expires_at = item[0] if item is not None else None
+                if expires_at is None and self._db is not None:
+                    row = self._db.execute(
+                        "SELECT expires_at FROM cameo_pairs WHERE cas_1 = ? AND cas_2 = ?", key
+                    ).fetchone()
+                    expires_at = row[0] if row is not None else None
+                if expires_at is None or expires_at <= deadline:
+                    due.append(key)
+        return due
+
+    def put(self, cas_1: str, cas_2: str, entry: Union[PairRecord, Dict]):
+        """CAS 쌍 결과 저장"""
+        key = pair_key(cas_1, cas_2)
+        entry = as_record(entry)
+        expires_at = time.time() + self.ttl
+
+        with self._lock:
+            self._remember(key, entry, expires_at)
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cameo_pairs (cas_1, cas_2, entry, expires_at) VALUES (?, ?, ?, ?)",
+                    (key[0], key[1], json.dumps(entry.to_dict(), ensure_ascii=False), expires_at)
+                )
+                self._db.commit()
+
+    def store_results(self, results: List[Dict], cas_names: Dict[str, str],
+                      crawled: Optional[List[str]] = None) -> int:
+        """
+        크롤링 결과를 CAS 쌍 단위로 저장
+
+        Args:
+            results: crawl_cameo_sequential 결과
+            cas_names: {CAS 번호: CAMEO 물질명} (크롤러가 채운 매핑)
+            crawled: 크롤링한 CAS 리스트 (넘기면 결과가 없는 쌍을 "없음"으로 기억)
+
+        Returns:
+            저장한 쌍 개수 (물질명 → CAS 매핑이 불가능한 쌍은 건너뜀)
+        """
+        mapped, unmapped = self.index_results(results, cas_names)
+        for (cas_1, cas_2), entry in mapped.items():
+            self.put(cas_1, cas_2, entry)
+        self.put_names(cas_names)
+        if crawled is not None:
+            self.put_not_found(self.find_not_found(crawled, mapped, unmapped, cas_names))
+        return len(mapped)
+
+    @staticmethod
+    def find_not_found(crawled: List[str], mapped: Dict[PairKey, Dict], unmapped: List[Dict],
+                       cas_names: Dict[str, str]) -> List[PairKey]:
+        """
+        크롤링했지만 결과가 없는 쌍
+        - CAMEO에서 찾지 못한 CAS가 들어 있는 쌍
+        - 두 CAS가 같은 CAMEO 물질인 쌍 (자기 자신과의 반응은 표시되지 않음)
+        - 그 밖의 쌍은 매핑하지 못한 결과가 하나도 없을 때만 (그 결과가 이 쌍의 것일 수 있으므로)
+        """
+        names = {normalize_cas(cas): (name or "").strip().upper() for cas, name in cas_names.items()}
+        missing = []
+        for key in cas_pairs(crawled):
+            if key in mapped:
+                continue
+            name_1, name_2 = names.get(key[0]), names.get(key[1])
+            if not name_1 or not name_2 or name_1 == name_2 or not unmapped:
+                missing.append(key)
+        return missing
+
+    def put_not_found(self, pairs: List[PairKey]):
+        """결과 없는 쌍 기억 (not_found_ttl 동안)"""
+        if self.not_found_ttl <= 0 or not pairs:
+            return
+        expires_at = time.time() + self.not_found_ttl
+        with self._lock:
+            for cas_1, cas_2 in pairs:
+                key = pair_key(cas_1, cas_2)
+                self._not_found[key] = expires_at
+                self._not_found.move_to_end(key)
+            while len(self._not_found) > self.max_size:
+                self._not_found.popitem(last=False)
+
+    def not_found(self, pairs: List[PairKey]) -> set:
+        """최근 크롤링에서 결과가 없었던 쌍 집합 (만료되지 않은 것만)"""
+        now = time.time()
+        found = set()
+        with self._lock:
+            for cas_1, cas_2 in pairs:
+                key = pair_key(cas_1, cas_2)
+                expires_at = self._not_found.get(key)
+                if expires_at is None:
+                    continue
+                if expires_at > now:
+                    found.add(key)
+                else:
+                    del self._not_found[key]
+            self.not_found_hits += len(found)
+        return found
+
+    def put_names(self, cas_names: Dict[str, str]):
+        """CAS → CAMEO 물질명 저장 (안전 링크에서 CAS로 물질을 찾을 때 사용)"""
+        names = {normalize_cas(cas): name for cas, name in cas_names.items() if cas and name}
+        if not names:
+            return
+        with self._lock:
+            self._names.update(names)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO cameo_names (cas, name) VALUES (?, ?)", names.items()
+                )
+                self._db.commit()
+
+    def get_names(self, cas_numbers: List[str]) -> Dict[str, str]:
+        """CAS 리스트 → {CAS: CAMEO 물질명} (알고 있는 것만)"""
+        found = {}
+        with self._lock:
+            for cas in unique_cas(cas_numbers):
+                name = self._names.get(cas)
+                if name is None and self._db is not None:
+                    row = self._db.execute("SELECT name FROM cameo_names WHERE cas = ?", (cas,)).fetchone()
+                    if row is not None:
+                        name = self._names[cas] = row[0]
+                if name is not None:
+                    found[cas] = name
+        return found
+
+    @staticmethod
+    def index_results(results: List[Dict], cas_names: Dict[str, str]) -> Tuple[Dict[PairKey, Dict], List[Dict]]:
+        """
+        크롤링 결과를 CAS 쌍 키로 매핑
+
+        여러 CAS가 같은 CAMEO 물질명으로 검색되면 (같은 물질) 그 물질의 결과를 모든 CAS 쌍에 저장
+
+        Returns:
+            ({pair_key: entry}, CAS로 매핑하지 못한 entry 리스트)
+        """
+        name_to_cas: Dict[str, List[str]] = {}
+        for cas, name in cas_names.items():
+            if not name:
+                continue
+            cas_list = name_to_cas.setdefault(name.strip().upper(), [])
+            if cas not in cas_list:
+                cas_list.append(cas)
+
+        mapped = {}
+        unmapped = []
+        for entry in results:
+            name_1 = (entry.get("chemical_1") or "").strip().upper()
+            name_2 = (entry.get("chemical_2") or "").strip().upper()
+
+            keys = [
+                pair_key(cas_1, cas_2)
+                for cas_1 in name_to_cas.get(name_1, ())
+                for cas_2 in name_to_cas.get(name_2, ())
+                if cas_1 != cas_2
+            ]
+            for key in keys:
+                mapped[key] = entry
+            if not keys:
+                unmapped.append(entry)
+
+        return mapped, unmapped
+
+    def clear(self):
+        """메모리/디스크 캐시 모두 비우기"""
+        with self._lock:
+            self._memory.clear()
+            self._not_found.clear()
+            self._names.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM cameo_pairs")
+                self._db.execute("DELETE FROM cameo_names")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        """캐시 통계 (헬스 체크용)"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._memory),
+            "max_size": self.max_size,
+            "persistent": self._db is not None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "not_found": len(self._not_found),
+            "not_found_hits": self.not_found_hits,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def _remember(self, key: PairKey, entry: PairRecord, expires_at: float):
+        """메모리 LRU에 저장 (가득 차면 가장 오래된 항목 제거)"""
+        self._memory[key] = (expires_at, entry)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    @staticmethod
+    def _open_db(db_path: str):
+        dirpath = os.path.dirname(db_path)
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+
+        db = sqlite3.connect(db_path, check_same_thread=False)
+        db.execute(
+            """CREATE TABLE IF NOT EXISTS cameo_pairs (
+                cas_1 TEXT NOT NULL,
+                cas_2 TEXT NOT NULL,
+                entry TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (cas_1, cas_2)
+            )"""
+        )
+        db.execute(
+            """CREATE TABLE IF NOT EXISTS cameo_names (
+                cas TEXT PRIMARY KEY,
+                name TEXT NOT NULL
+            )"""
+        )
+        db.commit()
+        return db
@@ -0,0 +1,167 @@
+"""
+브라우저 없는 CAMEO 크롤링 (HTTP)
+Chromium 대신 풀링된 비동기 HTTP 클라이언트 + 세션별 쿠키로 같은 흐름 수행
+검색(CAS) → Add to MyChemicals → Predict Reactivity → cameo_parser로 파싱
+"""
+
+import logging
+import os
+from typing import Optional
+
+import httpx
+
+from cameo_parser import find_add_link, find_search_form, parse_reactivity_page
+from crawl_events import emit_crawl_event
+from metrics import errors, span
+
+
+logger = logging.getLogger(__name__)
+
+
+# HTTP 클라이언트 설정
+CAMEO_HTTP_MAX_CONNECTIONS = int(os.getenv("CAMEO_HTTP_MAX_CONNECTIONS", "10"))
+CAMEO_HTTP_TIMEOUT = float(os.getenv("CAMEO_HTTP_TIMEOUT", "30"))
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+
+class CameoHttpUnsupported(Exception):
+    """페이지 구조상 HTTP만으로 진행할 수 없음 (Playwright로 폴백)"""
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """공유 연결 풀을 감싼 transport (세션 클라이언트를 닫아도 연결 풀은 유지)"""
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self):
+        # 연결 풀은 CameoHttpClient.close()에서 닫음
+        pass
+
+
+class CameoHttpClient:
+    """
+    CAMEO HTTP 크롤러
+    - 연결 풀(transport)은 모든 요청이 공유
+    - 쿠키(MyChemicals 세션)는 크롤링마다 새 클라이언트로 격리 (크롤링이 끝나면 닫음)
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        throttle=None,
+        max_connections: int = CAMEO_HTTP_MAX_CONNECTIONS,
+        timeout: float = CAMEO_HTTP_TIMEOUT,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.throttle = throttle
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._transport: Optional[httpx.AsyncHTTPTransport] = None
+
+    def _get_transport(self) -> httpx.AsyncHTTPTransport:
+        if self._transport is None:
+            self._transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                retries=1,
+            )
+        return self._transport
+
+    def new_session(self) -> httpx.AsyncClient:
+        """쿠키가 격리된 세션 (연결 풀은 공유, 닫아도 연결 풀은 닫히지 않음)"""
+        return httpx.AsyncClient(
+            transport=_SharedTransport(self._get_transport()),
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+        )
+
+    async def close(self):
+        if self._transport is not None:
+            await self._transport.aclose()
+            self._transport = None
+
+    async def crawl(self, substances: list, cas_names: dict = None) -> list:
+        """
+        crawl_cameo_sequential과 같은 result_entry 리스트 반환
+
+        Raises:
+            CameoHttpUnsupported: 검색 폼/추가 링크를 HTTP로 따라갈 수 없을 때
+        """
+        async with self.new_session() as session:
+            return await self._crawl_session(session, substances, cas_names)
+
+    async def _crawl_session(self, session: httpx.AsyncClient, substances: list, cas_names: dict = None) -> list:
+        added = {}
+
+        for substance in substances:
+            try:
+                with span("add_substance"):
+                    added[substance] = await self._add_substance(session, substance)
+                emit_crawl_event("substance", substance=substance, name=added[substance], status="added")
+            except CameoHttpUnsupported:
+                raise
+            except Exception as e:
+                logger.warning(f"[CAMEO-HTTP] Error for substance {substance}: {e}")
+                errors.inc(kind="substance_add")
+                emit_crawl_event("substance", substance=substance, name=None, status="failed")
+
+        if cas_names is not None:
+            cas_names.update(added)
+
+        with span("reactivity_page"):
+            response = await self._get(session, f"{self.base_url}/reactivity")
+        logger.info(f"[CAMEO-HTTP] Loaded reactivity results page: {response.url}")
+
+        with span("extract_pairs"):
+            results = parse_reactivity_page(response.text, self.base_url)
+        for result_entry in results:
+            emit_crawl_event("pair", **result_entry)
+        logger.info(f"[CAMEO-HTTP] Total results collected: {len(results)}")
+        return results
+
+    async def _add_substance(self, session: httpx.AsyncClient, substance: str):
+        """CAS 검색 후 첫 번째 결과를 MyChemicals에 추가 → CAMEO 물질명"""
+        # Playwright 경로와 같이 물질 하나당 한 번 스로틀
+        if self.throttle is not None:
+            await self.throttle.wait()
+
+        search_url = f"{self.base_url}/search/simple"
+        response = await self._get(session, search_url)
+
+        form = find_search_form(response.text, str(response.url))
+        if form is None:
+            raise CameoHttpUnsupported("search form with a 'cas' field not found")
+
+        fields = dict(form["fields"])
+        fields["cas"] = substance
+
+        if form["method"] == "POST":
+            response = await session.post(form["action"], data=fields)
+        else:
+            response = await session.get(form["action"], params=fields)
+        response.raise_for_status()
+
+        chemical_name, add_url = find_add_link(response.text, str(response.url))
+        if add_url is None:
+            if chemical_name:
+                raise CameoHttpUnsupported("'Add to MyChemicals' is not a plain link")
+            raise ValueError("no search results")
+
+        await self._get(session, add_url)
+        return chemical_name
+
+    async def _get(self, session: httpx.AsyncClient, url: str) -> httpx.Response:
+        response = await session.get(url)
+        response.raise_for_status()
+        return response
@@ -0,0 +1,180 @@
+"""
+CAMEO HTML 파서
+chemical_analyzer.extract_pairs와 같은 규칙으로 div.pairwise_hazards 블록을 result_entry로 변환
+- 브라우저 없이: lxml (HTTP 백엔드)
+- 브라우저에서: BULK_EXTRACT_JS 한 번의 evaluate (chemical_analyzer.extract_pairs_bulk)
+"""
+
+import logging
+from typing import List, Optional
+from urllib.parse import urljoin
+
+import lxml.html
+
+from metrics import errors
+
+
+logger = logging.getLogger(__name__)
+
+
+def _has_class(class_name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+# Playwright 셀렉터 "div.pairwise_hazards" (블록 안에서는 querySelectorAll과 같은 의미)
+# "a", "div strong", "ul.spaced3 li", "a[href*='reactivity/documentation']"에 해당하는 XPath
+PAIR_XPATH = f"//div[{_has_class('pairwise_hazards')}]"
+CHEMICAL_LINK_XPATH = ".//a"
+STATUS_XPATH = ".//strong[ancestor::div]"                             # "div strong"
+DESCRIPTION_XPATH = f".//li[ancestor::ul[{_has_class('spaced3')}]]"  # "ul.spaced3 li"
+DOC_LINK_XPATH = ".//a[contains(@href, 'reactivity/documentation')]"
+
+# 검색 결과에서 'Add to MyChemicals' 버튼 기준: 물질 링크가 있는 가장 가까운 상위 요소(결과 행) 안의 물질 링크
+# (페이지 전체의 첫 물질 링크는 결과가 여러 개일 때 다른 결과일 수 있음)
+RESULT_NAME_XPATH = "ancestor::*[.//a[starts-with(@href, '/chemical/')]][1]//a[starts-with(@href, '/chemical/')]"
+
+
+# 페이지에서 모든 pairwise_hazards 블록을 한 번에 꺼내는 스크립트 (pair_to_raw와 같은 형태)
+BULK_EXTRACT_JS = """
+(pairs) => pairs.map((pair) => ({
+    id: pair.getAttribute("id"),
+    chemicals: Array.from(pair.querySelectorAll("a")).slice(0, 2).map((a) => a.textContent),
+    statuses: Array.from(pair.querySelectorAll("div strong")).map((s) => s.textContent),
+    descriptions: Array.from(pair.querySelectorAll("ul.spaced3 li")).map((li) => li.textContent),
+    doc_hrefs: Array.from(pair.querySelectorAll("a[href*='reactivity/documentation']")).map((a) => a.getAttribute("href")),
+}))
+"""
+
+
+def parse_html(html: str):
+    return lxml.html.fromstring(html)
+
+
+def _single(values: list, what: str):
+    """Playwright locator의 strict 모드와 동일: 2개 이상이면 오류"""
+    if len(values) > 1:
+        raise ValueError(f"{what} resolved to {len(values)} elements")
+    return values[0] if values else None
+
+
+def pair_to_raw(pair) -> dict:
+    """
+    lxml pairwise_hazards 블록 → 원시 값
+    (브라우저의 BULK_EXTRACT_JS와 같은 형태)
+    """
+    return {
+        "id": pair.get("id"),
+        "chemicals": [a.text_content() for a in pair.xpath(CHEMICAL_LINK_XPATH)[:2]],
+        "statuses": [s.text_content() for s in pair.xpath(STATUS_XPATH)],
+        "descriptions": [li.text_content() for li in pair.xpath(DESCRIPTION_XPATH)],
+        "doc_hrefs": [a.get("href") for a in pair.xpath(DOC_LINK_XPATH)],
+    }
+
+
+def entry_from_raw(raw: dict, base_url: str) -> dict:
+    """원시 값 → result_entry (extract_pairs 루프 본문과 동일한 규칙)"""
+    # 화학물질 1, 2 이름
+    if len(raw["chemicals"]) < 2:
+        raise ValueError(f"expected 2 chemical links, found {len(raw['chemicals'])}")
+    chem_1, chem_2 = raw["chemicals"][0], raw["chemicals"][1]
+
+    # 상태 (예: Compatible, Incompatible 등)
+    status = _single(raw["statuses"], "div strong")
+    if status is None:
+        status = "Unknown"
+
+    # 설명 문구 - 모든 li 요소 수집
+    descriptions = [desc.strip() for desc in raw["descriptions"] if desc]
+    description = descriptions if descriptions else ["No description"]
+
+    # 문서 링크 (상대경로 → 절대경로 변환)
+    doc_href = _single(raw["doc_hrefs"], "documentation link")
+    documentation_link = f"{base_url}{doc_href}" if doc_href else None
+
+    return {
+        "pair_id": raw["id"],
+        "chemical_1": chem_1.strip() if chem_1 else None,
+        "chemical_2": chem_2.strip() if chem_2 else None,
+        "status": status.strip() if status else None,
+        "descriptions": description,
+        "documentation_link": documentation_link
+    }
+
+
+def parse_pair(pair, base_url: str) -> dict:
+    """lxml pairwise_hazards 블록 하나 → result_entry"""
+    return entry_from_raw(pair_to_raw(pair), base_url)
+
+
+def parse_reactivity_page(html: str, base_url: str) -> List[dict]:
+    """반응성 결과 페이지 HTML → result_entry 리스트"""
+    results = []
+    pairs = parse_html(html).xpath(PAIR_XPATH)
+    logger.info(f"[CAMEO-HTTP] Found {len(pairs)} pairwise hazard blocks")
+
+    for i, pair in enumerate(pairs):
+        try:
+            results.append(parse_pair(pair, base_url))
+        except Exception as e:
+            logger.warning(f"[CAMEO-HTTP] Error parsing pair {i}: {e}")
+            errors.inc(kind="pair_parse")
+            continue
+
+    return results
+
+
+def find_search_form(html: str, page_url: str) -> Optional[dict]:
+    """
+    CAS 입력창이 있는 검색 폼 찾기
+
+    Returns:
+        {"action": 절대 URL, "method": "GET"/"POST", "fields": {이름: 기본값}} 또는 None
+    """
+    doc = parse_html(html)
+    for form in doc.xpath("//form[.//input[@name='cas']]"):
+        fields = {}
+        for element in form.xpath(".//input[@name] | .//select[@name] | .//textarea[@name]"):
+            input_type = (element.get("type") or "text").lower()
+            # Enter로 제출할 때처럼 submit 버튼 값은 보내지 않음
+            if input_type in ("submit", "button", "image", "reset", "file"):
+                continue
+            if input_type in ("checkbox", "radio") and element.get("checked") is None:
+                continue
+            if element.tag == "select":
+                selected = element.xpath(".//option[@selected]") or element.xpath(".//option")
+                fields[element.get("name")] = selected[0].get("value", selected[0].text_content()) if selected else ""
+            elif element.tag == "textarea":
+                fields[element.get("name")] = element.text_content()
+            else:
+                fields[element.get("name")] = element.get("value", "")
+
+        return {
+            "action": urljoin(page_url, form.get("action") or page_url),
+            "method": (form.get("method") or "GET").upper(),
+            "fields": fields,
+        }
+
+    return None
+
+
+def find_add_link(html: str, page_url: str) -> tuple:
+    """
+    검색 결과 페이지에서 첫 번째 'Add to MyChemicals' 링크와 같은 결과 행의 물질명
+
+    Returns:
+        (물질명 또는 None, 추가 링크 절대 URL 또는 None)
+    """
+    doc = parse_html(html)
+
+    chemical_name = None
+    for button in doc.xpath(f"//a[{_has_class('pseudo_button')}]"):
+        if button.text_content().strip() == "Add to MyChemicals":
+            name_links = button.xpath(RESULT_NAME_XPATH)
+            if name_links:
+                chemical_name = name_links[0].text_content().strip() or None
+            href = button.get("href")
+            if not href or href.startswith("#") or href.lower().startswith("javascript:"):
+                return chemical_name, None
+            return chemical_name, urljoin(page_url, href)
+
+    return chemical_name, None
@@ -1,147 +1,427 @@
 import asyncio
 from playwright.async_api import async_playwright
 import json
+import logging
 import os
+import time
+
+from page_readiness import (
+    click_and_wait_for_add,
+    navigate_and_wait,
+    wait_for_selector,
+)
+from resource_blocking import resource_blocker
+from cameo_http import CameoHttpClient
+from cameo_parser import BULK_EXTRACT_JS, RESULT_NAME_XPATH, entry_from_raw
+from crawl_events import emit_crawl_event, unique_pair_events
+from request_logging import setup_logging
+from metrics import browser_launches, errors, retries, span
+
+logger = logging.getLogger(__name__)
+
+CAMEO_BASE_URL = os.getenv("CAMEO_BASE_URL", "https://cameochemicals.noaa.gov").rstrip("/")
+PAGE_TIMEOUT = 45000
+
+# 크롤링 백엔드: "playwright" (기본) 또는 "http" (브라우저 없이, 실패 시 Playwright로 폴백)
+CAMEO_BACKEND = os.getenv("CAMEO_BACKEND", "playwright").lower()
+
+# 결과 추출 방식: "bulk" (evaluate 한 번) 또는 "locator" (블록/필드별 locator 호출)
+CAMEO_EXTRACTION = os.getenv("CAMEO_EXTRACTION", "bulk").lower()
+
+# 병렬 추가 설정: 동시에 사용할 페이지 수 (1이면 순차), 같은 호스트로의 요청 최소 간격 (초)
+CAMEO_ADD_CONCURRENCY = int(os.getenv("CAMEO_ADD_CONCURRENCY", "1"))
+CAMEO_MIN_REQUEST_INTERVAL = float(os.getenv("CAMEO_MIN_REQUEST_INTERVAL", "0.2"))
+
+
+class HostThrottle:
+    """같은 호스트로 보내는 요청의 시작 간격을 최소 interval초로 유지 (politeness)"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = None
+        self._next_at = 0.0
+
+    async def wait(self):
+        if self.interval <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_at > now:
+                await asyncio.sleep(self._next_at - now)
+            self._next_at = max(now, self._next_at) + self.interval
+
+
+# CAMEO 호스트 공용 스로틀 (모든 요청/페이지가 공유)
+cameo_throttle = HostThrottle(CAMEO_MIN_REQUEST_INTERVAL)
+
+# HTTP 백엔드 공용 클라이언트 (연결 풀 공유)
+cameo_http_client = CameoHttpClient(CAMEO_BASE_URL, throttle=cameo_throttle)
+
 
 # Function to add a substance to MyChemicals
 async def add_substance_to_mychemicals(page, substance: str):
     # Go to search page and search for substance
-    await page.goto("https://cameochemicals.noaa.gov/search/simple", wait_until="networkidle")
+    await cameo_throttle.wait()
+    await page.goto(f"{CAMEO_BASE_URL}/search/simple", wait_until="domcontentloaded")
+    await wait_for_selector(page, "input[name='cas']", "search_page")
 
     # Locate the CAS number input field and fill in the substance CAS number
     input_box = page.locator("input[name='cas']")
     await input_box.fill(substance)
-    await input_box.press("Enter")
-    await page.wait_for_load_state("networkidle")
 
-    # Wait for the 'Add to MyChemicals' button (class: 'pseudo_button') to be visible and click the correct one
-    await page.wait_for_selector("a.pseudo_button")
+    # Wait for the 'Add to MyChemicals' button (class: 'pseudo_button') on the results page
+    await navigate_and_wait(page, lambda: input_box.press("Enter"), "a.pseudo_button", "search_results")
     add_buttons = page.locator("a.pseudo_button")
 
     # Find and click the 'Add to MyChemicals' button with the correct text
+    chemical_name = None
     for button in range(await add_buttons.count()):
         button_text = await add_buttons.nth(button).text_content()
         if button_text and button_text.strip() == "Add to MyChemicals":
-            await add_buttons.nth(button).click()
+            # Name from the same result row as the clicked button (read before the click navigates away)
+            name_links = add_buttons.nth(button).locator(f"xpath={RESULT_NAME_XPATH}")
+            if await name_links.count() > 0:
+                chemical_name = await name_links.first.text_content()
+            # Wait for the add to land (navigation or sidebar count), at most the old fixed 1 s sleep
+            await click_and_wait_for_add(page, add_buttons.nth(button))
             break
 
+    return chemical_name.strip() if chemical_name else None
+
 # Function to trigger the 'New Search' button and search for a new substance
 async def trigger_new_search(page):
-    # Wait for the 'New Search' button inside the sidebar and click it
-    await page.wait_for_selector("#sidebar a[href='/search/simple']:has-text('New Search')")
-    new_search_button = page.locator("#sidebar a[href='/search/simple']:has-text('New Search')")
-    await new_search_button.click()
-    await page.wait_for_load_state("networkidle")
+    with span("new_search"):
+        # Wait for the 'New Search' button inside the sidebar and click it
+        await wait_for_selector(page, "#sidebar a[href='/search/simple']:has-text('New Search')", "new_search_link")
+        new_search_button = page.locator("#sidebar a[href='/search/simple']:has-text('New Search')")
+        await navigate_and_wait(page, new_search_button.click, "input[name='cas']", "new_search")
 
 # Sequential crawling function
-async def crawl_cameo_sequential(substances: list) -> list:
-    results = []
+async def crawl_cameo_sequential(substances: list, pool=None, cas_names: dict = None,
+                                 concurrency: int = CAMEO_ADD_CONCURRENCY,
+                                 backend: str = CAMEO_BACKEND) -> list:
+    """
+    CAMEO 크롤링
+
+    Args:
+        substances: CAS 번호 (또는 물질명) 리스트
+        pool: BrowserPool (있으면 풀에서 컨텍스트를 빌려 쓰고, 없으면 브라우저를 직접 실행)
+        cas_names: 넘기면 {입력값: CAMEO 물질명} 매핑을 채워줌 (캐시 저장용)
+        concurrency: 물질 추가에 사용할 페이지 수 (1이면 순차)
+        backend: "playwright" 또는 "http" (http 실패 시 Playwright로 폴백)
+    """
+    # 폴백 / 재시도가 같은 쌍을 다시 파싱해도 pair 이벤트는 한 번만
+    with unique_pair_events():
+        return await _crawl_with_fallback(substances, pool, cas_names, concurrency, backend)
+
+
+async def _crawl_with_fallback(substances: list, pool, cas_names: dict, concurrency: int, backend: str) -> list:
+    added = cas_names if cas_names is not None else {}
+    start = time.monotonic()
+
+    if backend == "http":
+        try:
+            results = await cameo_http_client.crawl(substances, added)
+            if results or len(added) < 2:
+                logger.info(f"[CAMEO] Crawled {len(substances)} substance(s) via HTTP: {len(results)} pairs in {time.monotonic() - start:.1f}s")
+                return results
+            logger.warning("[CAMEO] HTTP backend found no pairwise hazards, falling back to Playwright")
+        except Exception as e:
+            logger.warning(f"[CAMEO] HTTP backend failed ({e}), falling back to Playwright")
+            errors.inc(kind="http_backend")
+        retries.inc(kind="http_fallback")
+        added.clear()
+
+    try:
+        results = await _crawl_once(substances, pool, added, concurrency)
+    except ReactivityPageNotLoaded as e:
+        results = []
+        # 반응성 결과 페이지가 뜨지 않았으면 (차단 때문일 수 있으므로) 리소스 차단을 끄고 한 번 더 시도
+        if resource_blocker.active:
+            resource_blocker.disable(str(e))
+            retries.inc(kind="resource_blocking_off")
+            added.clear()
+            try:
+                results = await _crawl_once(substances, pool, added, concurrency)
+            except ReactivityPageNotLoaded:
+                pass
+
+    logger.info(f"[CAMEO] Crawled {len(substances)} substance(s): {len(results)} pairs in {time.monotonic() - start:.1f}s")
+    return results
+
+
+async def _crawl_once(substances: list, pool, cas_names: dict, concurrency: int) -> list:
+    if pool is not None and pool.started:
+        async with pool.context() as context:
+            await resource_blocker.install(context)
+            return await crawl_cameo_in_context(context, substances, cas_names, concurrency)
 
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
+        browser_launches.inc(source="direct")
+        try:
+            context = await browser.new_context()
+            await resource_blocker.install(context)
+            return await crawl_cameo_in_context(context, substances, cas_names, concurrency)
+        finally:
+            await browser.close()
 
-        # Open a new page once for the entire process
-        page = await context.new_page()
-        page.set_default_timeout(45000)
 
+async def crawl_cameo_in_context(context, substances: list, cas_names: dict = None,
+                                 concurrency: int = CAMEO_ADD_CONCURRENCY) -> list:
+    """
+    주어진 BrowserContext에서 CAMEO 크롤링
+
+    Args:
+        concurrency: 1이면 한 페이지에서 순차 추가, 2 이상이면 여러 페이지에서 병렬 추가
+    """
+    parallel = concurrency > 1 and len(substances) > 1
+
+    # Open a new page once for the entire process
+    page = await context.new_page()
+    page.set_default_timeout(PAGE_TIMEOUT)
+
+    try:
+        if parallel:
+            added = await add_substances_parallel(context, substances, concurrency)
+            # 순차 경로와 같은 위치(검색 페이지 사이드바)에서 Predict Reactivity 클릭
+            await page.goto(f"{CAMEO_BASE_URL}/search/simple", wait_until="domcontentloaded")
+        else:
+            added = await add_substances_sequential(page, substances)
+
+        if cas_names is not None:
+            cas_names.update(added)
+
+        extract = extract_pairs_bulk if CAMEO_EXTRACTION == "bulk" else extract_pairs
+
+        await open_reactivity_page(page)
+        with span("extract_pairs"):
+            results = await extract(page)
+
+        if parallel:
+            # 동시 추가 중 MyChemicals에서 빠진 물질이 있으면 순차로 다시 추가
+            missing = find_missing_substances(added, results)
+            if missing:
+                logger.info(f"[CAMEO] {len(missing)} substance(s) missing after parallel add, retrying sequentially")
+                await add_substances_sequential(page, missing)
+                retries.inc(kind="missing_substances")
+                await open_reactivity_page(page)
+                with span("extract_pairs"):
+                    results = await extract(page)
+
+    finally:
+        await page.close()
+
+    return results
+
+
+async def add_substances_sequential(page, substances: list) -> dict:
+    """한 페이지에서 물질을 하나씩 추가 → {입력값: CAMEO 물질명}"""
+    added = {}
+
+    for substance in substances:
         try:
-            for substance in substances:
-                try:
-                    # Add the current substance to MyChemicals
-                    await add_substance_to_mychemicals(page, substance)
-                    # Wait for the add action to complete
-                    await page.wait_for_timeout(1000)
-                    # After adding the substance, click 'New Search' for the next substance
-                    await trigger_new_search(page)
+            # Add the current substance to MyChemicals
+            with span("add_substance"):
+                added[substance] = await add_substance_to_mychemicals(page, substance)
+            emit_crawl_event("substance", substance=substance, name=added[substance], status="added")
+            # After adding the substance, click 'New Search' for the next substance
+            await trigger_new_search(page)
 
-                except Exception as e:
-                    print(f"[CAMEO] Error for substance {substance}: {e}")
+        except Exception as e:
+            logger.warning(f"[CAMEO] Error for substance {substance}: {e}")
+            errors.inc(kind="substance_add")
+            if substance not in added:
+                emit_crawl_event("substance", substance=substance, name=None, status="failed")
 
-            # After all substances are added, click the "Predict Reactivity" button
-            await page.wait_for_selector("a[href='/reactivity']:has-text('Predict Reactivity')")
-            predict_button = page.locator("a[href='/reactivity']:has-text('Predict Reactivity')")
-            await predict_button.click()
+    return added
 
-            # 결과 페이지 로드 대기
-            await page.wait_for_load_state("networkidle")
-            print(f"[CAMEO] Loaded reactivity results page: {page.url}")
 
-            # 모든 pairwise 결과 블록이 로드될 때까지 대기
-            try:
-                await page.wait_for_selector("div.pairwise_hazards", timeout=10000)
-            except Exception as e:
-                print(f"[CAMEO] Warning: Could not find div.pairwise_hazards - {e}")
-                # 페이지 스크린샷 저장 (디버깅용)
-                await page.screenshot(path="debug_screenshot.png")
-                print("[CAMEO] Screenshot saved to debug_screenshot.png")
-                # HTML 내용 확인
-                html_content = await page.content()
-                with open("debug_page.html", "w", encoding="utf-8") as f:
-                    f.write(html_content)
-                print("[CAMEO] Page HTML saved to debug_page.html")
-
-            # pairwise_hazards 블록 모두 찾기
-            pairs = page.locator("div.pairwise_hazards")
-            pair_count = await pairs.count()
-            print(f"[CAMEO] Found {pair_count} pairwise hazard blocks")
-
-            for i in range(pair_count):
+async def add_substances_parallel(context, substances: list, concurrency: int) -> dict:
+    """
+    여러 페이지에서 물질을 동시에 추가 → {입력값: CAMEO 물질명}
+    같은 컨텍스트의 페이지들은 쿠키(MyChemicals 세션)를 공유
+    """
+    pending = asyncio.Queue()
+    for substance in substances:
+        pending.put_nowait(substance)
+
+    added = {}
+
+    async def worker():
+        page = await context.new_page()
+        page.set_default_timeout(PAGE_TIMEOUT)
+        try:
+            while True:
                 try:
-                    pair = pairs.nth(i)
-
-                    # 각 div의 id (예: Pair_1)
-                    pair_id = await pair.get_attribute("id")
-
-                    # 화학물질 1, 2 이름
-                    chemical_links = pair.locator("a")
-                    chem_1 = await chemical_links.nth(0).text_content()
-                    chem_2 = await chemical_links.nth(1).text_content()
-
-                    # 상태 (예: Compatible, Incompatible 등)
-                    status_elem = pair.locator("div strong")
-                    status_count = await status_elem.count()
-                    status = await status_elem.text_content() if status_count > 0 else "Unknown"
-
-                    # 설명 문구 - 모든 li 요소 수집
-                    desc_elems = pair.locator("ul.spaced3 li")
-                    desc_count = await desc_elems.count()
-                    descriptions = []
-                    if desc_count > 0:
-                        for j in range(desc_count):
-                            desc_text = await desc_elems.nth(j).text_content()
-                            if desc_text:
-                                descriptions.append(desc_text.strip())
-                    description = descriptions if descriptions else ["No description"]
-
-                    # 문서 링크 (상대경로 → 절대경로 변환)
-                    doc_elem = pair.locator("a[href*='reactivity/documentation']")
-                    doc_count = await doc_elem.count()
-                    doc_href = await doc_elem.get_attribute("href") if doc_count > 0 else None
-                    documentation_link = f"https://cameochemicals.noaa.gov{doc_href}" if doc_href else None
-
-                    # 결과 저장
-                    result_entry = {
-                        "pair_id": pair_id,
-                        "chemical_1": chem_1.strip() if chem_1 else None,
-                        "chemical_2": chem_2.strip() if chem_2 else None,
-                        "status": status.strip() if status else None,
-                        "descriptions": description,
-                        "documentation_link": documentation_link
-                    }
-                    results.append(result_entry)
-                    print(f"[CAMEO] Parsed pair {i+1}: {chem_1} + {chem_2} = {status} ({len(descriptions)} hazards)")
+                    substance = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
 
+                try:
+                    with span("add_substance"):
+                        added[substance] = await add_substance_to_mychemicals(page, substance)
+                    emit_crawl_event("substance", substance=substance, name=added[substance], status="added")
                 except Exception as e:
-                    print(f"[CAMEO] Error parsing pair {i}: {e}")
-                    continue
+                    logger.warning(f"[CAMEO] Error for substance {substance}: {e}")
+                    errors.inc(kind="substance_add")
+                    emit_crawl_event("substance", substance=substance, name=None, status="failed")
+        finally:
+            await page.close()
 
-            print(f"[CAMEO] Total results collected: {len(results)}")
+    workers = min(concurrency, len(substances))
+    await asyncio.gather(*(worker() for _ in range(workers)))
 
-        finally:
-            await browser.close()
+    # 입력 순서 유지
+    return {substance: added[substance] for substance in substances if substance in added}
+
+
+def find_missing_substances(added: dict, results: list) -> list:
+    """반응성 결과에 나타나지 않은 물질 (물질명을 알고 있는 경우만 판단 가능)"""
+    if len(added) < 2:
+        return []
+
+    seen = set()
+    for entry in results:
+        for key in ("chemical_1", "chemical_2"):
+            if entry.get(key):
+                seen.add(entry[key].strip().upper())
+
+    return [
+        substance for substance, name in added.items()
+        if name and name.strip().upper() not in seen
+    ]
+
+
+class ReactivityPageNotLoaded(Exception):
+    """'Predict Reactivity' 후 결과 블록(div.pairwise_hazards)이 나타나지 않음"""
+
+
+async def open_reactivity_page(page):
+    """
+    사이드바의 'Predict Reactivity' 클릭 후 결과 페이지 로드 대기
 
-        return results
+    Raises:
+        ReactivityPageNotLoaded: 결과 블록 셀렉터를 찾지 못함 (디버그용 스크린샷/HTML 저장 후)
+    """
+    # After all substances are added, click the "Predict Reactivity" button
+    await wait_for_selector(page, "a[href='/reactivity']:has-text('Predict Reactivity')", "predict_link")
+    predict_button = page.locator("a[href='/reactivity']:has-text('Predict Reactivity')")
+
+    # 결과 페이지로 이동 + 모든 pairwise 결과 블록이 로드될 때까지 대기
+    try:
+        with span("reactivity_page"):
+            await navigate_and_wait(page, predict_button.click, "div.pairwise_hazards", "reactivity")
+        logger.info(f"[CAMEO] Loaded reactivity results page: {page.url}")
+    except Exception as e:
+        logger.warning(f"[CAMEO] Warning: Could not find div.pairwise_hazards - {e}")
+        errors.inc(kind="reactivity_page")
+        # 페이지 스크린샷 저장 (디버깅용)
+        await page.screenshot(path="debug_screenshot.png")
+        logger.info("[CAMEO] Screenshot saved to debug_screenshot.png")
+        # HTML 내용 확인
+        html_content = await page.content()
+        with open("debug_page.html", "w", encoding="utf-8") as f:
+            f.write(html_content)
+        logger.info("[CAMEO] Page HTML saved to debug_page.html")
+        raise ReactivityPageNotLoaded("div.pairwise_hazards not found") from e
+
+
+async def extract_pairs(page) -> list:
+    """반응성 결과 페이지의 div.pairwise_hazards 블록 파싱"""
+    results = []
+
+    # pairwise_hazards 블록 모두 찾기
+    pairs = page.locator("div.pairwise_hazards")
+    pair_count = await pairs.count()
+    logger.info(f"[CAMEO] Found {pair_count} pairwise hazard blocks")
+
+    for i in range(pair_count):
+        try:
+            pair = pairs.nth(i)
+
+            # 각 div의 id (예: Pair_1)
+            pair_id = await pair.get_attribute("id")
+
+            # 화학물질 1, 2 이름
+            chemical_links = pair.locator("a")
+            chem_1 = await chemical_links.nth(0).text_content()
+            chem_2 = await chemical_links.nth(1).text_content()
+
+            # 상태 (예: Compatible, Incompatible 등)
+            status_elem = pair.locator("div strong")
+            status_count = await status_elem.count()
+            status = await status_elem.text_content() if status_count > 0 else "Unknown"
+
+            # 설명 문구 - 모든 li 요소 수집
+            desc_elems = pair.locator("ul.spaced3 li")
+            desc_count = await desc_elems.count()
+            descriptions = []
+            if desc_count > 0:
+                for j in range(desc_count):
+                    desc_text = await desc_elems.nth(j).text_content()
+                    if desc_text:
+                        descriptions.append(desc_text.strip())
+            description = descriptions if descriptions else ["No description"]
+
+            # 문서 링크 (상대경로 → 절대경로 변환)
+            doc_elem = pair.locator("a[href*='reactivity/documentation']")
+            doc_count = await doc_elem.count()
+            doc_href = await doc_elem.get_attribute("href") if doc_count > 0 else None
+            documentation_link = f"{CAMEO_BASE_URL}{doc_href}" if doc_href else None
+
+            # 결과 저장
+            result_entry = {
+                "pair_id": pair_id,
+                "chemical_1": chem_1.strip() if chem_1 else None,
+                "chemical_2": chem_2.strip() if chem_2 else None,
+                "status": status.strip() if status else None,
+                "descriptions": description,
+                "documentation_link": documentation_link
+            }
+            results.append(result_entry)
+            emit_crawl_event("pair", **result_entry)
+            logger.debug(f"[CAMEO] Parsed pair {i+1}: {chem_1} + {chem_2} = {status} ({len(descriptions)} hazards)")
+
+        except Exception as e:
+            logger.warning(f"[CAMEO] Error parsing pair {i}: {e}")
+            errors.inc(kind="pair_parse")
+            continue
+
+    logger.info(f"[CAMEO] Total results collected: {len(results)}")
+    return results
+
+
+async def extract_pairs_bulk(page) -> list:
+    """
+    extract_pairs와 같은 결과를 evaluate 한 번으로 추출
+    (블록마다 수십 번의 locator 왕복 대신 페이지에서 한 번에 수집 후 Python에서 변환)
+    """
+    results = []
+
+    raw_pairs = await page.eval_on_selector_all("div.pairwise_hazards", BULK_EXTRACT_JS)
+    logger.info(f"[CAMEO] Found {len(raw_pairs)} pairwise hazard blocks")
+
+    for i, raw in enumerate(raw_pairs):
+        try:
+            result_entry = entry_from_raw(raw, CAMEO_BASE_URL)
+            results.append(result_entry)
+            emit_crawl_event("pair", **result_entry)
+            logger.debug(
+                f"[CAMEO] Parsed pair {i+1}: {result_entry['chemical_1']} + {result_entry['chemical_2']} "
+                f"= {result_entry['status']} ({len(result_entry['descriptions'])} hazards)"
+            )
+
+        except Exception as e:
+            logger.warning(f"[CAMEO] Error parsing pair {i}: {e}")
+            errors.inc(kind="pair_parse")
+            continue
+
+    logger.info(f"[CAMEO] Total results collected: {len(results)}")
+    return results
 
 # Save results to a JSON file (optional)
 def save_results_to_file(results: list, output_file: str):
@@ -152,7 +432,7 @@ def save_results_to_file(results: list, output_file: str):
     with open(output_file, "w", encoding="utf-8") as f:
         json.dump(results, f, ensure_ascii=False, indent=2)
 
-    print(f"Results saved to {output_file}")
+    logger.info(f"Results saved to {output_file}")
 
 
 # Main pipeline execution
@@ -176,9 +456,7 @@ def run_pipeline(input_payload: dict, output_file: str, analyze_with_ai: bool =
 
     # AI 분석 (선택사항)
     if analyze_with_ai and api_url:
-        print("\n" + "="*80)
-        print("Starting AI Analysis with ChemLLM...")
-        print("="*80 + "\n")
+        logger.info("Starting AI Analysis with ChemLLM...")
 
         try:
             from ai_analyzer import ChemLLMAnalyzer, save_analysis_to_file
@@ -194,17 +472,19 @@ def run_pipeline(input_payload: dict, output_file: str, analyze_with_ai: bool =
                 ai_output_file = output_file.replace(".json", "_ai_analysis.txt")
                 save_analysis_to_file(analysis_result, ai_output_file)
             else:
-                print("[Warning] Could not connect to AI server. Skipping AI analysis.")
+                logger.warning("[Warning] Could not connect to AI server. Skipping AI analysis.")
 
         except ImportError:
-            print("[Warning] ai_analyzer.py not found. Skipping AI analysis.")
+            logger.warning("[Warning] ai_analyzer.py not found. Skipping AI analysis.")
         except Exception as e:
-            print(f"[Warning] AI analysis failed: {e}")
+            logger.warning(f"[Warning] AI analysis failed: {e}")
 
     return results
 
 # Example execution
 if __name__ == "__main__":
+    setup_logging()
+
     input_path = "input.json"
     output_path = "output.json"
 
@@ -0,0 +1,172 @@
+"""
+화학물질명 / 동의어 / 한국어명 데이터베이스 (SQLite, 읽기 전용)
+- CAS 번호 → 영어명 + 한국어명, 영어/한국어 동의어 → CAS
+- 처음 조회할 때 열고 (지연 로딩), mmap으로 읽으므로 여러 uvicorn 워커가
+  같은 파일 페이지(OS 페이지 캐시)를 공유 (프로세스마다 사전을 복사하지 않음)
+- 파일이 바뀌면 (build_chemical_db.py가 새 파일로 교체) 재시작 없이 다시 열기
+CHEMICAL_DB가 비어 있거나 파일이 없으면 조회 결과는 항상 None
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import NamedTuple, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# DB 설정 (환경 변수로 조정)
+CHEMICAL_DB = os.getenv("CHEMICAL_DB", "")  # 비어 있으면 사용 안 함 (CHEMICAL_NAME_KR만 사용)
+CHEMICAL_DB_RELOAD_INTERVAL = float(os.getenv("CHEMICAL_DB_RELOAD_INTERVAL", "30"))  # 파일 변경 확인 주기 (초)
+CHEMICAL_DB_MMAP_SIZE = int(os.getenv("CHEMICAL_DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+SCHEMA = (
+    """CREATE TABLE chemicals (
+        cas TEXT PRIMARY KEY,
+        name_en TEXT NOT NULL,
+        name_kr TEXT
+    ) WITHOUT ROWID""",
+    """CREATE TABLE synonyms (
+        name TEXT PRIMARY KEY,      -- 대문자, 앞뒤 공백 제거
+        cas TEXT NOT NULL
+    ) WITHOUT ROWID""",
+    """CREATE TABLE meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    ) WITHOUT ROWID""",
+)
+
+
+class ChemicalName(NamedTuple):
+    cas: str
+    name_en: str
+    name_kr: Optional[str]
+
+
+def normalize_name(name: str) -> str:
+    """동의어 키 (대문자, 앞뒤 공백 제거)"""
+    return name.strip().upper()
+
+
+class ChemicalNameDB:
+    """
+    읽기 전용 화학물질명 DB
+    generation: 파일을 다시 열 때마다 1 증가 (조회 결과 메모 무효화용)
+    """
+
+    def __init__(self, path: str = CHEMICAL_DB, reload_interval: float = CHEMICAL_DB_RELOAD_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.generation = 0
+
+        self._db = None
+        self._signature = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+        # 통계
+        self.reloads = 0
+        self.lookups = 0
+        self.found = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def by_cas(self, cas: str) -> Optional[ChemicalName]:
+        """CAS 번호로 조회"""
+        row = self._query("SELECT cas, name_en, name_kr FROM chemicals WHERE cas = ?", (cas.strip(),))
+        return ChemicalName(*row) if row else None
+
+    def by_name(self, name: str) -> Optional[ChemicalName]:
+        """영어/한국어 이름 또는 동의어로 조회 (대소문자 무시, 정확히 일치하는 것만)"""
+        row = self._query(
+            "SELECT c.cas, c.name_en, c.name_kr FROM synonyms s JOIN chemicals c ON c.cas = s.cas WHERE s.name = ?",
+            (normalize_name(name),)
+        )
+        return ChemicalName(*row) if row else None
+
+    def check_reload(self):
+        """주기마다 파일 변경 확인 → 바뀌었으면 다시 열기 (조회할 때 자동 호출)"""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.reload_interval:
+                return
+            self._checked_at = now
+            signature = self._file_signature()
+            if signature == self._signature:
+                return
+            self._close()
+            self._signature = signature
+            self._db = self._open() if signature is not None else None
+            self.generation += 1
+            if self._db is not None:
+                self.reloads += 1
+                logger.info(f"[ChemicalDB] Loaded {self.path} (version {self.version()})")
+
+    def version(self) -> Optional[str]:
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone() if self._db else None
+        return row[0] if row else None
+
+    def stats(self) -> dict:
+        """DB 상태 (헬스 체크용)"""
+        return {
+            "enabled": self.enabled,
+            "loaded": self._db is not None,
+            "version": self.version(),
+            "generation": self.generation,
+            "reloads": self.reloads,
+            "lookups": self.lookups,
+            "found": self.found,
+        }
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _query(self, sql: str, params: tuple):
+        if not self.enabled:
+            return None
+        self.check_reload()
+        with self._lock:
+            if self._db is None:
+                return None
+            self.lookups += 1
+            try:
+                row = self._db.execute(sql, params).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"[ChemicalDB] Lookup failed: {e}")
+                return None
+            if row is not None:
+                self.found += 1
+            return row
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _open(self):
+        try:
+            db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            db.execute(f"PRAGMA mmap_size = {CHEMICAL_DB_MMAP_SIZE}")
+            db.execute("SELECT 1 FROM chemicals LIMIT 1")
+            return db
+        except sqlite3.Error as e:
+            logger.warning(f"[ChemicalDB] Could not open {self.path}: {e}")
+            return None
+
+    def _close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+# 서버 전체에서 공유 (처음 조회할 때 파일을 엶)
+chemical_db = ChemicalNameDB()
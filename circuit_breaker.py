@@ -0,0 +1,135 @@
+"""
+Gemini 요약 단계 서킷 브레이커
+Gemini가 느리거나 실패를 반복하면 호출을 멈추고 규칙 기반 메시지로 바로 응답
+- closed: 정상 호출, 최근 호출 결과(실패/지연)를 기록
+- open: 최근 window개 중 실패가 threshold개 이상이면 reset_timeout 동안 호출 차단
+- half_open: reset_timeout 후 요청 하나만 시험 호출 → 성공하면 closed, 실패하면 다시 open
+"""
+
+import logging
+import os
+import time
+from collections import deque
+
+
+logger = logging.getLogger(__name__)
+
+
+# 브레이커 설정 (환경 변수로 조정)
+GEMINI_BREAKER_WINDOW = int(os.getenv("GEMINI_BREAKER_WINDOW", "10"))          # 최근 호출 몇 개를 볼지
+GEMINI_BREAKER_THRESHOLD = int(os.getenv("GEMINI_BREAKER_THRESHOLD", "5"))     # window 중 실패 몇 개에 열지
+GEMINI_BREAKER_RESET = float(os.getenv("GEMINI_BREAKER_RESET", "30"))          # open 유지 시간 (초)
+GEMINI_SLOW_CALL = float(os.getenv("GEMINI_SLOW_CALL", "15"))                  # 이보다 느린 성공도 실패로 집계 (초)
+
+
+class CircuitBreaker:
+    """
+    최근 호출 결과 기반 서킷 브레이커
+
+    사용법:
+        if breaker.allow():
+            start = time.monotonic()
+            ok = await call()
+            breaker.record(ok, time.monotonic() - start)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = GEMINI_BREAKER_WINDOW,
+        threshold: int = GEMINI_BREAKER_THRESHOLD,
+        reset_timeout: float = GEMINI_BREAKER_RESET,
+        slow_call: float = GEMINI_SLOW_CALL,
+    ):
+        self.name = name
+        self.window = max(1, window)
+        self.threshold = max(1, min(threshold, self.window))
+        self.reset_timeout = reset_timeout
+        self.slow_call = slow_call
+
+        self.state = "closed"
+        self._outcomes = deque(maxlen=self.window)  # True = 실패 (오류 또는 지연)
+        self._opened_at = 0.0
+        self._probing = False
+
+        # 통계
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.rejected = 0
+        self.opened = 0
+        self.last_latency = None
+
+    def allow(self) -> bool:
+        """지금 호출해도 되는지 (open이면 False, half_open이면 시험 호출 하나만 True)"""
+        if self.state == "open":
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self.state = "half_open"
+            logger.info(f"[Breaker:{self.name}] Half-open, probing")
+
+        if self.state == "half_open":
+            if self._probing:
+                self.rejected += 1
+                return False
+            self._probing = True
+
+        return True
+
+    def record(self, success: bool, latency: float):
+        """allow()로 허용된 호출의 결과 기록"""
+        self.calls += 1
+        self.last_latency = round(latency, 3)
+
+        slow = success and latency > self.slow_call
+        failed = not success or slow
+        if slow:
+            self.slow_calls += 1
+        if failed:
+            self.failures += 1
+
+        if self.state == "half_open":
+            self._probing = False
+            if failed:
+                self._open("probe failed")
+            else:
+                self.state = "closed"
+                self._outcomes.clear()
+                logger.info(f"[Breaker:{self.name}] Closed")
+            return
+
+        self._outcomes.append(failed)
+        if self.state == "closed" and sum(self._outcomes) >= self.threshold:
+            self._open(f"{sum(self._outcomes)}/{len(self._outcomes)} recent calls failed or slow")
+
+    def release(self):
+        """allow() 후 결과 없이 끝난 호출 (취소 등) - 시험 호출 자리만 반납"""
+        if self.state == "half_open":
+            self._probing = False
+
+    def stats(self) -> dict:
+        """브레이커 상태 (헬스 체크용)"""
+        retry_in = None
+        if self.state == "open":
+            retry_in = round(max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)), 1)
+        return {
+            "state": self.state,
+            "recent_failures": sum(self._outcomes),
+            "window": self.window,
+            "threshold": self.threshold,
+            "retry_in": retry_in,
+            "calls": self.calls,
+            "failures": self.failures,
+            "slow_calls": self.slow_calls,
+            "rejected": self.rejected,
+            "opened": self.opened,
+            "last_latency": self.last_latency,
+        }
+
+    def _open(self, reason: str):
+        self.state = "open"
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.opened += 1
+        logger.warning(f"[Breaker:{self.name}] Open for {self.reset_timeout:.0f}s ({reason})")
@@ -0,0 +1,61 @@
+"""
+크롤링 진행 이벤트
+요청별 리스너를 contextvar로 등록하면 크롤러가 물질 추가/쌍 파싱 때마다 알려줌 (SSE 스트리밍용)
+"""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+# listener(event, data) - 현재 요청(태스크)에서만 보임, 하위 태스크에 상속
+crawl_listener: ContextVar[Optional[Callable[[str, dict], None]]] = ContextVar("crawl_listener", default=None)
+
+
+def emit_crawl_event(event: str, **data):
+    """
+    Events:
+        substance: {"substance", "name", "status": "added"/"failed"}
+        pair: result_entry (+ "cached": True 이면 캐시에서 온 결과)
+    """
+    listener = crawl_listener.get()
+    if listener is not None:
+        try:
+            listener(event, data)
+        except Exception as e:
+            logger.warning(f"[Events] Listener error for {event}: {e}")
+
+
+@contextmanager
+def unique_pair_events():
+    """
+    이 구간에서 같은 조합(물질명 기준)의 pair 이벤트는 한 번만 전달
+    (HTTP 백엔드 → Playwright 폴백, 리소스 차단 해제 후 재시도 때 클라이언트가 같은 쌍을 두 번 받지 않도록)
+    """
+    listener = crawl_listener.get()
+    if listener is None:
+        yield
+        return
+
+    seen = set()
+
+    def dedupe(event: str, data: dict):
+        if event == "pair":
+            key = frozenset((
+                (data.get("chemical_1") or "").strip().upper(),
+                (data.get("chemical_2") or "").strip().upper(),
+            ))
+            if key in seen:
+                return
+            seen.add(key)
+        listener(event, data)
+
+    token = crawl_listener.set(dedupe)
+    try:
+        yield
+    finally:
+        crawl_listener.reset(token)
@@ -0,0 +1,188 @@
+"""
+증분 크롤링 계획
+캐시에 없는 CAS 쌍만 다시 크롤링하도록 MyChemicals 세션을 최소로 구성
+(반응성 지식 베이스가 있으면 캐시 다음으로 조회, 둘 다 없는 쌍만 크롤링)
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from cameo_cache import CameoCache, PairKey, cas_pairs, unique_cas, assemble_results
+from crawl_events import emit_crawl_event
+from metrics import cache_lookups
+from pair_record import PairRecord, as_record
+from reactivity_kb import ReactivityKB
+
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlPlan:
+    """
+    크롤링 계획
+    - known_pairs: 캐시에 있는 쌍
+    - unknown_pairs: 새로 크롤링해야 하는 쌍 (최근 크롤링에서 결과가 없었던 쌍은 제외)
+    - sessions: MyChemicals 세션별 CAS 리스트 (각 세션이 하나의 N×N 반응성 페이지)
+    """
+
+    def __init__(self, pairs: List[PairKey], known_pairs: List[PairKey],
+                 unknown_pairs: List[PairKey], sessions: List[List[str]]):
+        self.pairs = pairs
+        self.known_pairs = known_pairs
+        self.unknown_pairs = unknown_pairs
+        self.sessions = sessions
+
+    @property
+    def fully_cached(self) -> bool:
+        return bool(self.pairs) and not self.unknown_pairs
+
+    def __repr__(self):
+        return (
+            f"CrawlPlan(pairs={len(self.pairs)}, known={len(self.known_pairs)}, "
+            f"unknown={len(self.unknown_pairs)}, sessions={[len(s) for s in self.sessions]})"
+        )
+
+
+def plan_crawl(cas_numbers: List[str], known: Dict[PairKey, PairRecord],
+               not_found: Set[PairKey] = frozenset()) -> CrawlPlan:
+    """
+    알려진 쌍/모르는 쌍을 나누고 크롤링 세션 구성
+
+    모르는 쌍을 간선으로 하는 그래프의 연결 요소마다 세션 하나:
+    - 각 CAS는 정확히 한 세션에만 추가됨 (물질 추가 횟수 최소)
+    - 모르는 쌍이 없는 CAS는 추가하지 않음
+    - 서로 무관한 요소끼리는 세션을 나눠 N×N 페이지 크기를 줄임
+    """
+    cas_list = unique_cas(cas_numbers)
+    pairs = cas_pairs(cas_list)
+    known_pairs = [key for key in pairs if key in known]
+    unknown_pairs = [key for key in pairs if key not in known and key not in not_found]
+
+    # Union-Find로 연결 요소 계산
+    parent = {cas: cas for cas in cas_list}
+
+    def find(cas):
+        while parent[cas] != cas:
+            parent[cas] = parent[parent[cas]]
+            cas = parent[cas]
+        return cas
+
+    touched = set()
+    for cas_1, cas_2 in unknown_pairs:
+        touched.add(cas_1)
+        touched.add(cas_2)
+        root_1, root_2 = find(cas_1), find(cas_2)
+        if root_1 != root_2:
+            parent[root_2] = root_1
+
+    # 입력 순서를 유지하며 요소별로 묶기
+    components: Dict[str, List[str]] = {}
+    for cas in cas_list:
+        if cas in touched:
+            components.setdefault(find(cas), []).append(cas)
+
+    return CrawlPlan(pairs, known_pairs, unknown_pairs, list(components.values()))
+
+
+def merge_results(plan: CrawlPlan, known: Dict[PairKey, PairRecord],
+                  fresh: Dict[PairKey, Dict], unmapped: List[Dict]) -> List[PairRecord]:
+    """
+    캐시 결과 + 새 크롤링 결과 합치기
+    요청의 쌍 순서대로 정렬하고, CAS로 매핑하지 못한 결과는 뒤에 붙임
+    (같은 CAMEO 물질인 CAS가 여러 개면 같은 물질명 조합이 여러 쌍에 저장되므로 한 번만 포함)
+    """
+    entries = []
+    seen = set()
+    for key in plan.pairs:
+        entry = fresh.get(key) or known.get(key)
+        if entry is None:
+            continue
+        record = as_record(entry)
+        names = frozenset(((record.chemical_1 or "").strip().upper(), (record.chemical_2 or "").strip().upper()))
+        if names in seen:
+            continue
+        seen.add(names)
+        entries.append(record)
+    entries.extend(unmapped)
+    return assemble_results(entries)
+
+
+async def crawl_incremental(
+    cas_numbers: List[str],
+    cache: CameoCache,
+    crawl: Callable[[List[str], dict], Awaitable[list]],
+    cas_names: Optional[dict] = None,
+    kb: Optional[ReactivityKB] = None,
+) -> List[PairRecord]:
+    """
+    증분 크롤링: 캐시/지식 베이스에 없는 쌍만 크롤링 후 알려진 결과와 병합
+
+    Args:
+        cas_numbers: 요청의 CAS 번호 리스트
+        cache: CameoCache
+        crawl: (substances, cas_names) → result_entry 리스트 (crawl_cameo_sequential 래퍼)
+        cas_names: 넘기면 요청 CAS 중 물질명을 아는 것의 {CAS: CAMEO 물질명} 매핑을 채워줌
+        kb: ReactivityKB (캐시에 없는 쌍을 조회, 새 크롤링 결과도 저장)
+    """
+    # 캐시 / 지식 베이스는 동기 SQLite이므로 이벤트 루프를 막지 않도록 스레드에서 조회 / 저장
+    known, not_found = await asyncio.to_thread(_lookup, cas_pairs(cas_numbers), cache, kb)
+    plan = plan_crawl(cas_numbers, known, not_found)
+    logger.info(f"[Planner] {plan}")
+
+    for key in plan.known_pairs:
+        emit_crawl_event("pair", cached=True, **known[key].to_dict())
+
+    if plan.fully_cached:
+        if cas_names is not None:
+            cas_names.update(await asyncio.to_thread(_known_names, cas_numbers, cache, kb))
+        return merge_results(plan, known, {}, [])
+
+    async def run_session(session: List[str]):
+        cas_names = {}
+        results = await crawl(session, cas_names)
+        await asyncio.to_thread(_store, results, cas_names, session, cache, kb)
+        return cache.index_results(results, cas_names)
+
+    # 세션끼리는 독립적이므로 동시에 실행 (동시성은 브라우저 풀이 제한)
+    fresh = {}
+    unmapped = []
+    for mapped, leftover in await asyncio.gather(*(run_session(s) for s in plan.sessions)):
+        fresh.update(mapped)
+        unmapped.extend(leftover)
+
+    if cas_names is not None:
+        cas_names.update(await asyncio.to_thread(_known_names, cas_numbers, cache, kb))
+    return merge_results(plan, known, fresh, unmapped)
+
+
+def _lookup(pairs: List[PairKey], cache: CameoCache,
+            kb: Optional[ReactivityKB]) -> Tuple[Dict[PairKey, PairRecord], Set[PairKey]]:
+    """캐시 → 지식 베이스 순으로 알려진 쌍 조회 → (알려진 쌍, 최근 결과가 없었던 쌍)"""
+    known = cache.get_many(pairs)
+    cache_lookups.inc(len(known), cache="cameo", result="hit")
+    cache_lookups.inc(len(pairs) - len(known), cache="cameo", result="miss")
+
+    if kb is not None and len(known) < len(pairs):
+        from_kb = kb.get_many([key for key in pairs if key not in known])
+        cache_lookups.inc(len(from_kb), cache="reactivity_kb", result="hit")
+        cache_lookups.inc(len(pairs) - len(known) - len(from_kb), cache="reactivity_kb", result="miss")
+        known.update(from_kb)
+
+    return known, cache.not_found([key for key in pairs if key not in known])
+
+
+def _store(results: List[Dict], cas_names: Dict[str, str], session: List[str],
+           cache: CameoCache, kb: Optional[ReactivityKB]):
+    """크롤링 세션 결과를 캐시 / 지식 베이스에 저장"""
+    cache.store_results(results, cas_names, crawled=session)
+    if kb is not None:
+        kb.store_results(results, cas_names)
+
+
+def _known_names(cas_numbers: List[str], cache: CameoCache, kb: Optional[ReactivityKB]) -> Dict[str, str]:
+    """캐시 → 지식 베이스 순으로 {CAS: CAMEO 물질명}"""
+    names = cache.get_names(cas_numbers)
+    if kb is not None and len(names) < len(unique_cas(cas_numbers)):
+        names = {**kb.get_names(cas_numbers), **names}
+    return names
@@ -0,0 +1,183 @@
+"""
+로컬 CAMEO 대역 서버 (오프라인 테스트용)
+크롤러가 쓰는 셀렉터와 같은 마크업으로 검색 / MyChemicals / 반응성 페이지 제공
+데이터: fixtures/cameo_fixture.json
+
+실행:
+    uvicorn fake_cameo:app --port 8100
+    CAMEO_BASE_URL=http://127.0.0.1:8100 python backend_gemini_only.py
+
+응답 지연 (실제 CAMEO처럼 느리게):
+    FAKE_CAMEO_LATENCY=0.3 FAKE_CAMEO_JITTER=0.1 uvicorn fake_cameo:app --port 8100
+"""
+
+import asyncio
+import json
+import os
+import random
+import uuid
+import zlib
+from html import escape
+from itertools import combinations
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, RedirectResponse
+
+
+FIXTURE_PATH = os.getenv(
+    "FAKE_CAMEO_FIXTURE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "cameo_fixture.json")
+)
+SESSION_COOKIE = "cameo_session"
+
+# 요청마다 넣을 지연 (초): LATENCY ± JITTER (균등 분포), 반응성 페이지는 쌍 개수만큼 추가 지연
+FAKE_CAMEO_LATENCY = float(os.getenv("FAKE_CAMEO_LATENCY", "0"))
+FAKE_CAMEO_JITTER = float(os.getenv("FAKE_CAMEO_JITTER", "0"))
+FAKE_CAMEO_PAIR_LATENCY = float(os.getenv("FAKE_CAMEO_PAIR_LATENCY", "0"))
+
+
+def load_fixture(path: str = FIXTURE_PATH) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    chemicals_by_cas = {c["cas"]: c for c in data["chemicals"]}
+    chemicals_by_id = {c["id"]: c for c in data["chemicals"]}
+    pairs = {frozenset(p["cas"]): p for p in data["pairs"]}
+
+    return {
+        "by_cas": chemicals_by_cas,
+        "by_id": chemicals_by_id,
+        "pairs": pairs,
+        "default_statuses": data["default_statuses"],
+    }
+
+
+fixture = load_fixture()
+
+# 세션 쿠키 → MyChemicals 물질 id 리스트
+sessions = {}
+
+app = FastAPI(title="Fake CAMEO Chemicals")
+
+
+async def simulate_latency():
+    delay = FAKE_CAMEO_LATENCY
+    if FAKE_CAMEO_JITTER > 0:
+        delay += random.uniform(-FAKE_CAMEO_JITTER, FAKE_CAMEO_JITTER)
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+@app.middleware("http")
+async def latency_middleware(request: Request, call_next):
+    await simulate_latency()
+    return await call_next(request)
+
+
+def _session_id(request: Request) -> str:
+    return request.cookies.get(SESSION_COOKIE) or uuid.uuid4().hex
+
+
+def _page(request: Request, title: str, body: str) -> HTMLResponse:
+    session_id = _session_id(request)
+    count = len(sessions.get(session_id, []))
+    html = f"""<!DOCTYPE html>
+<html><head><title>{escape(title)} | CAMEO Chemicals</title>
+<link rel="stylesheet" href="/css/cameo.css"></head>
+<body>
+<div id="sidebar">
+  <a href="/search/simple">New Search</a>
+  <a href="/mychemicals">MyChemicals ({count})</a>
+  <a href="/reactivity">Predict Reactivity</a>
+</div>
+<div id="content">
+{body}
+</div>
+</body></html>"""
+    response = HTMLResponse(html)
+    response.set_cookie(SESSION_COOKIE, session_id)
+    return response
+
+
+def pair_result(cas_1: str, cas_2: str) -> dict:
+    """fixture에 있는 쌍은 그대로, 없는 쌍은 CAS로 결정되는 기본값"""
+    known = fixture["pairs"].get(frozenset((cas_1, cas_2)))
+    if known:
+        return known
+    defaults = fixture["default_statuses"]
+    key = "|".join(sorted((cas_1, cas_2))).encode()
+    return defaults[zlib.crc32(key) % len(defaults)]
+
+
+@app.get("/search/simple")
+async def search_page(request: Request):
+    body = """<h1>Simple Search</h1>
+<form action="/search/results" method="get">
+  <input type="hidden" name="search_type" value="simple">
+  <label>CAS Number <input type="text" name="cas" value=""></label>
+  <input type="submit" value="Search">
+</form>"""
+    return _page(request, "Simple Search", body)
+
+
+@app.get("/search/results")
+async def search_results(request: Request, cas: str = ""):
+    chemical = fixture["by_cas"].get(cas.strip())
+    if chemical is None:
+        return _page(request, "Search Results", "<h1>Search Results</h1><p>No results found.</p>")
+
+    body = f"""<h1>Search Results</h1>
+<table class="results">
+  <tr>
+    <td><a href="/chemical/{chemical['id']}">{escape(chemical['name'])}</a></td>
+    <td>CAS {escape(chemical['cas'])}</td>
+    <td><a class="pseudo_button" href="/mychemicals/add/{chemical['id']}">Add to MyChemicals</a></td>
+  </tr>
+</table>"""
+    return _page(request, "Search Results", body)
+
+
+@app.get("/mychemicals/add/{chemical_id}")
+async def add_to_mychemicals(request: Request, chemical_id: int):
+    session_id = _session_id(request)
+    chemicals = sessions.setdefault(session_id, [])
+    if chemical_id in fixture["by_id"] and chemical_id not in chemicals:
+        chemicals.append(chemical_id)
+
+    response = RedirectResponse("/mychemicals", status_code=303)
+    response.set_cookie(SESSION_COOKIE, session_id)
+    return response
+
+
+@app.get("/mychemicals")
+async def mychemicals(request: Request):
+    chemicals = [fixture["by_id"][i] for i in sessions.get(_session_id(request), [])]
+    items = "\n".join(
+        f'  <li><a href="/chemical/{c["id"]}">{escape(c["name"])}</a></li>' for c in chemicals
+    )
+    return _page(request, "MyChemicals", f"<h1>MyChemicals</h1>\n<ul>\n{items}\n</ul>")
+
+
+@app.get("/reactivity")
+async def reactivity(request: Request):
+    chemicals = [fixture["by_id"][i] for i in sessions.get(_session_id(request), [])]
+
+    # 물질이 많을수록 결과 페이지 생성이 느린 것을 흉내
+    pair_count = len(chemicals) * (len(chemicals) - 1) // 2
+    if FAKE_CAMEO_PAIR_LATENCY > 0:
+        await asyncio.sleep(FAKE_CAMEO_PAIR_LATENCY * pair_count)
+
+    blocks = []
+    for n, (chem_1, chem_2) in enumerate(combinations(chemicals, 2), start=1):
+        result = pair_result(chem_1["cas"], chem_2["cas"])
+        hazards = "".join(f"<li>{escape(d)}</li>" for d in result["descriptions"])
+        hazard_list = f'<ul class="spaced3">{hazards}</ul>' if hazards else ""
+        blocks.append(f"""<div class="pairwise_hazards" id="Pair_{n}">
+  <h3><a href="/chemical/{chem_1['id']}">{escape(chem_1['name'])}</a>
+  mixed with <a href="/chemical/{chem_2['id']}">{escape(chem_2['name'])}</a></h3>
+  <div class="status"><strong>{escape(result['status'])}</strong></div>
+  {hazard_list}
+  <p><a href="/reactivity/documentation/{chem_1['id']}/{chem_2['id']}">Documentation</a></p>
+</div>""")
+
+    return _page(request, "Reactivity", "<h1>Predicted Reactivity</h1>\n" + "\n".join(blocks))
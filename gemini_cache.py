@@ -0,0 +1,187 @@
+"""
+Gemini 요약 캐시
+프롬프트는 규칙 기반 분석 결과의 순수 함수이므로 같은 혼합물 → 같은 프롬프트
+정규화한 프롬프트 + 모델 이름의 해시를 키로 응답 메시지를 저장
+- 메모리 LRU + (선택) SQLite 디스크 캐시
+- TTL 만료, hit/miss 및 절약한 토큰 수 통계
+- async 핸들러에서는 get_async / put_async 사용 (SQLite 조회 / 저장을 스레드에서 실행)
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+# 캐시 설정 (환경 변수로 조정)
+GEMINI_CACHE_SIZE = int(os.getenv("GEMINI_CACHE_SIZE", "1000"))
+GEMINI_CACHE_TTL = float(os.getenv("GEMINI_CACHE_TTL", str(24 * 3600)))  # 1일
+GEMINI_CACHE_DB = os.getenv("GEMINI_CACHE_DB", "")  # 비어 있으면 메모리만 사용
+
+
+def prompt_fingerprint(prompt: str, model: str) -> str:
+    """정규화한 프롬프트(공백 정리) + 모델 이름 → SHA-256"""
+    normalized = " ".join(prompt.split())
+    return hashlib.sha256(f"{model}\n{normalized}".encode("utf-8")).hexdigest()
+
+
+def estimate_tokens(text: str) -> int:
+    """usage 정보가 없을 때 쓰는 대략적인 토큰 수 (4글자 ≈ 1토큰)"""
+    return max(1, len(text) // 4) if text else 0
+
+
+class GeminiSummaryCache:
+    """
+    프롬프트 지문 → Gemini 요약 메시지 캐시
+    - 메모리 LRU (max_size개)
+    - db_path가 있으면 SQLite에도 저장 (재시작 후에도 유지)
+    """
+
+    def __init__(
+        self,
+        max_size: int = GEMINI_CACHE_SIZE,
+        ttl: float = GEMINI_CACHE_TTL,
+        db_path: str = GEMINI_CACHE_DB,
+    ):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self.db_path = db_path
+
+        # fingerprint → (expires_at, {"message", "tokens"})
+        self._memory: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = self._open_db(db_path) if db_path else None
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.expired = 0
+        self.evictions = 0
+        self.tokens_saved = 0
+
+    def get(self, fingerprint: str) -> Optional[str]:
+        """캐시된 요약 메시지 (없거나 만료되면 None)"""
+        now = time.time()
+
+        with self._lock:
+            item = self._memory.get(fingerprint)
+            if item is not None:
+                expires_at, entry = item
+                if expires_at > now:
+                    self._memory.move_to_end(fingerprint)
+                    return self._hit(entry)
+                del self._memory[fingerprint]
+                self.expired += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT message, tokens, expires_at FROM gemini_summaries WHERE fingerprint = ?",
+                    (fingerprint,)
+                ).fetchone()
+                if row is not None:
+                    entry, expires_at = {"message": row[0], "tokens": row[1]}, row[2]
+                    if expires_at > now:
+                        self._remember(fingerprint, entry, expires_at)
+                        self.disk_hits += 1
+                        return self._hit(entry)
+                    self._db.execute(
+                        "DELETE FROM gemini_summaries WHERE fingerprint = ?", (fingerprint,)
+                    )
+                    self._db.commit()
+                    self.expired += 1
+
+            self.misses += 1
+            return None
+
+    def put(self, fingerprint: str, message: str, tokens: int):
+        """
+        요약 메시지 저장
+
+        Args:
+            tokens: 이 요약을 만드는 데 쓴 토큰 수 (캐시 hit 시 절약량으로 집계)
+        """
+        entry = {"message": message, "tokens": int(tokens or 0)}
+        expires_at = time.time() + self.ttl
+
+        with self._lock:
+            self._remember(fingerprint, entry, expires_at)
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO gemini_summaries (fingerprint, message, tokens, expires_at) VALUES (?, ?, ?, ?)",
+                    (fingerprint, message, entry["tokens"], expires_at)
+                )
+                self._db.commit()
+
+    async def get_async(self, fingerprint: str) -> Optional[str]:
+        """get과 같음 (디스크 캐시를 쓰면 이벤트 루프를 막지 않도록 스레드에서)"""
+        if self._db is None:
+            return self.get(fingerprint)
+        return await asyncio.to_thread(self.get, fingerprint)
+
+    async def put_async(self, fingerprint: str, message: str, tokens: int):
+        """put과 같음 (디스크 캐시를 쓰면 이벤트 루프를 막지 않도록 스레드에서)"""
+        if self._db is None:
+            self.put(fingerprint, message, tokens)
+        else:
+            await asyncio.to_thread(self.put, fingerprint, message, tokens)
+
+    def clear(self):
+        """메모리/디스크 캐시 모두 비우기"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM gemini_summaries")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        """캐시 통계 (헬스 체크용)"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._memory),
+            "max_size": self.max_size,
+            "persistent": self._db is not None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "tokens_saved": self.tokens_saved,
+        }
+
+    def _hit(self, entry: Dict) -> str:
+        self.hits += 1
+        self.tokens_saved += entry["tokens"]
+        return entry["message"]
+
+    def _remember(self, fingerprint: str, entry: Dict, expires_at: float):
+        """메모리 LRU에 저장 (가득 차면 가장 오래된 항목 제거)"""
+        self._memory[fingerprint] = (expires_at, entry)
+        self._memory.move_to_end(fingerprint)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    @staticmethod
+    def _open_db(db_path: str):
+        dirpath = os.path.dirname(db_path)
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+
+        db = sqlite3.connect(db_path, check_same_thread=False)
+        db.execute(
+            """CREATE TABLE IF NOT EXISTS gemini_summaries (
+                fingerprint TEXT PRIMARY KEY,
+                message TEXT NOT NULL,
+                tokens INTEGER NOT NULL,
+                expires_at REAL NOT NULL
+            )"""
+        )
+        db.commit()
+        return db
@@ -0,0 +1,327 @@
+"""
+Gemini 비동기 클라이언트
+이벤트 루프를 막지 않도록 SDK의 async API 사용
+- 호출당 타임아웃
+- 동시 호출 수 제한
+- 지수 백오프 + 지터 재시도
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from typing import Optional
+
+import google.generativeai as genai
+
+from gemini_cache import estimate_tokens
+from gemini_stub import GEMINI_STUB, StubGenerativeModel
+from metrics import errors, retries as retry_counter
+from pair_record import as_analyzed
+
+
+logger = logging.getLogger(__name__)
+
+
+# Gemini 호출 설정 (환경 변수로 조정)
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "30"))              # 호출당 타임아웃 (초)
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))  # 동시 호출 수
+GEMINI_BACKOFF_BASE = float(os.getenv("GEMINI_BACKOFF_BASE", "1.0"))    # 첫 재시도 대기 상한 (초)
+GEMINI_BACKOFF_MAX = float(os.getenv("GEMINI_BACKOFF_MAX", "8.0"))      # 재시도 대기 최대 (초)
+
+_semaphore = None
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(max(1, GEMINI_MAX_CONCURRENCY))
+    return _semaphore
+
+
+async def _acquire_slot(deadline: Optional[float]) -> bool:
+    """동시 호출 슬롯 대기 (deadline이 있으면 그때까지만) → 얻었으면 True (호출 후 _get_semaphore().release())"""
+    timeout = None if deadline is None else deadline - time.monotonic()
+    try:
+        await asyncio.wait_for(_get_semaphore().acquire(), timeout=timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+def new_model():
+    """Gemini 모델 (GEMINI_STUB=1이면 오프라인 대역)"""
+    if GEMINI_STUB:
+        return StubGenerativeModel(GEMINI_MODEL)
+    return genai.GenerativeModel(GEMINI_MODEL)
+
+
+def backoff_delay(attempt: int) -> float:
+    """attempt번째 실패 후 대기 시간 (full jitter: 0 ~ min(max, base * 2^(attempt-1)))"""
+    return random.uniform(0, min(GEMINI_BACKOFF_MAX, GEMINI_BACKOFF_BASE * (2 ** (attempt - 1))))
+
+
+def attempt_timeout(deadline: Optional[float]) -> float:
+    """이번 시도에 쓸 타임아웃 (deadline: time.monotonic() 기준 마감 시각, 없으면 GEMINI_TIMEOUT)"""
+    if deadline is None:
+        return GEMINI_TIMEOUT
+    return min(GEMINI_TIMEOUT, deadline - time.monotonic())
+
+
+def build_gemini_prompt(analysis_result: dict) -> str:
+    """규칙 기반 분석 결과 → Gemini 프롬프트 (토큰 절약을 위한 최소 정보)"""
+    summary = analysis_result.get("summary", {})
+    overall_status = summary.get("overall_status", "알 수 없음")
+    dangerous_count = summary.get("dangerous_count", 0)
+    caution_count = summary.get("caution_count", 0)
+    # AnalyzedPair 레코드와 pair_info dict 모두 받음
+    dangerous_pairs = [as_analyzed(pair) for pair in analysis_result.get("dangerous_pairs", [])[:3]]
+    caution_pairs = [as_analyzed(pair) for pair in analysis_result.get("caution_pairs", [])[:2]]
+
+    # 위험 정보만 간단히
+    danger_info = []
+    for pair in dangerous_pairs:
+        danger_info.append({
+            "물질1": pair.chemical_1,
+            "물질2": pair.chemical_2,
+            "위험": pair.hazards[:2]  # 상위 2개만
+        })
+
+    caution_info = []
+    for pair in caution_pairs:
+        caution_info.append({
+            "물질1": pair.chemical_1,
+            "물질2": pair.chemical_2,
+            "위험": pair.hazards[:1]  # 상위 1개만
+        })
+
+    # 친근한 프롬프트 (사용자 UI용 - 이모지 절대 금지)
+    return f"""상태: {overall_status}
+위험: {dangerous_count}개, 주의: {caution_count}개
+
+위험 조합: {json.dumps(danger_info, ensure_ascii=False)}
+주의 조합: {json.dumps(caution_info, ensure_ascii=False)}
+
+IMPORTANT: 절대 이모지를 사용하지 마세요. 순수 텍스트만 사용하세요.
+
+자연스럽고 친근한 한국어로 3-5줄 요약:
+
+위험: "{dangerous_count}가지 위험한 조합이 발견되었어요.\\n\\n[각 조합의 위험성을 쉽게 설명]\\n\\n이 제품들을 함께 사용하면 위험할 수 있으니 주의해주세요."
+
+주의: "{caution_count}가지 주의가 필요한 조합이 있어요.\\n\\n[주의사항 설명]\\n\\n사용 시 주의가 필요해요."
+
+안전: "분석 결과 이 제품들은 함께 사용해도 안전해요!"
+
+답변 (텍스트만):"""
+
+
+def extract_message(response) -> str:
+    """Gemini 응답 객체 → 텍스트"""
+    message = None
+
+    if hasattr(response, "text") and response.text:
+        message = response.text.strip()
+    elif hasattr(response, "candidates") and response.candidates:
+        first_candidate = response.candidates[0]
+        if hasattr(first_candidate, "content") and first_candidate.content.parts:
+            parts = first_candidate.content.parts
+            message = "\n".join(
+                p.text.strip() for p in parts if hasattr(p, "text")
+            ).strip()
+
+    if not message and str(response):
+        message = str(response).strip()
+
+    return message
+
+
+def usage_tokens(response, prompt: str, message: str) -> int:
+    """응답의 전체 토큰 수 (usage 정보가 없으면 글자 수로 추정)"""
+    usage = getattr(response, "usage_metadata", None)
+    total = getattr(usage, "total_token_count", 0) if usage is not None else 0
+    return total or estimate_tokens(prompt) + estimate_tokens(message)
+
+
+def _failure(error: str, upstream_failed: bool, latency: float) -> dict:
+    """실패 결과 (Gemini 오류 없이 지연 예산만 소진했으면 "skipped": 서킷 브레이커 집계 제외)"""
+    if upstream_failed:
+        return {"success": False, "error": error, "latency": latency}
+    return {"success": False, "error": error, "latency": latency, "skipped": "latency_budget"}
+
+
+async def analyze_with_gemini_compact(analysis_result: dict, retries: int = 2,
+                                      deadline: Optional[float] = None) -> dict:
+    """
+    Gemini API로 화학 안전성 분석 결과를 간결하게 요약
+    토큰 절약을 위한 최소 프롬프트
+
+    Args:
+        deadline: time.monotonic() 기준 마감 시각 (재시도, 동시 호출 슬롯 대기 포함 전체 시간 제한)
+
+    Returns:
+        "latency": 마지막 Gemini 호출 한 번의 시간 (슬롯 대기, 재시도 대기 제외, 서킷 브레이커용)
+    """
+    if not os.getenv("GEMINI_API_KEY"):
+        return {
+            "success": False,
+            "error": "Gemini API key not configured",
+            "skipped": "no_api_key"
+        }
+
+    prompt = build_gemini_prompt(analysis_result)
+    error = None
+    upstream_failed = False  # Gemini 쪽 오류/타임아웃이 있었는지 (지연 예산 때문에 잘린 시도는 제외)
+    latency = 0.0
+
+    for attempt in range(1, retries + 1):
+        timeout = attempt_timeout(deadline)
+        if timeout <= 0 or not await _acquire_slot(deadline):
+            error = error or "Latency budget exhausted"
+            break
+
+        try:
+            logger.info(f"[Gemini] Attempt {attempt}/{retries}")
+            if attempt > 1:
+                retry_counter.inc(kind="gemini")
+
+            model = new_model()
+
+            # Gemini 호출 (슬롯을 기다린 만큼 타임아웃을 줄이고, 호출 구간만 시간 측정)
+            timeout = attempt_timeout(deadline)
+            started = time.monotonic()
+            try:
+                response = await asyncio.wait_for(
+                    model.generate_content_async(prompt), timeout=timeout
+                )
+            finally:
+                latency = time.monotonic() - started
+
+            message = extract_message(response)
+
+            # 검증
+            if message and len(message) > 10:
+                logger.info(f"[Gemini] OK ({len(message)} chars)")
+                return {
+                    "success": True,
+                    "message": message,
+                    "tokens": usage_tokens(response, prompt, message),
+                    "latency": latency
+                }
+
+            logger.warning(f"[Gemini] Empty response")
+            error = "Empty response"
+            upstream_failed = True
+
+        except asyncio.TimeoutError:
+            logger.warning(f"[Gemini] Timeout after {timeout:.1f}s")
+            error = f"Timeout after {timeout:.1f}s"
+            errors.inc(kind="gemini_timeout")
+            # 지연 예산이 타임아웃을 줄인 경우는 Gemini 장애로 보지 않음
+            upstream_failed = upstream_failed or timeout >= GEMINI_TIMEOUT
+        except Exception as e:
+            logger.warning(f"[Gemini] Error: {e}")
+            error = str(e)
+            errors.inc(kind="gemini")
+            upstream_failed = True
+        finally:
+            _get_semaphore().release()
+
+        if attempt < retries:
+            await asyncio.sleep(backoff_delay(attempt))
+
+    return _failure(error, upstream_failed, latency)
+
+
+async def stream_gemini_compact(analysis_result: dict, on_token, retries: int = 2,
+                                deadline: Optional[float] = None) -> dict:
+    """
+    analyze_with_gemini_compact의 스트리밍 버전
+    응답 조각이 도착할 때마다 on_token(text) 호출 (첫 조각 전에 실패한 경우만 재시도)
+    """
+    if not os.getenv("GEMINI_API_KEY"):
+        return {
+            "success": False,
+            "error": "Gemini API key not configured",
+            "skipped": "no_api_key"
+        }
+
+    prompt = build_gemini_prompt(analysis_result)
+    error = None
+    upstream_failed = False  # Gemini 쪽 오류/타임아웃이 있었는지 (지연 예산 때문에 잘린 시도는 제외)
+    latency = 0.0
+
+    for attempt in range(1, retries + 1):
+        timeout = attempt_timeout(deadline)
+        if timeout <= 0 or not await _acquire_slot(deadline):
+            error = error or "Latency budget exhausted"
+            break
+
+        chunks = []
+        streamed = {}
+
+        async def consume():
+            model = new_model()
+            response = await model.generate_content_async(prompt, stream=True)
+            streamed["response"] = response
+
+            async for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # 텍스트가 없는 조각 (안전 필터 등)
+                    text = ""
+                if text:
+                    chunks.append(text)
+                    on_token(text)
+
+        try:
+            logger.info(f"[Gemini] Streaming attempt {attempt}/{retries}")
+            if attempt > 1:
+                retry_counter.inc(kind="gemini")
+
+            # 슬롯을 기다린 만큼 타임아웃을 줄이고, 호출 구간만 시간 측정
+            timeout = attempt_timeout(deadline)
+            started = time.monotonic()
+            try:
+                await asyncio.wait_for(consume(), timeout=timeout)
+            finally:
+                latency = time.monotonic() - started
+
+            message = "".join(chunks).strip()
+            if message and len(message) > 10:
+                logger.info(f"[Gemini] OK ({len(message)} chars, streamed)")
+                return {
+                    "success": True,
+                    "message": message,
+                    "tokens": usage_tokens(streamed.get("response"), prompt, message),
+                    "latency": latency
+                }
+
+            logger.warning(f"[Gemini] Empty response")
+            error = "Empty response"
+            upstream_failed = True
+
+        except asyncio.TimeoutError:
+            logger.warning(f"[Gemini] Timeout after {timeout:.1f}s")
+            error = f"Timeout after {timeout:.1f}s"
+            errors.inc(kind="gemini_timeout")
+            # 지연 예산이 타임아웃을 줄인 경우는 Gemini 장애로 보지 않음
+            upstream_failed = upstream_failed or timeout >= GEMINI_TIMEOUT
+        except Exception as e:
+            logger.warning(f"[Gemini] Error: {e}")
+            error = str(e)
+            errors.inc(kind="gemini")
+            upstream_failed = True
+        finally:
+            _get_semaphore().release()
+
+        # 이미 일부를 보냈으면 재시도하지 않음 (클라이언트 화면에 중복 출력 방지)
+        if chunks:
+            break
+        if attempt < retries:
+            await asyncio.sleep(backoff_delay(attempt))
+
+    return _failure(error, upstream_failed, latency)
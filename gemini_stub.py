@@ -0,0 +1,87 @@
+"""
+Gemini 대역 모델 (오프라인 테스트 / 벤치마크용)
+GEMINI_STUB=1이면 gemini_client가 실제 API 대신 사용
+- 지연: GEMINI_STUB_LATENCY ± GEMINI_STUB_JITTER (초)
+- 실패율: GEMINI_STUB_FAILURE_RATE (0~1, 서킷 브레이커 / 재시도 확인용)
+- 응답: 프롬프트의 상태/개수로 만든 고정 문장 (같은 프롬프트 → 같은 응답)
+"""
+
+import asyncio
+import os
+import random
+import re
+
+
+# 대역 설정 (환경 변수로 조정)
+GEMINI_STUB = os.getenv("GEMINI_STUB", "0") == "1"
+GEMINI_STUB_LATENCY = float(os.getenv("GEMINI_STUB_LATENCY", "1.0"))
+GEMINI_STUB_JITTER = float(os.getenv("GEMINI_STUB_JITTER", "0.2"))
+GEMINI_STUB_FAILURE_RATE = float(os.getenv("GEMINI_STUB_FAILURE_RATE", "0"))
+GEMINI_STUB_CHUNKS = 4  # 스트리밍 시 응답을 나눌 조각 수
+
+
+class _UsageMetadata:
+    def __init__(self, prompt: str, text: str):
+        self.prompt_token_count = max(1, len(prompt) // 4)
+        self.candidates_token_count = max(1, len(text) // 4)
+        self.total_token_count = self.prompt_token_count + self.candidates_token_count
+
+
+class StubResponse:
+    """generate_content 응답 (text, usage_metadata만 흉내)"""
+
+    def __init__(self, prompt: str, text: str):
+        self.text = text
+        self.usage_metadata = _UsageMetadata(prompt, text)
+
+
+class StubStreamResponse:
+    """stream=True 응답: async for로 조각을 받음"""
+
+    def __init__(self, prompt: str, text: str, delay: float):
+        self._prompt = prompt
+        self._text = text
+        self._delay = delay
+        self.usage_metadata = None
+
+    async def __aiter__(self):
+        size = max(1, -(-len(self._text) // GEMINI_STUB_CHUNKS))
+        for start in range(0, len(self._text), size):
+            await asyncio.sleep(self._delay / GEMINI_STUB_CHUNKS)
+            yield StubResponse(self._prompt, self._text[start:start + size])
+        self.usage_metadata = _UsageMetadata(self._prompt, self._text)
+
+
+def stub_message(prompt: str) -> str:
+    """프롬프트의 상태/개수로 만든 요약 문장"""
+    status = re.search(r"상태: (\S+)", prompt)
+    counts = re.search(r"위험: (\d+)개, 주의: (\d+)개", prompt)
+    status = status.group(1) if status else "알 수 없음"
+    dangerous, caution = counts.groups() if counts else ("0", "0")
+
+    if status == "위험":
+        return f"{dangerous}가지 위험한 조합이 발견되었어요.\n\n이 제품들을 함께 사용하면 위험할 수 있으니 주의해주세요."
+    if status == "주의":
+        return f"{caution}가지 주의가 필요한 조합이 있어요.\n\n사용 시 주의가 필요해요."
+    return "분석 결과 이 제품들은 함께 사용해도 안전해요!"
+
+
+class StubGenerativeModel:
+    """genai.GenerativeModel 대역 (generate_content_async만 지원)"""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        delay = max(0.0, GEMINI_STUB_LATENCY + random.uniform(-GEMINI_STUB_JITTER, GEMINI_STUB_JITTER))
+        text = stub_message(prompt)
+
+        if random.random() < GEMINI_STUB_FAILURE_RATE:
+            await asyncio.sleep(delay)
+            raise RuntimeError("Stub Gemini failure")
+
+        if stream:
+            return StubStreamResponse(prompt, text, delay)
+
+        await asyncio.sleep(delay)
+        return StubResponse(prompt, text)
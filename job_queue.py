@@ -0,0 +1,195 @@
+"""
+비동기 분석 작업 큐
+POST /jobs로 접수 → 워커가 백그라운드 실행 → GET /jobs/{id}로 상태/진행률/결과 조회
+- 큐 크기 제한, 동시 실행 워커 수 제한
+- 결과 보관 후 만료
+- 같은 내용의 작업이 대기/실행 중이면 기존 작업 id 반환
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from request_logging import request_id_var
+
+
+logger = logging.getLogger(__name__)
+
+
+# 작업 큐 설정 (환경 변수로 조정)
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))            # 동시에 실행할 분석(크롤링) 수
+JOB_RETENTION = float(os.getenv("JOB_RETENTION", "3600"))   # 완료된 작업 보관 시간 (초)
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 참"""
+
+
+class Job:
+    """작업 하나의 상태"""
+
+    def __init__(self, key: str, payload, stages: List[str]):
+        self.job_id = uuid.uuid4().hex
+        self.key = key
+        self.payload = payload
+        self.status = "queued"  # queued → running → succeeded / failed
+        self.stages = {stage: {"status": "pending"} for stage in stages}
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.error_code = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def update_stage(self, stage: str, status: str, **detail):
+        """단계 진행 상황 기록 (status: running / done / skipped / failed)"""
+        info = self.stages.setdefault(stage, {"status": "pending"})
+        now = time.time()
+        if status == "running":
+            info["started_at"] = now
+        elif "started_at" in info:
+            info["elapsed"] = round(now - info["started_at"], 3)
+        info["status"] = status
+        info.update(detail)
+
+
+class JobManager:
+    """
+    작업 큐 + 워커
+
+    Args:
+        runner: (payload, progress) → 결과. progress(stage, status, **detail)로 진행 상황 보고
+        stages: 진행률에 표시할 단계 이름
+    """
+
+    def __init__(
+        self,
+        runner: Callable[..., Awaitable],
+        stages: List[str],
+        workers: int = JOB_WORKERS,
+        queue_size: int = JOB_QUEUE_SIZE,
+        retention: float = JOB_RETENTION,
+    ):
+        self.runner = runner
+        self.stages = stages
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.retention = retention
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._jobs: Dict[str, Job] = {}
+        self._in_flight: Dict[str, str] = {}  # key → job_id
+        self._tasks = []
+
+        # 통계
+        self.submitted = 0
+        self.deduplicated = 0
+        self.rejected = 0
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(f"[Jobs] Started {self.workers} worker(s) (queue size={self.queue_size})")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("[Jobs] Stopped")
+
+    def submit(self, key: str, payload) -> Tuple[Job, bool]:
+        """
+        작업 접수
+
+        Returns:
+            (작업, 중복 여부) - 같은 key의 작업이 대기/실행 중이면 그 작업을 반환
+
+        Raises:
+            QueueFullError: 대기열이 가득 참
+        """
+        self._purge_expired()
+
+        existing_id = self._in_flight.get(key)
+        if existing_id and existing_id in self._jobs:
+            self.deduplicated += 1
+            return self._jobs[existing_id], True
+
+        job = Job(key, payload, self.stages)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFullError(f"Job queue is full ({self.queue_size})")
+
+        self._jobs[job.job_id] = job
+        self._in_flight[key] = job.job_id
+        self.submitted += 1
+        return job, False
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._purge_expired()
+        return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        statuses = {}
+        for job in self._jobs.values():
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "jobs": statuses,
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "rejected": self.rejected,
+        }
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job):
+        job.status = "running"
+        job.started_at = time.time()
+        # 작업 로그는 job id로 구분
+        token = request_id_var.set(f"job-{job.job_id[:8]}")
+
+        try:
+            job.result = await self.runner(job.payload, job.update_stage)
+            job.status = "succeeded"
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "Cancelled"
+            raise
+        except Exception as e:
+            # HTTPException 등은 detail/status_code를 그대로 보존
+            job.status = "failed"
+            job.error = str(getattr(e, "detail", None) or e)
+            job.error_code = getattr(e, "status_code", 500)
+            logger.warning(f"[Jobs] Job {job.job_id} failed: {job.error}")
+        finally:
+            request_id_var.reset(token)
+            job.finished_at = time.time()
+            if self._in_flight.get(job.key) == job.job_id:
+                del self._in_flight[job.key]
+
+    def _purge_expired(self):
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and now - job.finished_at > self.retention
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,83 @@
+"""
+이벤트 루프 응답성 부하 테스트
+/hybrid-analyze (useAi=true) 요청을 동시에 보내는 동안 /health 응답 시간을 측정
+Gemini 호출이 이벤트 루프를 막으면 /health 지연이 Gemini 응답 시간만큼 늘어남
+
+Usage:
+    python backend_gemini_only.py                      # 다른 터미널에서 서버 실행
+    python loadtest_event_loop.py --concurrency 4
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+PAYLOAD = {
+    "useAi": True,
+    "products": [
+        {"productName": "Bleach", "casNumbers": ["7681-52-9"]},
+        {"productName": "Ammonia", "casNumbers": ["1336-21-6"]}
+    ]
+}
+
+
+def percentile(values: list, p: float) -> float:
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+async def analyze(client: httpx.AsyncClient, base_url: str, results: list):
+    start = time.perf_counter()
+    response = await client.post(f"{base_url}/hybrid-analyze", json=PAYLOAD, timeout=600)
+    results.append((response.status_code, time.perf_counter() - start))
+
+
+async def probe_health(client: httpx.AsyncClient, base_url: str, interval: float, stop: asyncio.Event, latencies: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(f"{base_url}/health", timeout=600)
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Event loop responsiveness under AI load")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--interval", type=float, default=0.1, help="/health probe interval (s)")
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient() as client:
+        # 기준값: 부하 없을 때 /health
+        baseline = []
+        for _ in range(10):
+            start = time.perf_counter()
+            await client.get(f"{args.url}/health")
+            baseline.append((time.perf_counter() - start) * 1000)
+
+        stop = asyncio.Event()
+        latencies = []
+        results = []
+        prober = asyncio.create_task(probe_health(client, args.url, args.interval, stop, latencies))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(analyze(client, args.url, results) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        await prober
+
+    print(f"Analyses: {args.concurrency} concurrent, finished in {elapsed:.1f}s")
+    print(f"  status codes: {sorted(code for code, _ in results)}")
+    print(f"/health baseline: median {statistics.median(baseline):.1f} ms")
+    print(f"/health under load ({len(latencies)} probes):")
+    print(f"  p50 {percentile(latencies, 50):.1f} ms   p95 {percentile(latencies, 95):.1f} ms   max {max(latencies):.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
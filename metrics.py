@@ -0,0 +1,166 @@
+"""
+분석 파이프라인 계측
+- span(stage): 단계별 소요 시간 → Prometheus 히스토그램 + 현재 요청의 timings
+- 카운터: 캐시 hit/miss, 재시도, 브라우저 실행, 오류
+- render(): Prometheus 텍스트 포맷 (GET /metrics)
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+
+# 단계 소요 시간 버킷 (초): 파싱 수 ms ~ 전체 크롤링 수 분
+STAGE_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+# 현재 요청의 단계별 누적 시간 {stage: 초} (하위 태스크와 공유)
+request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """단조 증가 카운터"""
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        if amount <= 0:
+            return
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """누적 버킷 히스토그램"""
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = STAGE_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # label 값 → [버킷별 개수..., 합계, 개수]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {series[-2]!r}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {series[-1]}")
+        return lines
+
+
+stage_duration = Histogram(
+    "chem_stage_duration_seconds",
+    "Time spent in each analysis stage",
+    ("stage",)
+)
+cache_lookups = Counter(
+    "chem_cache_lookups_total",
+    "Cache lookups by cache and result (hit/miss)",
+    ("cache", "result")
+)
+retries = Counter(
+    "chem_retries_total",
+    "Retries and fallbacks by kind",
+    ("kind",)
+)
+browser_launches = Counter(
+    "chem_browser_launches_total",
+    "Chromium launches (pool: shared pool, direct: per-request fallback)",
+    ("source",)
+)
+errors = Counter(
+    "chem_errors_total",
+    "Errors by kind",
+    ("kind",)
+)
+cache_warming = Counter(
+    "chem_cache_warming_total",
+    "Background cache warming by outcome (warmed: pairs crawled, skipped_busy: cycles skipped for live traffic)",
+    ("outcome",)
+)
+
+METRICS = (stage_duration, cache_lookups, retries, browser_launches, errors, cache_warming)
+
+
+@contextmanager
+def span(stage: str):
+    """with span("stage"): ... 블록 소요 시간 기록 (예외가 나도 기록)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_duration.observe(elapsed, stage=stage)
+        timings = request_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+def start_request_timings() -> Dict[str, float]:
+    """현재 태스크(와 하위 태스크)의 span을 모을 dict 설정"""
+    timings = {}
+    request_timings.set(timings)
+    return timings
+
+
+def format_timings(timings: Dict[str, float]) -> Dict[str, float]:
+    """응답용 timings (초, ms 단위 반올림)"""
+    return {stage: round(seconds, 3) for stage, seconds in timings.items()}
+
+
+def render() -> str:
+    """Prometheus 텍스트 포맷"""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
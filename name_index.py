@@ -0,0 +1,139 @@
+"""
+화학물질명 번역 인덱스 (safety_links.translate_chemical_name용)
+사전을 매번 선형 탐색하는 대신 미리 만든 인덱스로 조회
+- 대소문자 무시 일치: 대문자 키 → 해시
+- 사전 키가 이름에 포함: Aho-Corasick 오토마톤 (이름 길이에 비례)
+- 이름이 사전 키에 포함: 3-gram 역색인으로 후보를 좁힌 뒤 확인
+우선순위는 선형 탐색과 같음: 정확 일치 → 대소문자 무시 일치 → 부분 일치(사전 순서상 먼저인 키)
+(결과 LRU는 safety_links에서 화학물질명 DB 버전과 함께 관리)
+"""
+
+import os
+from typing import Dict, List, Optional, Set
+
+
+# 번역 결과 LRU 크기 (환경 변수로 조정)
+NAME_TRANSLATION_CACHE_SIZE = int(os.getenv("NAME_TRANSLATION_CACHE_SIZE", "4096"))
+
+NGRAM = 3
+
+
+def _ngrams(text: str) -> Set[str]:
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+class _KeywordAutomaton:
+    """
+    Aho-Corasick: 텍스트 안에 들어 있는 키 중 사전 순서가 가장 빠른 키의 index
+    """
+
+    def __init__(self, keys: List[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._first: List[Optional[int]] = [None]  # 노드에서 끝나는(실패 링크 포함) 키 중 최소 index
+
+        for index, key in enumerate(keys):
+            node = 0
+            for char in key:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._first.append(None)
+                node = nxt
+            if self._first[node] is None:
+                self._first[node] = index
+
+        # BFS로 실패 링크 계산 (부모가 먼저 처리되므로 실패 노드의 _first는 이미 확정)
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0) if node else 0
+                self._first[child] = _min_index(self._first[child], self._first[self._fail[child]])
+                queue.append(child)
+
+    def first_match(self, text: str) -> Optional[int]:
+        best = self._first[0]  # 빈 키는 항상 포함
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            best = _min_index(best, self._first[node])
+        return best
+
+
+def _min_index(a: Optional[int], b: Optional[int]) -> Optional[int]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a if a < b else b
+
+
+class ChemicalNameIndex:
+    """
+    영어명 → 한국어명 사전 인덱스 (생성 후 변경하지 않음, 사전이 바뀌면 새로 생성)
+    """
+
+    def __init__(self, names: Dict[str, str]):
+        self._exact = dict(names)
+        self._keys = [key.upper() for key in names]
+        self._values = list(names.values())
+
+        # 대문자 키 → 사전 순서상 첫 번째 index
+        self._upper: Dict[str, int] = {}
+        for index, key in enumerate(self._keys):
+            self._upper.setdefault(key, index)
+
+        self._contained = _KeywordAutomaton(self._keys)
+
+        # 3-gram → 그 3-gram을 가진 키 index 집합
+        self._ngram_index: Dict[str, Set[int]] = {}
+        for index, key in enumerate(self._keys):
+            for gram in _ngrams(key):
+                self._ngram_index.setdefault(gram, set()).add(index)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def translate(self, english_name: str) -> str:
+        """정확 → 대소문자 무시 → 부분 매칭, 매칭 실패시 원본 반환"""
+        kor = self.match_exact(english_name)
+        if kor is None:
+            kor = self.match_partial(english_name)
+        return kor if kor is not None else english_name
+
+    def match_exact(self, english_name: str) -> Optional[str]:
+        """정확한 매칭, 없으면 대소문자 무시 매칭"""
+        if english_name in self._exact:
+            return self._exact[english_name]
+
+        index = self._upper.get(english_name.upper())
+        return self._values[index] if index is not None else None
+
+    def match_partial(self, english_name: str) -> Optional[str]:
+        """부분 매칭 (예: "AMMONIA SOLUTION" -> "암모니아"): 양방향 중 사전 순서가 먼저인 키"""
+        upper_name = english_name.upper()
+        index = _min_index(self._contained.first_match(upper_name), self._first_containing(upper_name))
+        return self._values[index] if index is not None else None
+
+    def _first_containing(self, upper_name: str) -> Optional[int]:
+        """upper_name을 포함하는 키 중 최소 index"""
+        if len(upper_name) < NGRAM:
+            # 너무 짧으면 3-gram으로 좁힐 수 없음 → 직접 확인
+            candidates = range(len(self._keys))
+        else:
+            postings = sorted((self._ngram_index.get(gram, ()) for gram in _ngrams(upper_name)), key=len)
+            if not postings[0]:
+                return None
+            candidates = sorted(set(postings[0]).intersection(*postings[1:]))
+
+        for index in candidates:
+            if upper_name in self._keys[index]:
+                return index
+        return None
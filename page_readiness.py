@@ -0,0 +1,140 @@
+"""
+크롤러 페이지 준비 상태 대기
+고정 sleep / networkidle 대신 구체적인 신호(DOM 셀렉터, MyChemicals 개수 변경, 페이지 이동)를 기다림
+단계별 타임아웃 + 실제 대기 시간 기록
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+
+# 단계별 타임아웃 (ms)
+STEP_TIMEOUTS = {
+    "search_page": 15000,       # 검색 페이지의 CAS 입력창
+    "search_results": 20000,    # 검색 결과의 'Add to MyChemicals' 버튼
+    "add": 1000,                # MyChemicals 추가 신호 (못 받아도 기존 고정 대기와 같은 시간)
+    "new_search_link": 15000,   # 사이드바의 'New Search' 링크
+    "new_search": 15000,        # 'New Search' 후 검색 페이지
+    "predict_link": 15000,      # 사이드바의 'Predict Reactivity' 링크
+    "reactivity": 30000,        # 반응성 결과 페이지의 div.pairwise_hazards 블록
+}
+
+# 사이드바의 MyChemicals 링크 (텍스트에 담긴 물질 개수가 추가 완료 신호)
+MYCHEMICALS_COUNTER = "#sidebar a[href*='mychemicals']"
+
+_COUNTER_CHANGED = """([selector, before]) => {
+    const counter = document.querySelector(selector);
+    return counter !== null && counter.textContent !== before;
+}"""
+
+
+class ReadinessStats:
+    """단계별 대기 시간 통계"""
+
+    def __init__(self):
+        self._steps = {}
+
+    def record(self, step: str, waited_ms: float, ok: bool):
+        stat = self._steps.setdefault(step, {"count": 0, "timeouts": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stat["count"] += 1
+        stat["total_ms"] += waited_ms
+        stat["max_ms"] = max(stat["max_ms"], waited_ms)
+        if not ok:
+            stat["timeouts"] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            step: {
+                "count": stat["count"],
+                "timeouts": stat["timeouts"],
+                "avg_ms": round(stat["total_ms"] / stat["count"], 1),
+                "max_ms": round(stat["max_ms"], 1),
+            }
+            for step, stat in self._steps.items()
+        }
+
+
+# 전체 크롤러 공용 통계
+readiness_stats = ReadinessStats()
+
+
+def step_timeout(step: str) -> float:
+    return STEP_TIMEOUTS.get(step, 30000)
+
+
+@asynccontextmanager
+async def timed_step(step: str):
+    """블록 실행 시간을 단계 대기 시간으로 기록"""
+    start = time.perf_counter()
+    ok = True
+    try:
+        yield
+    except Exception:
+        ok = False
+        raise
+    finally:
+        readiness_stats.record(step, (time.perf_counter() - start) * 1000, ok)
+
+
+async def wait_for_selector(page, selector: str, step: str):
+    """셀렉터가 나타날 때까지 대기"""
+    async with timed_step(step):
+        await page.wait_for_selector(selector, timeout=step_timeout(step))
+
+
+async def navigate_and_wait(page, action, selector: str, step: str):
+    """
+    action(클릭/Enter)으로 페이지를 이동시킨 뒤 새 페이지의 셀렉터가 나타날 때까지 대기
+    이전 페이지에 같은 셀렉터가 있어도 잘못 통과하지 않도록 이동 완료를 먼저 기다림
+    """
+    timeout = step_timeout(step)
+    async with timed_step(step):
+        async with page.expect_navigation(wait_until="domcontentloaded", timeout=timeout):
+            await action()
+        await page.wait_for_selector(selector, timeout=timeout)
+
+
+async def click_and_wait_for_add(page, locator, step: str = "add") -> bool:
+    """
+    'Add to MyChemicals' 클릭 후 추가 완료 신호 중 먼저 오는 것을 기다림
+    - 링크 이동 (navigation commit)
+    - 사이드바 MyChemicals 개수 변경 (같은 페이지에서 갱신되는 경우)
+    타임아웃은 기존 고정 대기(1초)와 같으므로 신호를 못 받아도 따로 더 기다리지 않음
+
+    Returns:
+        신호를 받았으면 True, 타임아웃이면 False
+    """
+    timeout = step_timeout(step)
+    before_url = page.url
+    before_count = await page.evaluate(
+        "selector => document.querySelector(selector)?.textContent ?? null", MYCHEMICALS_COUNTER
+    )
+
+    waiters = [asyncio.ensure_future(
+        page.wait_for_url(lambda url: url != before_url, wait_until="commit", timeout=timeout)
+    )]
+    if before_count is not None:
+        waiters.append(asyncio.ensure_future(
+            page.wait_for_function(_COUNTER_CHANGED, arg=[MYCHEMICALS_COUNTER, before_count], timeout=timeout)
+        ))
+
+    start = time.perf_counter()
+    ok = False
+    try:
+        await locator.click()
+        pending = set(waiters)
+        while pending and not ok:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # 타임아웃 / 이동 중 실행 컨텍스트 소멸은 신호 없음으로 보고 나머지 대기를 계속 기다림
+            ok = any(waiter.exception() is None for waiter in done)
+    except PlaywrightTimeoutError:
+        ok = False
+    finally:
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        readiness_stats.record(step, (time.perf_counter() - start) * 1000, ok)
+    return ok
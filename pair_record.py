@@ -0,0 +1,132 @@
+"""
+CAMEO 조합 레코드 (크롤링 → 캐시 → 분석 파이프라인 내부 표현)
+- 조합마다 dict를 만드는 대신 __slots__ 데이터클래스 사용 (조합당 메모리 감소)
+- 물질명 / status는 sys.intern, 위험 설명 목록은 공유 튜플 (같은 값은 한 객체만 보관)
+- 변경 불가 (캐시와 여러 요청이 같은 레코드를 공유)
+- 기존 JSON 스키마(dict)는 응답/저장 경계에서만 to_dict()로 생성
+"""
+
+import sys
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
+
+
+def intern_text(value: Optional[str]) -> Optional[str]:
+    """같은 문자열은 한 객체만 보관 (None은 그대로)"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@lru_cache(maxsize=8192)
+def _shared(descriptions: Tuple[str, ...]) -> Tuple[str, ...]:
+    # lru_cache는 같은 값의 첫 번째 튜플을 돌려주므로 같은 위험 설명 목록은 한 튜플을 공유
+    return descriptions
+
+
+def shared_hazards(descriptions) -> Tuple[str, ...]:
+    """위험 설명 목록 → 공유 튜플 (각 설명 문자열도 intern)"""
+    return _shared(tuple(intern_text(desc) for desc in descriptions or ()))
+
+
+@dataclass(frozen=True, slots=True)
+class PairRecord:
+    """크롤러 result_entry 한 건"""
+    pair_id: Optional[str]
+    chemical_1: Optional[str]
+    chemical_2: Optional[str]
+    status: Optional[str]
+    descriptions: Tuple[str, ...]
+    documentation_link: Optional[str] = None
+
+    @classmethod
+    def from_entry(cls, entry: Dict) -> "PairRecord":
+        """result_entry dict → 레코드 (물질명 / status가 없으면 빈 문자열)"""
+        return cls(
+            pair_id=entry.get("pair_id"),
+            chemical_1=intern_text(entry.get("chemical_1", "")),
+            chemical_2=intern_text(entry.get("chemical_2", "")),
+            status=intern_text(entry.get("status", "")),
+            descriptions=shared_hazards(entry.get("descriptions")),
+            documentation_link=entry.get("documentation_link"),
+        )
+
+    def with_pair_id(self, pair_id: str) -> "PairRecord":
+        """pair_id만 바꾼 복사본 (나머지 필드는 공유)"""
+        return replace(self, pair_id=pair_id)
+
+    def to_dict(self) -> Dict:
+        """기존 result_entry 스키마"""
+        return {
+            "pair_id": self.pair_id,
+            "chemical_1": self.chemical_1,
+            "chemical_2": self.chemical_2,
+            "status": self.status,
+            "descriptions": list(self.descriptions),
+            "documentation_link": self.documentation_link,
+        }
+
+
+def as_record(entry: Union[PairRecord, Dict]) -> PairRecord:
+    """레코드 또는 result_entry dict → 레코드"""
+    return entry if isinstance(entry, PairRecord) else PairRecord.from_entry(entry)
+
+
+@dataclass(frozen=True, slots=True)
+class AnalyzedPair:
+    """규칙 기반 분석을 거친 조합 (SimpleChemicalAnalyzer의 pair_info)"""
+    chemical_1: Optional[str]
+    chemical_2: Optional[str]
+    status: str                  # 소문자 CAMEO status
+    risk_level: str              # 위험/주의/안전
+    severity_score: int
+    hazards: Tuple[str, ...]     # PairRecord.descriptions와 같은 튜플
+    main_hazard: Optional[str]   # 위험 조합 요약에 쓰는 주요 위험 설명
+
+    @property
+    def hazard_count(self) -> int:
+        return len(self.hazards)
+
+    @property
+    def summary(self) -> str:
+        """개별 조합 요약 문장 (필요할 때만 생성)"""
+        if self.risk_level == "위험":
+            if self.main_hazard:
+                return f"{self.chemical_1}와 {self.chemical_2}는 절대 혼합 금지! ({self.main_hazard})"
+            return f"{self.chemical_1}와 {self.chemical_2}는 절대 혼합 금지!"
+
+        elif self.risk_level == "주의":
+            return f"{self.chemical_1}와 {self.chemical_2}는 주의가 필요합니다."
+
+        else:
+            return f"{self.chemical_1}와 {self.chemical_2}는 안전합니다."
+
+    @classmethod
+    def from_dict(cls, info: Dict) -> "AnalyzedPair":
+        """pair_info dict → 레코드 (main_hazard는 dict에 없으므로 복원하지 않음)"""
+        return cls(
+            chemical_1=intern_text(info.get("chemical_1", "")),
+            chemical_2=intern_text(info.get("chemical_2", "")),
+            status=intern_text(info.get("status", "")),
+            risk_level=info.get("risk_level", ""),
+            severity_score=info.get("severity_score", 0),
+            hazards=shared_hazards(info.get("hazards")),
+            main_hazard=info.get("main_hazard"),
+        )
+
+    def to_dict(self) -> Dict:
+        """기존 pair_info 스키마"""
+        return {
+            "chemical_1": self.chemical_1,
+            "chemical_2": self.chemical_2,
+            "status": self.status,
+            "risk_level": self.risk_level,
+            "severity_score": self.severity_score,
+            "hazards": list(self.hazards),
+            "hazard_count": self.hazard_count,
+            "summary": self.summary,
+        }
+
+
+def as_analyzed(pair: Union[AnalyzedPair, Dict]) -> AnalyzedPair:
+    """분석된 조합 레코드 또는 pair_info dict → 레코드"""
+    return pair if isinstance(pair, AnalyzedPair) else AnalyzedPair.from_dict(pair)
@@ -0,0 +1,523 @@
+"""
+로컬 반응성 지식 베이스 (CAS 쌍 → CAMEO 반응성 결과, SQLite 영구 저장)
+- 지난 크롤링 결과 + (선택) 스냅샷 일괄 가져오기로 채움
+- CameoCache와 달리 만료되지 않음: 오래된 항목도 바로 응답에 쓰고, 백그라운드에서 다시 크롤링해 확인
+- 색인: 순서 무관 CAS 쌍 (기본 키), CAMEO 반응 그룹 (스냅샷에 그룹 정보가 있을 때)
+- 버전: 항목 내용이 바뀔 때마다 version 증가, verified_at = 마지막으로 확인한 시각
+
+스냅샷 형식 (JSON, fixtures/cameo_fixture.json과 같은 구조):
+    {
+        "version": "2026-10",                 # 같은 version(없으면 같은 내용)은 다시 가져오지 않음
+        "created_at": 1791936000.0,           # 선택: 쌍에 verified_at이 없을 때의 확인 시각 (없으면 파일 수정 시각)
+        "chemicals": [{"cas": "7681-52-9", "name": "SODIUM HYPOCHLORITE", "groups": ["Hypochlorites"]}],
+        "pairs": [{"cas": ["7681-52-9", "1336-21-6"], "status": "Incompatible", "descriptions": [...]}]
+    }
+
+Usage:
+    python reactivity_kb.py import snapshot.json      # REACTIVITY_KB_DB에 가져오기
+    python reactivity_kb.py export snapshot.json      # 스냅샷으로 내보내기
+    python reactivity_kb.py stats
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from cameo_cache import CameoCache, PairKey, normalize_cas, pair_key, unique_cas
+from pair_record import PairRecord, as_record
+
+
+logger = logging.getLogger(__name__)
+
+# 지식 베이스 설정 (환경 변수로 조정)
+REACTIVITY_KB_DB = os.getenv("REACTIVITY_KB_DB", "")  # 비어 있으면 사용 안 함
+REACTIVITY_KB_SNAPSHOT = os.getenv("REACTIVITY_KB_SNAPSHOT", "")  # 서버 시작 시 가져올 스냅샷 (버전이 바뀌었을 때만)
+REACTIVITY_KB_STALE_AFTER = float(os.getenv("REACTIVITY_KB_STALE_AFTER", str(30 * 24 * 3600)))  # 30일
+REACTIVITY_KB_VERIFY_INTERVAL = float(os.getenv("REACTIVITY_KB_VERIFY_INTERVAL", "3600"))  # 0이면 재확인 안 함
+REACTIVITY_KB_VERIFY_MAX_CAS = int(os.getenv("REACTIVITY_KB_VERIFY_MAX_CAS", "10"))  # 재확인 1회당 최대 CAS 수
+
+SCHEMA_VERSION = 1
+
+ENTRY_FIELDS = ("chemical_1", "chemical_2", "status", "descriptions", "documentation_link")
+
+
+def _entry_json(record: PairRecord) -> str:
+    """비교 / 저장용 JSON (pair_id는 요청마다 다르므로 제외)"""
+    entry = record.to_dict()
+    return json.dumps({field: entry[field] for field in ENTRY_FIELDS}, ensure_ascii=False, sort_keys=True)
+
+
+def _snapshot_hash(snapshot: dict) -> str:
+    """스냅샷 내용 해시 (키 순서 / 공백과 무관)"""
+    encoded = json.dumps(snapshot, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ReactivityKB:
+    """
+    CAS 쌍 단위 반응성 지식 베이스
+    crawl_incremental에서 CameoCache 다음으로 조회 (get_many / store_results / get_names)
+    """
+
+    def __init__(self, db_path: str = REACTIVITY_KB_DB, stale_after: float = REACTIVITY_KB_STALE_AFTER):
+        self.db_path = db_path
+        self.stale_after = stale_after
+        self._lock = threading.Lock()
+        self._db = self._open_db(db_path)
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.updates = 0
+        self.changes = 0
+
+    def get(self, cas_1: str, cas_2: str) -> Optional[PairRecord]:
+        """CAS 쌍 조회 (오래된 항목도 반환)"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT entry FROM kb_pairs WHERE cas_1 = ? AND cas_2 = ?", pair_key(cas_1, cas_2)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return PairRecord.from_entry(json.loads(row[0]))
+
+    def get_many(self, pairs: List[PairKey]) -> Dict[PairKey, PairRecord]:
+        """여러 쌍 조회 → {pair_key: record} (있는 것만)"""
+        found = {}
+        for cas_1, cas_2 in pairs:
+            record = self.get(cas_1, cas_2)
+            if record is not None:
+                found[pair_key(cas_1, cas_2)] = record
+        return found
+
+    def fresh(self, pairs: List[PairKey]) -> set:
+        """오래되지 않은(stale_after 안에 확인한) 쌍 집합 (조회 통계는 바꾸지 않음)"""
+        cutoff = time.time() - self.stale_after
+        found = set()
+        with self._lock:
+            for cas_1, cas_2 in pairs:
+                key = pair_key(cas_1, cas_2)
+                row = self._db.execute(
+                    "SELECT verified_at FROM kb_pairs WHERE cas_1 = ? AND cas_2 = ?", key
+                ).fetchone()
+                if row is not None and row[0] >= cutoff:
+                    found.add(key)
+        return found
+
+    def put(self, cas_1: str, cas_2: str, entry, source: str = "crawl",
+            verified_at: Optional[float] = None) -> bool:
+        """
+        CAS 쌍 저장 (이미 있으면 verified_at 갱신, 내용이 바뀌었으면 version 증가)
+
+        Returns:
+            내용이 새로 생기거나 바뀌었으면 True
+        """
+        return bool(self.put_many([(cas_1, cas_2, entry, verified_at)], source))
+
+    def put_many(self, items: List[tuple], source: str = "crawl") -> List[PairKey]:
+        """
+        여러 쌍을 한 트랜잭션으로 저장 (put과 같은 규칙)
+        items: [(cas_1, cas_2, entry, verified_at 또는 None)]
+
+        Returns:
+            내용이 새로 생기거나 바뀐 쌍의 pair_key 리스트
+        """
+        rows = self._encode(items)
+        with self._lock:
+            changed = self._put_locked(rows, source)
+            self._db.commit()
+        return changed
+
+    def _encode(self, items: List[tuple]) -> List[tuple]:
+        """(cas_1, cas_2, entry, verified_at) → (pair_key, entry JSON, verified_at) (락 밖에서 직렬화)"""
+        now = time.time()
+        return [
+            (pair_key(cas_1, cas_2), _entry_json(as_record(entry)), now if verified_at is None else verified_at)
+            for cas_1, cas_2, entry, verified_at in items
+        ]
+
+    def _put_locked(self, rows: List[tuple], source: str) -> List[PairKey]:
+        """_encode 결과 저장 (self._lock 안에서 호출, commit은 호출자가)"""
+        pending: Dict[PairKey, tuple] = {}  # 같은 배치 안에서 먼저 나온 항목도 기존 항목으로 봄
+        changed = []
+        for key, entry_json, verified_at in rows:
+            row = pending.get(key)
+            if row is None:
+                row = self._db.execute(
+                    "SELECT entry, version, verified_at FROM kb_pairs WHERE cas_1 = ? AND cas_2 = ?", key
+                ).fetchone()
+            if row is not None and row[2] > verified_at:
+                continue  # 더 최근에 확인한 항목이 있음 (오래된 스냅샷 등)
+
+            is_changed = row is None or row[0] != entry_json
+            version = 1 if row is None else row[1] + (1 if is_changed else 0)
+            pending[key] = (entry_json, version, verified_at)
+            self.updates += 1
+            if is_changed:
+                if key not in changed:
+                    changed.append(key)
+                if row is not None:
+                    self.changes += 1
+                    logger.info(f"[KB] {key[0]} + {key[1]} changed (version {version})")
+
+        self._db.executemany(
+            """INSERT OR REPLACE INTO kb_pairs
+               (cas_1, cas_2, entry, source, version, verified_at, checked_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            [(key[0], key[1], entry_json, source, version, verified_at, verified_at)
+             for key, (entry_json, version, verified_at) in pending.items()]
+        )
+        return changed
+
+    def store_results(self, results: List[Dict], cas_names: Dict[str, str], source: str = "crawl") -> int:
+        """크롤링 결과를 CAS 쌍 단위로 저장 (CameoCache.store_results와 같은 규칙) → 저장한 쌍 개수"""
+        mapped, _ = CameoCache.index_results(results, cas_names)
+        self.put_many([(cas_1, cas_2, entry, None) for (cas_1, cas_2), entry in mapped.items()], source)
+        self.put_names(cas_names)
+        return len(mapped)
+
+    def put_names(self, cas_names: Dict[str, str]):
+        """CAS → CAMEO 물질명 저장"""
+        names = [(normalize_cas(cas), name) for cas, name in cas_names.items() if cas and name]
+        if not names:
+            return
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO kb_chemicals (cas, name) VALUES (?, ?)", names)
+            self._db.commit()
+
+    def get_names(self, cas_numbers: List[str]) -> Dict[str, str]:
+        """CAS 리스트 → {CAS: CAMEO 물질명} (알고 있는 것만)"""
+        found = {}
+        with self._lock:
+            for cas in unique_cas(cas_numbers):
+                row = self._db.execute("SELECT name FROM kb_chemicals WHERE cas = ?", (cas,)).fetchone()
+                if row is not None:
+                    found[cas] = row[0]
+        return found
+
+    def groups_for(self, cas: str) -> List[str]:
+        """물질의 CAMEO 반응 그룹"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT reactive_group FROM kb_groups WHERE cas = ? ORDER BY reactive_group", (normalize_cas(cas),)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def cas_in_group(self, group: str) -> List[str]:
+        """반응 그룹에 속한 CAS 번호"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT cas FROM kb_groups WHERE reactive_group = ? ORDER BY cas", (group,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def stale_pairs(self, max_cas: int = REACTIVITY_KB_VERIFY_MAX_CAS) -> List[PairKey]:
+        """
+        다시 확인할 오래된 쌍 (가장 오래전에 시도한 것부터)
+        한 번의 크롤링 세션(N×N 페이지)에 들어가도록 CAS가 max_cas개를 넘지 않게 고름
+        """
+        cutoff = time.time() - self.stale_after
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT cas_1, cas_2 FROM kb_pairs WHERE verified_at < ? ORDER BY checked_at LIMIT ?",
+                (cutoff, max_cas * max_cas)
+            ).fetchall()
+
+        selected = []
+        cas_set = set()
+        for cas_1, cas_2 in rows:
+            added = {cas_1, cas_2} - cas_set
+            if len(cas_set) + len(added) > max_cas:
+                continue
+            cas_set |= added
+            selected.append((cas_1, cas_2))
+        return selected
+
+    def mark_checked(self, pairs: List[PairKey]):
+        """재확인을 시도한 쌍 표시 (크롤링에 실패해도 다음 차례로 넘어가도록)"""
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "UPDATE kb_pairs SET checked_at = ? WHERE cas_1 = ? AND cas_2 = ?",
+                [(now, cas_1, cas_2) for cas_1, cas_2 in pairs]
+            )
+            self._db.commit()
+
+    def import_snapshot(self, snapshot: dict, default_verified_at: float = 0.0) -> int:
+        """
+        스냅샷 가져오기 → 저장한 쌍 개수
+        각 쌍의 확인 시각 = 쌍의 verified_at → 없으면 스냅샷 created_at → 없으면 default_verified_at
+        (현재 시각을 쓰지 않으므로 날짜 없는 스냅샷이 더 최근에 크롤링한 항목을 덮어쓰지 않음)
+        이보다 최근에 확인한 항목은 유지, 쌍 / 물질명 / 반응 그룹을 한 트랜잭션으로 저장
+        스냅샷 version과 내용 해시를 기록해 import_snapshot_file이 같은 스냅샷을 다시 가져오지 않게 함
+        """
+        verified_at = snapshot.get("created_at") or default_verified_at
+        chemicals = snapshot.get("chemicals", [])
+        names = {c["cas"]: c.get("name") for c in chemicals}
+
+        items = []
+        for pair in snapshot.get("pairs", []):
+            cas_1, cas_2 = pair["cas"]
+            entry = {
+                "chemical_1": names.get(cas_1) or cas_1,
+                "chemical_2": names.get(cas_2) or cas_2,
+                "status": pair["status"],
+                "descriptions": pair.get("descriptions") or ["No description"],
+                "documentation_link": pair.get("documentation_link"),
+            }
+            items.append((cas_1, cas_2, entry, pair.get("verified_at", verified_at)))
+        rows = self._encode(items)
+        stored = len(rows)
+
+        with self._lock:
+            self._put_locked(rows, source="import")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO kb_chemicals (cas, name) VALUES (?, ?)",
+                [(normalize_cas(cas), name) for cas, name in names.items() if cas and name]
+            )
+            self._db.executemany(
+                "INSERT OR IGNORE INTO kb_groups (reactive_group, cas) VALUES (?, ?)",
+                [(group, normalize_cas(chemical["cas"])) for chemical in chemicals for group in chemical.get("groups", [])]
+            )
+            meta = [("snapshot_hash", _snapshot_hash(snapshot))]
+            if snapshot.get("version") is not None:
+                meta.append(("snapshot_version", str(snapshot["version"])))
+            self._db.executemany("INSERT OR REPLACE INTO kb_meta (key, value) VALUES (?, ?)", meta)
+            self._db.commit()
+
+        logger.info(f"[KB] Imported snapshot {snapshot.get('version')}: {stored} pairs, {len(chemicals)} chemicals")
+        return stored
+
+    def import_snapshot_file(self, path: str, force: bool = False) -> int:
+        """
+        스냅샷 파일 가져오기 → 저장한 쌍 개수
+        이미 가져온 버전이거나 (version이 없으면) 내용이 같은 스냅샷이면 건너뜀
+        created_at이 없는 스냅샷은 파일 수정 시각을 확인 시각으로 사용
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        if not force:
+            if snapshot.get("version") is not None and str(snapshot["version"]) == self.snapshot_version():
+                return 0
+            if _snapshot_hash(snapshot) == self._meta("snapshot_hash"):
+                return 0
+        return self.import_snapshot(snapshot, default_verified_at=os.path.getmtime(path))
+
+    def export_snapshot(self) -> dict:
+        """현재 내용을 스냅샷으로"""
+        with self._lock:
+            pairs = self._db.execute(
+                "SELECT cas_1, cas_2, entry, verified_at FROM kb_pairs ORDER BY cas_1, cas_2"
+            ).fetchall()
+            chemicals = self._db.execute("SELECT cas, name FROM kb_chemicals ORDER BY cas").fetchall()
+            groups = self._db.execute("SELECT cas, reactive_group FROM kb_groups ORDER BY reactive_group").fetchall()
+
+        groups_by_cas: Dict[str, List[str]] = {}
+        for cas, group in groups:
+            groups_by_cas.setdefault(cas, []).append(group)
+
+        snapshot_pairs = []
+        for cas_1, cas_2, entry_json, verified_at in pairs:
+            entry = json.loads(entry_json)
+            snapshot_pairs.append({
+                "cas": [cas_1, cas_2],
+                "status": entry["status"],
+                "descriptions": entry["descriptions"],
+                "documentation_link": entry["documentation_link"],
+                "verified_at": verified_at,
+            })
+
+        return {
+            "version": time.strftime("%Y%m%d%H%M%S"),
+            "schema_version": SCHEMA_VERSION,
+            "created_at": time.time(),
+            "chemicals": [
+                {"cas": cas, "name": name, "groups": groups_by_cas.get(cas, [])} for cas, name in chemicals
+            ],
+            "pairs": snapshot_pairs,
+        }
+
+    def snapshot_version(self) -> Optional[str]:
+        return self._meta("snapshot_version")
+
+    def _meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM kb_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def stats(self) -> dict:
+        """지식 베이스 통계 (헬스 체크용)"""
+        cutoff = time.time() - self.stale_after
+        with self._lock:
+            pairs, stale = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(verified_at < ?), 0) FROM kb_pairs", (cutoff,)
+            ).fetchone()
+            chemicals = self._db.execute("SELECT COUNT(*) FROM kb_chemicals").fetchone()[0]
+            groups = self._db.execute("SELECT COUNT(DISTINCT reactive_group) FROM kb_groups").fetchone()[0]
+        return {
+            "pairs": pairs,
+            "stale": stale,
+            "chemicals": chemicals,
+            "reactive_groups": groups,
+            "snapshot_version": self.snapshot_version(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "updates": self.updates,
+            "changes": self.changes,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _open_db(db_path: str):
+        dirpath = os.path.dirname(db_path)
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+
+        db = sqlite3.connect(db_path, check_same_thread=False)
+        db.execute(
+            """CREATE TABLE IF NOT EXISTS kb_pairs (
+                cas_1 TEXT NOT NULL,
+                cas_2 TEXT NOT NULL,
+                entry TEXT NOT NULL,
+                source TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                verified_at REAL NOT NULL,
+                checked_at REAL NOT NULL,
+                PRIMARY KEY (cas_1, cas_2)
+            )"""
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS kb_pairs_checked ON kb_pairs (checked_at)")
+        db.execute(
+            """CREATE TABLE IF NOT EXISTS kb_chemicals (
+                cas TEXT PRIMARY KEY,
+                name TEXT NOT NULL
+            )"""
+        )
+        db.execute(
+            """CREATE TABLE IF NOT EXISTS kb_groups (
+                reactive_group TEXT NOT NULL,
+                cas TEXT NOT NULL,
+                PRIMARY KEY (reactive_group, cas)
+            )"""
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS kb_groups_cas ON kb_groups (cas)")
+        db.execute("CREATE TABLE IF NOT EXISTS kb_meta (key TEXT PRIMARY KEY, value TEXT)")
+        db.execute("INSERT OR IGNORE INTO kb_meta (key, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        db.commit()
+        return db
+
+
+class KBVerifier:
+    """
+    백그라운드 재확인: 오래된 쌍을 주기적으로 다시 크롤링해 지식 베이스 갱신
+    on_change(cas_1, cas_2, record): 내용이 바뀐 쌍 알림 (예: CameoCache 갱신)
+    """
+
+    def __init__(
+        self,
+        kb: ReactivityKB,
+        crawl: Callable[[List[str], dict], Awaitable[list]],
+        interval: float = REACTIVITY_KB_VERIFY_INTERVAL,
+        on_change: Optional[Callable[[str, str, PairRecord], None]] = None,
+    ):
+        self.kb = kb
+        self.crawl = crawl
+        self.interval = interval
+        self.on_change = on_change
+        self._task = None
+
+        # 통계
+        self.runs = 0
+        self.verified = 0
+        self.failures = 0
+
+    async def start(self):
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def verify_once(self) -> int:
+        """오래된 쌍 한 묶음 재확인 → 확인한 쌍 개수"""
+        # SQLite 작업은 이벤트 루프를 막지 않도록 스레드에서
+        stale = await asyncio.to_thread(self.kb.stale_pairs)
+        if not stale:
+            return 0
+        await asyncio.to_thread(self.kb.mark_checked, stale)
+        self.runs += 1
+
+        cas_numbers = unique_cas([cas for pair in stale for cas in pair])
+        cas_names = {}
+        results = await self.crawl(cas_numbers, cas_names)
+        mapped, _ = CameoCache.index_results(results, cas_names)
+        await asyncio.to_thread(self._store, mapped, cas_names)
+
+        verified = len(mapped)
+        self.verified += verified
+        logger.info(f"[KB] Re-verified {verified}/{len(stale)} stale pairs ({len(cas_numbers)} CAS)")
+        return verified
+
+    def _store(self, mapped: Dict[PairKey, Dict], cas_names: Dict[str, str]):
+        """재확인 결과 저장 + 바뀐 쌍 알림 (스레드에서 실행)"""
+        self.kb.put_names(cas_names)
+        changed = self.kb.put_many([(cas_1, cas_2, entry, None) for (cas_1, cas_2), entry in mapped.items()])
+        if self.on_change is not None:
+            for cas_1, cas_2 in changed:
+                self.on_change(cas_1, cas_2, as_record(mapped[(cas_1, cas_2)]))
+
+    def stats(self) -> dict:
+        return {
+            "interval": self.interval,
+            "running": self._task is not None,
+            "runs": self.runs,
+            "verified": self.verified,
+            "failures": self.failures,
+        }
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.verify_once()
+            except Exception as e:
+                self.failures += 1
+                logger.warning(f"[KB] Re-verification failed: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reactivity knowledge base")
+    parser.add_argument("command", choices=["import", "export", "stats"])
+    parser.add_argument("path", nargs="?", help="snapshot file (import/export)")
+    parser.add_argument("--db", default=REACTIVITY_KB_DB or "cache/reactivity_kb.db")
+    parser.add_argument("--force", action="store_true", help="import even if this snapshot version was imported")
+    args = parser.parse_args()
+
+    kb = ReactivityKB(args.db)
+    if args.command == "import":
+        print(f"Imported {kb.import_snapshot_file(args.path, force=args.force)} pairs into {args.db}")
+    elif args.command == "export":
+        with open(args.path, "w", encoding="utf-8") as f:
+            json.dump(kb.export_snapshot(), f, ensure_ascii=False, indent=2)
+        print(f"Exported {args.db} to {args.path}")
+    print(json.dumps(kb.stats(), ensure_ascii=False, indent=2))
+    kb.close()
+
+
+if __name__ == "__main__":
+    main()
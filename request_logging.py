@@ -0,0 +1,110 @@
+"""
+요청 단위 로깅
+- contextvars로 요청 id를 전파 (동시 요청의 로그를 구분, asyncio 태스크에도 자동 전달)
+- QueueHandler → 백그라운드 스레드(QueueListener)가 stdout에 기록 (핫 패스에서 stdout I/O 대기 없음)
+- LOG_LEVEL / CAMEO_LOG_LEVEL로 서버 전체 / 크롤러 로그 레벨 조정
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import uuid
+from contextvars import ContextVar
+
+
+# 로깅 설정 (환경 변수로 조정)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+CAMEO_LOG_LEVEL = os.getenv("CAMEO_LOG_LEVEL", LOG_LEVEL).upper()  # 크롤러 로그만 따로 (예: WARNING)
+LOG_FORMAT = "%(asctime)s %(levelname)-7s [%(request_id)s] %(message)s"
+
+# 크롤러 로거 (CAMEO_LOG_LEVEL 적용)
+CRAWLER_LOGGERS = ("chemical_analyzer", "cameo_http", "cameo_parser")
+
+# 현재 요청 id (요청 밖에서는 "-")
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+_listener = None
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+class RequestIdFilter(logging.Filter):
+    """로그 레코드에 현재 요청 id 추가 (로그를 남기는 쪽 컨텍스트에서 실행)"""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+def setup_logging(level: str = LOG_LEVEL, crawler_level: str = CAMEO_LOG_LEVEL):
+    """루트 로거에 큐 핸들러 설치 (여러 번 호출해도 한 번만 설치)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    for name in CRAWLER_LOGGERS:
+        logging.getLogger(name).setLevel(crawler_level)
+    # httpx는 요청마다 INFO 로그를 남기므로 WARNING 이상만 기록
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """대기 중인 로그를 모두 기록하고 리스너 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestIdMiddleware:
+    """
+    ASGI 미들웨어: 요청마다 요청 id를 컨텍스트에 설정하고 X-Request-ID 응답 헤더로 반환
+    클라이언트가 X-Request-ID를 보내면 그 값을 사용
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or new_request_id()
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,108 @@
+"""
+CAMEO 크롤링 중 불필요한 리소스 차단
+이미지/폰트/CSS/미디어와 외부 도메인 요청을 Playwright 라우팅으로 막아 페이지 로드 시간과 대역폭 절감
+"""
+
+import logging
+import os
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+
+
+logger = logging.getLogger(__name__)
+
+
+def _env_list(name: str, default: str) -> list:
+    return [item.strip().lower() for item in os.getenv(name, default).split(",") if item.strip()]
+
+
+# 크롤링 대상 호스트 (chemical_analyzer.CAMEO_BASE_URL과 같은 환경 변수, fake_cameo / 미러로 바꾸면 함께 허용)
+CAMEO_HOST = (urlparse(os.getenv("CAMEO_BASE_URL", "https://cameochemicals.noaa.gov")).hostname or "").lower()
+
+# 차단 설정 (환경 변수로 조정)
+CAMEO_RESOURCE_BLOCKING = os.getenv("CAMEO_RESOURCE_BLOCKING", "1") == "1"
+CAMEO_BLOCK_RESOURCE_TYPES = _env_list("CAMEO_BLOCK_RESOURCE_TYPES", "image,font,stylesheet,media")
+CAMEO_ALLOWED_DOMAINS = _env_list("CAMEO_ALLOWED_DOMAINS", CAMEO_HOST)  # 기본: CAMEO_BASE_URL의 호스트
+CAMEO_BLOCKING_COOLDOWN = float(os.getenv("CAMEO_BLOCKING_COOLDOWN", "600"))  # 폴백 후 재활성화까지 (초)
+
+
+class ResourceBlocker:
+    """
+    리소스 타입/도메인 기반 요청 차단
+    - block_types: 항상 차단할 리소스 타입
+    - allowed_domains: 이 도메인(및 하위 도메인) 외의 요청은 문서를 제외하고 모두 차단
+    - 반응성 결과 페이지의 셀렉터를 찾지 못하면 disable()로 cooldown 동안 차단 해제
+    """
+
+    def __init__(
+        self,
+        enabled: bool = CAMEO_RESOURCE_BLOCKING,
+        block_types: list = CAMEO_BLOCK_RESOURCE_TYPES,
+        allowed_domains: list = CAMEO_ALLOWED_DOMAINS,
+        cooldown: float = CAMEO_BLOCKING_COOLDOWN,
+    ):
+        self.enabled = enabled
+        self.block_types = set(block_types)
+        self.allowed_domains = list(allowed_domains)
+        self.cooldown = cooldown
+
+        self._disabled_until = 0.0
+
+        # 통계
+        self.allowed = 0
+        self.blocked = 0
+        self.blocked_by_type = defaultdict(int)
+        self.fallbacks = 0
+
+    @property
+    def active(self) -> bool:
+        return self.enabled and time.monotonic() >= self._disabled_until
+
+    async def install(self, context):
+        """컨텍스트의 모든 페이지에 라우팅 규칙 설치"""
+        if self.enabled:
+            await context.route("**/*", self._handle_route)
+
+    def disable(self, reason: str):
+        """안전 폴백: cooldown 동안 차단 해제"""
+        self._disabled_until = time.monotonic() + self.cooldown
+        self.fallbacks += 1
+        logger.warning(f"[Blocking] Disabled for {self.cooldown:.0f}s ({reason})")
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type == "document":
+            return False
+        if resource_type in self.block_types:
+            return True
+        return not self._is_allowed_domain(url)
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "allowed": self.allowed,
+            "blocked": self.blocked,
+            "blocked_by_type": dict(self.blocked_by_type),
+            "fallbacks": self.fallbacks,
+        }
+
+    async def _handle_route(self, route):
+        request = route.request
+        resource_type = request.resource_type
+
+        if self.active and self.should_block(resource_type, request.url):
+            self.blocked += 1
+            self.blocked_by_type[resource_type] += 1
+            await route.abort()
+            return
+
+        self.allowed += 1
+        await route.continue_()
+
+    def _is_allowed_domain(self, url: str) -> bool:
+        host = (urlparse(url).hostname or "").lower()
+        return any(host == domain or host.endswith("." + domain) for domain in self.allowed_domains)
+
+
+# 크롤러 공용 인스턴스
+resource_blocker = ResourceBlocker()
@@ -2,7 +2,23 @@
 화학물질 안전 정보 링크 생성
 """
 
-# 영어 화학물질명 -> 한국어 매핑
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import NamedTuple
+
+from chemical_db import chemical_db
+from metrics import cache_lookups
+from name_index import NAME_TRANSLATION_CACHE_SIZE, ChemicalNameIndex
+from pair_record import as_analyzed
+
+
+# 물질 목록별 safety_links 응답 캐시 크기 (환경 변수로 조정)
+SAFETY_LINKS_CACHE_SIZE = int(os.getenv("SAFETY_LINKS_CACHE_SIZE", "1024"))
+
+# 영어 화학물질명 -> 한국어 매핑 (자주 나오는 물질, 화학물질명 DB보다 먼저 확인)
 CHEMICAL_NAME_KR = {
     "AMMONIA, ANHYDROUS": "무수 암모니아",
     "AMMONIA": "암모니아",
@@ -29,25 +45,36 @@ CHEMICAL_NAME_KR = {
 }
 
 
-def translate_chemical_name(english_name):
-    """영어 화학물질명을 한국어로 변환"""
-    # 정확한 매칭
-    if english_name in CHEMICAL_NAME_KR:
-        return CHEMICAL_NAME_KR[english_name]
+# 번역 인덱스 (CHEMICAL_NAME_KR을 바꾸면 rebuild_name_index() 호출)
+_name_index = ChemicalNameIndex(CHEMICAL_NAME_KR)
 
-    # 대소문자 무시하고 검색
-    upper_name = english_name.upper()
-    for eng, kor in CHEMICAL_NAME_KR.items():
-        if eng.upper() == upper_name:
-            return kor
 
-    # 부분 매칭 (예: "AMMONIA SOLUTION" -> "암모니아")
-    for eng, kor in CHEMICAL_NAME_KR.items():
-        if eng.upper() in upper_name or upper_name in eng.upper():
-            return kor
+def rebuild_name_index():
+    """CHEMICAL_NAME_KR 변경 후 인덱스 다시 만들고 번역 / 링크 캐시 비우기"""
+    global _name_index
+    _name_index = ChemicalNameIndex(CHEMICAL_NAME_KR)
+    clear_link_caches()
+
+
+def translate_chemical_name(english_name):
+    """
+    영어 화학물질명을 한국어로 변환
+    정확한 매칭 → 대소문자 무시 매칭 → 화학물질명 DB 동의어 → 부분 매칭 (예: "AMMONIA SOLUTION" -> "암모니아") → 원본
+    """
+    # DB 파일이 바뀌었으면 다시 열기 (generation이 바뀌어 이전 번역 결과는 쓰지 않음)
+    chemical_db.check_reload()
+    return _translate(english_name, chemical_db.generation)
 
-    # 매칭 실패시 원본 반환
-    return english_name
+
+@lru_cache(maxsize=NAME_TRANSLATION_CACHE_SIZE)
+def _translate(english_name, generation):
+    kor = _name_index.match_exact(english_name)
+    if kor is None:
+        entry = chemical_db.by_name(english_name)
+        kor = entry.name_kr if entry else None
+    if kor is None:
+        kor = _name_index.match_partial(english_name)
+    return kor if kor is not None else english_name
 
 
 # 공식 안전자료 링크
@@ -73,28 +100,122 @@ def get_msds_search_url(chemical_name):
     return f"https://msds.kosha.or.kr/MSDSInfo/kcic/msdsSearch.do?menuId=13&msdsEname={encoded_name}"
 
 
-def get_all_links_for_analysis(dangerous_pairs, caution_pairs):
+def get_all_links_for_analysis(dangerous_pairs, caution_pairs, cas_names=None):
     """
     분석 결과에 대한 모든 안전 링크 수집 (사용자 친화적 포맷)
+    dangerous_pairs / caution_pairs: AnalyzedPair 레코드 또는 pair_info dict
+    cas_names: {CAS 번호: CAMEO 물질명} - 있으면 화학물질명 DB를 CAS로 조회 (이름 추측 없이 정확한 이름 사용)
     """
-    result = {
-        "msds_links": [],
-        "general_resources": OFFICIAL_SAFETY_RESOURCES
-    }
+    return collect_safety_links(dangerous_pairs, caution_pairs, cas_names).data
+
+
+class SafetyLinks(NamedTuple):
+    """safety_links 응답 (data: dict, json: 미리 직렬화한 JSON 문자열)"""
+    data: dict
+    json: str
+
+
+class _CachedLinks(NamedTuple):
+    """캐시에 보관하는 safety_links (변경 불가: 항목별 (title, url, description) 튜플 + JSON)"""
+    entries: tuple
+    json: str
+
+
+# MSDS 링크 항목의 필드 순서 (_msds_entry 튜플 ↔ dict)
+_ENTRY_FIELDS = ("title", "url", "description")
 
-    all_pairs = dangerous_pairs + caution_pairs
-    seen_chemicals = set()
 
-    for pair in all_pairs:
-        for chem in [pair.get("chemical_1", ""), pair.get("chemical_2", "")]:
+def dumps(value) -> str:
+    """응답과 같은 형식의 JSON (FastAPI JSONResponse와 같은 옵션)"""
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+# 변하지 않는 부분은 한 번만 직렬화
+_RESOURCES_JSON = dumps(OFFICIAL_SAFETY_RESOURCES)
+
+# 물질 목록 → _CachedLinks (LRU)
+_payloads: "OrderedDict[tuple, _CachedLinks]" = OrderedDict()
+_payloads_lock = threading.Lock()
+
+
+def collect_safety_links(dangerous_pairs, caution_pairs, cas_names=None) -> SafetyLinks:
+    """
+    get_all_links_for_analysis + 미리 직렬화한 JSON
+    물질 목록(표시 순서)이 같으면 이전에 만든 결과 재사용
+    캐시는 변경 불가 값(튜플, JSON)만 공유하고 data는 요청마다 새로 만듦 (호출자가 수정해도 안전)
+    """
+    name_to_cas = {}
+    for cas, name in (cas_names or {}).items():
+        if name:
+            name_to_cas.setdefault(name.strip().upper(), cas)
+
+    chemicals = []
+    seen_chemicals = set()
+    for pair in list(dangerous_pairs) + list(caution_pairs):
+        pair = as_analyzed(pair)  # AnalyzedPair 레코드와 pair_info dict 모두 받음
+        for chem in (pair.chemical_1, pair.chemical_2):
             if chem and chem not in seen_chemicals:
-                # 영어명을 한국어로 변환
-                chem_kr = translate_chemical_name(chem)
-                result["msds_links"].append({
-                    "title": f"{chem_kr} 안전보건자료",
-                    "url": get_msds_search_url(chem),
-                    "description": f"{chem_kr}의 상세 안전 정보 및 취급 주의사항"
-                })
+                chemicals.append((chem, name_to_cas.get(chem.strip().upper())))
                 seen_chemicals.add(chem)
 
-    return result
+    # DB 파일이 바뀌었으면 다시 열기 (generation이 키에 들어가므로 이전 결과는 쓰지 않음)
+    chemical_db.check_reload()
+    key = (tuple(chemicals), chemical_db.generation)
+
+    with _payloads_lock:
+        payload = _payloads.get(key)
+        if payload is not None:
+            _payloads.move_to_end(key)
+    if payload is not None:
+        cache_lookups.inc(cache="safety_links", result="hit")
+        return _to_links(payload)
+    cache_lookups.inc(cache="safety_links", result="miss")
+
+    entries = [_msds_entry(chem, cas, chemical_db.generation) for chem, cas in chemicals]
+    payload = _CachedLinks(
+        entries=tuple(fields for fields, _ in entries),
+        json='{"msds_links":[' + ",".join(encoded for _, encoded in entries) + '],'
+             '"general_resources":' + _RESOURCES_JSON + "}"
+    )
+
+    with _payloads_lock:
+        _payloads[key] = payload
+        _payloads.move_to_end(key)
+        while len(_payloads) > SAFETY_LINKS_CACHE_SIZE:
+            _payloads.popitem(last=False)
+    return _to_links(payload)
+
+
+def _to_links(payload: _CachedLinks) -> SafetyLinks:
+    """캐시 항목 → 요청별 SafetyLinks (dict / list는 매번 새로 생성)"""
+    return SafetyLinks(
+        data={
+            "msds_links": [dict(zip(_ENTRY_FIELDS, fields)) for fields in payload.entries],
+            "general_resources": [dict(resource) for resource in OFFICIAL_SAFETY_RESOURCES]
+        },
+        json=payload.json
+    )
+
+
+@lru_cache(maxsize=NAME_TRANSLATION_CACHE_SIZE)
+def _msds_entry(chem, cas, generation):
+    """물질 하나의 MSDS 링크 → ((title, url, description), JSON)"""
+    # CAS로 찾은 DB 항목이 있으면 그 이름 사용, 없으면 영어명을 한국어로 변환
+    entry = chemical_db.by_cas(cas) if cas else None
+    chem_kr = entry.name_kr if entry and entry.name_kr else translate_chemical_name(chem)
+    data = {
+        "title": f"{chem_kr} 안전보건자료",
+        "url": get_msds_search_url(entry.name_en if entry else chem),
+        "description": f"{chem_kr}의 상세 안전 정보 및 취급 주의사항"
+    }
+    return tuple(data[field] for field in _ENTRY_FIELDS), dumps(data)
+
+
+def clear_link_caches():
+    """번역 / 링크 캐시 비우기 (CHEMICAL_NAME_KR, OFFICIAL_SAFETY_RESOURCES 변경 후)"""
+    global _RESOURCES_JSON
+    _RESOURCES_JSON = dumps(OFFICIAL_SAFETY_RESOURCES)
+    _translate.cache_clear()
+    _msds_entry.cache_clear()
+    with _payloads_lock:
+        _payloads.clear()
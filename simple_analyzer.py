@@ -3,9 +3,70 @@ Simple Rule-Based Chemical Safety Analyzer
 AI 없이 CAMEO 데이터만으로 명확한 분석 제공
 """
 
-from typing import List, Dict
+import re
+from functools import lru_cache
+from typing import Callable, List, Dict, NamedTuple, Optional, Tuple
 from collections import defaultdict
 
+from pair_record import AnalyzedPair, PairRecord, as_record, intern_text
+
+
+class HazardScan(NamedTuple):
+    """위험 설명 하나의 키워드 스캔 결과"""
+    matches: Tuple[Tuple[str, int], ...]  # (키워드, 심각도), 키워드 정의 순서
+    severity: int                         # 심각도 합계
+    is_main: bool                         # 주요 위험 키워드 포함 여부
+
+
+class HazardMatcher:
+    """
+    여러 키워드를 정규식 한 번으로 찾는 매처
+    `keyword in text`를 키워드마다 반복한 것과 같은 결과 (겹치는 위치의 키워드도 모두 찾음)
+    생성 후에는 변경하지 않음 (여러 분석/스레드가 공유)
+    """
+
+    __slots__ = ("keywords", "severities", "main_keywords", "_index", "_patterns")
+
+    def __init__(self, keyword_severity: Dict[str, int], main_keywords: Tuple[str, ...] = ()):
+        self.keywords = tuple(keyword_severity)
+        self.severities = tuple(keyword_severity[k] for k in self.keywords)  # 키워드 index → 심각도
+        self.main_keywords = frozenset(main_keywords)
+        self._index = {keyword: i for i, keyword in enumerate(self.keywords)}
+
+        # lookahead로 모든 시작 위치를 검사하되, 같은 위치에서는 대안 하나만 잡히므로
+        # 서로 접두사 관계인 키워드는 다른 정규식으로 분리
+        groups: List[List[str]] = []
+        for keyword in sorted(self.keywords, key=len, reverse=True):
+            for group in groups:
+                if not any(other.startswith(keyword) or keyword.startswith(other) for other in group):
+                    group.append(keyword)
+                    break
+            else:
+                groups.append([keyword])
+
+        self._patterns = tuple(
+            re.compile("(?=(" + "|".join(re.escape(k) for k in group) + "))")
+            for group in groups
+        )
+
+    def match(self, text_lower: str) -> frozenset:
+        """text_lower에 들어 있는 키워드 index 집합"""
+        found = set()
+        for pattern in self._patterns:
+            for m in pattern.finditer(text_lower):
+                found.add(self._index[m.group(1)])
+        return frozenset(found)
+
+    def scan(self, description: str) -> HazardScan:
+        """위험 설명 하나를 한 번 스캔 → 찾은 키워드와 심각도"""
+        found = self.match(description.lower())
+        matches = tuple((self.keywords[i], self.severities[i]) for i in sorted(found))
+        return HazardScan(
+            matches=matches,
+            severity=sum(severity for _, severity in matches),
+            is_main=any(keyword in self.main_keywords for keyword, _ in matches),
+        )
+
 
 class SimpleChemicalAnalyzer:
     """
@@ -49,23 +110,66 @@ class SimpleChemicalAnalyzer:
         "pressure": 2,
     }
 
+    # 조합 요약에서 주요 위험으로 보는 키워드 (HAZARD_SEVERITY의 일부)
+    MAIN_HAZARD_KEYWORDS = ("explosion", "fire", "toxic", "violent")
+
     def analyze(self, cameo_results: List[Dict]) -> Dict:
         """
         CAMEO 결과를 간단히 분석
 
         Args:
-            cameo_results: CAMEO 크롤링 결과 리스트
+            cameo_results: CAMEO 크롤링 결과 리스트 (PairRecord 또는 result_entry dict)
 
         Returns:
             {
                 "summary": {...},
-                "dangerous_pairs": [...],
+                "dangerous_pairs": [pair_info, ...],
                 "caution_pairs": [...],
                 "safe_pairs": [...],
                 "recommendations": [...]
             }
         """
+        return analysis_to_dict(self.analyze_records(cameo_results))
 
+    def analyze_records(self, cameo_results: List[Dict]) -> Dict:
+        """analyze와 같지만 조합을 AnalyzedPair 레코드로 반환 (내부용, JSON으로 내보낼 때는 analysis_to_dict() 사용)"""
+        return self._analyze_with(cameo_results, self._score_pair)
+
+    def analyze_batch(self, batch: List[List[PairRecord]]) -> List[Dict]:
+        """
+        여러 분석을 한 번에 수행 (저장된 이력 재채점 등 대량 처리용)
+        결과는 각 항목에 analyze()를 호출한 것과 같음
+
+        - 배치 처리 자체가 아니라 메모이제이션: (status, 위험 설명 목록)이 같은 조합은
+          점수 계산 결과를 재사용할 뿐, 나머지(분류, 정렬, 요약)는 analyze()와 같음
+        - 키워드 매처와 scan_hazard 캐시는 analyze()도 쓰므로, analyze() 반복 대비
+          이득은 중복 조합이 많을 때 1.2~1.3배 정도 (bench_analyzer.py 참고)
+        """
+        scorer = _BatchScorer(self)
+        return [analysis_to_dict(self._analyze_with(cameo_results, scorer.score_pair)) for cameo_results in batch]
+
+    def _score_pair(self, status: str, descriptions: Tuple[str, ...]) -> Tuple[str, int, Optional[str]]:
+        """조합 하나 → (위험도, 심각도 점수, 주요 위험 설명 또는 None)"""
+        risk_level = self._classify_risk(status)
+        scans = [scan_hazard(desc) for desc in descriptions]
+        severity_score = sum(scan.severity for scan in scans)
+        return risk_level, severity_score, self._main_hazard(risk_level, descriptions, scans)
+
+    def _main_hazard(self, risk_level: str, descriptions: Tuple[str, ...], scans: List[HazardScan]) -> Optional[str]:
+        """위험 조합의 첫 번째 주요 위험 설명 (요약 문장용)"""
+        if risk_level != "위험":
+            return None
+        for desc, scan in zip(descriptions, scans):
+            if scan.is_main:
+                return desc
+        return None
+
+    def _analyze_with(
+        self,
+        cameo_results: List[Dict],
+        score_pair: Callable[[str, Tuple[str, ...]], Tuple[str, int, Optional[str]]],
+    ) -> Dict:
+        """analyze / analyze_batch 공통: 조합 점수 계산 함수만 다름"""
         if not cameo_results:
             return {
                 "summary": {
@@ -87,30 +191,27 @@ class SimpleChemicalAnalyzer:
         all_chemicals = set()
 
         for result in cameo_results:
-            chem1 = result.get("chemical_1", "")
-            chem2 = result.get("chemical_2", "")
-            status = result.get("status", "").lower()
-            descriptions = result.get("descriptions", [])
+            record = as_record(result)
+            chem1 = record.chemical_1
+            chem2 = record.chemical_2
+            status = intern_text(record.status.lower())
+            descriptions = record.descriptions
 
             all_chemicals.add(chem1)
             all_chemicals.add(chem2)
 
-            # 위험도 분류
-            risk_level = self._classify_risk(status)
-
-            # 심각도 점수 계산
-            severity_score = self._calculate_severity(descriptions)
-
-            pair_info = {
-                "chemical_1": chem1,
-                "chemical_2": chem2,
-                "status": status,
-                "risk_level": risk_level,
-                "severity_score": severity_score,
-                "hazards": descriptions,
-                "hazard_count": len(descriptions),
-                "summary": self._generate_pair_summary(chem1, chem2, risk_level, descriptions)
-            }
+            # 위험도 분류 + 심각도 점수 계산
+            risk_level, severity_score, main_hazard = score_pair(status, descriptions)
+
+            pair_info = AnalyzedPair(
+                chemical_1=chem1,
+                chemical_2=chem2,
+                status=status,
+                risk_level=risk_level,
+                severity_score=severity_score,
+                hazards=descriptions,
+                main_hazard=main_hazard
+            )
 
             if risk_level == "위험":
                 dangerous.append(pair_info)
@@ -120,8 +221,8 @@ class SimpleChemicalAnalyzer:
                 safe.append(pair_info)
 
         # 심각도 순으로 정렬
-        dangerous.sort(key=lambda x: x["severity_score"], reverse=True)
-        caution.sort(key=lambda x: x["severity_score"], reverse=True)
+        dangerous.sort(key=lambda x: x.severity_score, reverse=True)
+        caution.sort(key=lambda x: x.severity_score, reverse=True)
 
         # 전체 상태 판단
         overall_status = self._determine_overall_status(
@@ -159,34 +260,7 @@ class SimpleChemicalAnalyzer:
 
     def _classify_risk(self, status: str) -> str:
         """CAMEO status를 위험도로 변환"""
-        status_lower = status.lower()
-
-        for key, risk_level in self.STATUS_MAPPING.items():
-            if key in status_lower:
-                return risk_level
-
-        # 기본값: "incompatible"이 들어있으면 위험
-        if "incompatible" in status_lower:
-            return "위험"
-        elif "caution" in status_lower:
-            return "주의"
-        elif "compatible" in status_lower or "safe" in status_lower:
-            return "안전"
-
-        # 알 수 없는 경우 주의로 분류
-        return "주의"
-
-    def _calculate_severity(self, descriptions: List[str]) -> int:
-        """위험 설명으로 심각도 점수 계산"""
-        score = 0
-
-        for desc in descriptions:
-            desc_lower = desc.lower()
-            for keyword, severity in self.HAZARD_SEVERITY.items():
-                if keyword in desc_lower:
-                    score += severity
-
-        return score
+        return classify_status(status)
 
     def _determine_overall_status(self, dangerous: int, caution: int, safe: int) -> str:
         """전체 상태 판단"""
@@ -206,20 +280,6 @@ class SimpleChemicalAnalyzer:
         else:
             return f"[안전] 모든 조합이 안전합니다."
 
-    def _generate_pair_summary(self, chem1: str, chem2: str, risk_level: str, hazards: List[str]) -> str:
-        """개별 조합 요약"""
-        if risk_level == "위험":
-            main_hazards = [h for h in hazards if any(k in h.lower() for k in ["explosion", "fire", "toxic", "violent"])]
-            if main_hazards:
-                return f"{chem1}와 {chem2}는 절대 혼합 금지! ({main_hazards[0]})"
-            return f"{chem1}와 {chem2}는 절대 혼합 금지!"
-
-        elif risk_level == "주의":
-            return f"{chem1}와 {chem2}는 주의가 필요합니다."
-
-        else:
-            return f"{chem1}와 {chem2}는 안전합니다."
-
     def _generate_recommendations(self, dangerous: List[Dict], caution: List[Dict]) -> List[str]:
         """권장 사항 생성"""
         recommendations = []
@@ -228,7 +288,7 @@ class SimpleChemicalAnalyzer:
             recommendations.append("[즉시 조치 필요]")
             for pair in dangerous[:3]:  # 상위 3개만
                 recommendations.append(
-                    f"  - {pair['chemical_1']}와 {pair['chemical_2']}를 최소 3m 이상 떨어뜨려 보관하세요"
+                    f"  - {pair.chemical_1}와 {pair.chemical_2}를 최소 3m 이상 떨어뜨려 보관하세요"
                 )
 
         if caution:
@@ -245,9 +305,62 @@ class SimpleChemicalAnalyzer:
         return recommendations
 
 
-def analyze_simple(cameo_results: List[Dict]) -> Dict:
+# 키워드 매처: 모듈 로드 시 한 번만 컴파일 (모든 분석이 공유)
+HAZARD_MATCHER = HazardMatcher(
+    SimpleChemicalAnalyzer.HAZARD_SEVERITY,
+    SimpleChemicalAnalyzer.MAIN_HAZARD_KEYWORDS
+)
+
+
+@lru_cache(maxsize=4096)
+def scan_hazard(description: str) -> HazardScan:
+    """위험 설명 스캔 (CAMEO 위험 설명은 종류가 적으므로 같은 문장은 이전 결과 재사용)"""
+    return HAZARD_MATCHER.scan(description)
+
+
+@lru_cache(maxsize=1024)
+def classify_status(status: str) -> str:
+    """CAMEO status → 위험도 (위험/주의/안전)"""
+    status_lower = status.lower()
+
+    for key, risk_level in SimpleChemicalAnalyzer.STATUS_MAPPING.items():
+        if key in status_lower:
+            return risk_level
+
+    # 기본값: "incompatible"이 들어있으면 위험
+    if "incompatible" in status_lower:
+        return "위험"
+    elif "caution" in status_lower:
+        return "주의"
+    elif "compatible" in status_lower or "safe" in status_lower:
+        return "안전"
+
+    # 알 수 없는 경우 주의로 분류
+    return "주의"
+
+
+class _BatchScorer:
+    """analyze_batch용: (status, 위험 설명 목록)이 같은 조합은 점수 계산 결과 재사용"""
+
+    def __init__(self, analyzer: SimpleChemicalAnalyzer):
+        self.analyzer = analyzer
+        self._pairs: Dict[tuple, Tuple[str, int, Optional[str]]] = {}
+
+    def score_pair(self, status: str, descriptions: Tuple[str, ...]) -> Tuple[str, int, Optional[str]]:
+        key = (status, descriptions)
+        scored = self._pairs.get(key)
+        if scored is None:
+            scored = self._pairs[key] = self.analyzer._score_pair(status, descriptions)
+        return scored
+
+
+# analyze_simple이 공유하는 분석기 (상태 없음)
+_default_analyzer = SimpleChemicalAnalyzer()
+
+
+def analyze_simple(cameo_results: List[PairRecord]) -> Dict:
     """
-    간단한 분석 함수
+    간단한 분석 함수 (조합은 기존 pair_info dict)
 
     Usage:
         from simple_analyzer import analyze_simple
@@ -255,8 +368,20 @@ def analyze_simple(cameo_results: List[Dict]) -> Dict:
         result = analyze_simple(cameo_results)
         print(result['summary']['message'])
     """
-    analyzer = SimpleChemicalAnalyzer()
-    return analyzer.analyze(cameo_results)
+    return _default_analyzer.analyze(cameo_results)
+
+
+def analyze_records(cameo_results: List[PairRecord]) -> Dict:
+    """analyze_simple과 같지만 조합을 AnalyzedPair 레코드로 반환 (백엔드 내부용, dict 변환 생략)"""
+    return _default_analyzer.analyze_records(cameo_results)
+
+
+def analysis_to_dict(analysis_result: Dict) -> Dict:
+    """분석 결과 → JSON 스키마 (조합 레코드를 기존 pair_info dict로 변환)"""
+    result = dict(analysis_result)
+    for key in ("dangerous_pairs", "caution_pairs", "safe_pairs"):
+        result[key] = [pair.to_dict() for pair in analysis_result[key]]
+    return result
 
 
 # 테스트 코드
@@ -0,0 +1,78 @@
+"""
+동시 요청 병합 (single-flight)
+같은 키의 작업이 이미 실행 중이면 새로 실행하지 않고 그 결과를 함께 기다림
+- 예외도 모든 대기자에게 그대로 전달
+- 대기자 하나가 취소돼도 작업은 계속 실행, 마지막 대기자까지 취소되면 작업도 취소
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable
+
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """실행 중인 작업 하나와 대기자 수"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """키 단위 동시 실행 병합"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[Hashable, _Flight] = {}
+
+        # 통계
+        self.executed = 0
+        self.coalesced = 0
+        self.cancelled = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        """
+        key의 작업 결과 반환 (실행 중인 작업이 없을 때만 fn() 실행)
+
+        Raises:
+            fn()이 던진 예외 (같은 키를 기다리던 모든 호출자에게 동일하게)
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.create_task(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _task, key=key, flight=flight: self._forget(key, flight))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+            logger.info(f"[SingleFlight:{self.name}] Joined in-flight work ({flight.waiters} waiting)")
+
+        flight.waiters += 1
+        try:
+            # shield: 이 대기자가 취소돼도 공유 작업은 취소하지 않음
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                # 마지막 대기자 → 결과를 받을 사람이 없으므로 작업도 취소
+                flight.task.cancel()
+                self.cancelled += 1
+                self._forget(key, flight)
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def stats(self) -> dict:
+        """병합 통계 (헬스 체크용)"""
+        return {
+            "in_flight": len(self._flights),
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "cancelled": self.cancelled,
+        }
+
+    def _forget(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -0,0 +1,57 @@
+"""
+캐시 워머 회귀 테스트 (python -m pytest test_cache_warmer.py)
+"""
+
+import asyncio
+
+from cache_warmer import CacheWarmer
+from cameo_cache import CameoCache
+
+
+CAS_A, CAS_B, CAS_UNKNOWN = "7681-52-9", "1336-21-6", "9999-99-9"
+
+
+def make_cache(tmp_path) -> CameoCache:
+    return CameoCache(db_path=str(tmp_path / "cameo_cache.db"))
+
+
+def test_not_found_pairs_are_not_rewarmed(tmp_path):
+    """CAMEO에 없는 CAS와의 쌍은 not_found로 기억되어 다음 주기에 다시 크롤링하지 않음"""
+    crawled = []
+
+    async def crawl(session, cas_names):
+        crawled.append(list(session))
+        cas_names.update({CAS_A: "SODIUM HYPOCHLORITE", CAS_B: "AMMONIUM HYDROXIDE"})
+        return [{
+            "pair_id": "Pair_1",
+            "chemical_1": "SODIUM HYPOCHLORITE",
+            "chemical_2": "AMMONIUM HYDROXIDE",
+            "status": "Incompatible",
+            "descriptions": ["Toxic Gas Generation"],
+        }]
+
+    cache = make_cache(tmp_path)
+    warmer = CacheWarmer(cache, crawl, idle_after=0, duty_cycle=1)
+    warmer.tracker.record([CAS_A, CAS_B, CAS_UNKNOWN])
+
+    assert asyncio.run(warmer.warm_once()) == 1
+    assert warmer.candidates() == []
+    for _ in range(2):
+        assert asyncio.run(warmer.warm_once()) == 0
+    assert len(crawled) == 1
+
+
+def test_failed_session_is_throttled(tmp_path):
+    """크롤링이 실패한 세션도 가동률 제한을 지킴"""
+
+    async def crawl(session, cas_names):
+        await asyncio.sleep(0.05)
+        raise TimeoutError("CAMEO timeout")
+
+    warmer = CacheWarmer(make_cache(tmp_path), crawl, idle_after=0, duty_cycle=0.5)
+    warmer.tracker.record([CAS_A, CAS_B])
+
+    assert asyncio.run(warmer.warm_once()) == 0
+    assert warmer.failures == 1
+    assert warmer.busy_seconds >= 0.05
+    assert warmer.throttled_seconds >= 0.05
@@ -0,0 +1,38 @@
+"""
+규칙 기반 분석 회귀 테스트 (python -m pytest test_simple_analyzer.py)
+"""
+
+from simple_analyzer import SimpleChemicalAnalyzer, analyze_records, analyze_simple
+
+
+def test_missing_status_is_caution():
+    """status가 없는 조합은 예전처럼 주의로 분류"""
+    result = analyze_simple([
+        {"chemical_1": "A", "chemical_2": "B", "descriptions": ["Heat"]},
+    ])
+
+    assert result["summary"]["caution_count"] == 1
+    assert result["caution_pairs"][0]["status"] == ""
+    assert result["caution_pairs"][0]["risk_level"] == "주의"
+
+
+def test_missing_chemical_names_are_empty_strings():
+    """물질명이 없는 조합은 빈 문자열로 집계 (None과 str 정렬 오류 없음)"""
+    result = analyze_simple([
+        {"chemical_1": "A", "status": "Compatible", "descriptions": []},
+        {"chemical_2": "B", "status": "Compatible", "descriptions": []},
+    ])
+
+    assert result["summary"]["chemicals_list"] == ["", "A", "B"]
+    assert result["safe_pairs"][0]["chemical_2"] == ""
+
+
+def test_public_methods_return_dicts():
+    """analyze / analyze_batch는 pair_info dict, analyze_records만 레코드"""
+    entries = [{"chemical_1": "A", "chemical_2": "B", "status": "Incompatible", "descriptions": ["Toxic"]}]
+    analyzer = SimpleChemicalAnalyzer()
+
+    assert isinstance(analyzer.analyze(entries)["dangerous_pairs"][0], dict)
+    assert isinstance(analyzer.analyze_batch([entries])[0]["dangerous_pairs"][0], dict)
+    assert analyzer.analyze_batch([entries]) == [analyze_simple(entries)]
+    assert analyze_records(entries)["dangerous_pairs"][0].chemical_1 == "A"